@@ -0,0 +1,138 @@
+"""
+Uniform vs. adaptive resampling of the interpolated airfoil.
+
+Fits the app's B-spline to clicked-like points of a NACA 4-digit section and, for each
+uniform point count and each adaptive chordal tolerance, reports the number of points,
+the largest measured deviation from the spline, the STL triangle count and the time to
+write the STL. With --mesh (requires an OpenFOAM environment) each STL is also meshed in
+a fresh workspace and the meshing wall time is reported.
+
+Usage:
+    python benchmarks/resampling.py [--naca 0012] [--clicks 12] [--mesh]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+UNIFORM_POINTS = [100, 250, 500, 1000]
+ADAPTIVE_TOLERANCES = [1e-3, 1e-4, 1e-5]
+SMOOTHNESS = 0.0001 # Sidebar default
+CHORD_LENGTH = 1.0 # Same as the app's FIXED_CHORD_LENGTH / FIXED_STL_THICKNESS
+STL_THICKNESS = 0.1
+
+
+def naca_clicks(code, n_clicks):
+    """Returns points of a NACA 4-digit section in click order (TE, upper, LE, lower)."""
+    m, p, t = int(code[0]) / 100, int(code[1]) / 10, int(code[2:]) / 100
+    beta = np.linspace(0, np.pi, n_clicks // 2 + 1)
+    xc = 0.5 * (1 - np.cos(beta))
+    yt = 5 * t * (0.2969 * np.sqrt(xc) - 0.1260 * xc - 0.3516 * xc ** 2 + 0.2843 * xc ** 3 - 0.1015 * xc ** 4)
+    if m > 0:
+        yc = np.where(xc < p, m / p ** 2 * (2 * p * xc - xc ** 2), m / (1 - p) ** 2 * (1 - 2 * p + 2 * p * xc - xc ** 2))
+    else:
+        yc = np.zeros_like(xc)
+    x = np.concatenate([xc[::-1], xc[1:]])
+    y = np.concatenate([(yc + yt)[::-1], (yc - yt)[1:]])
+    return x, y
+
+
+def max_deviation(x, y, tck):
+    """Largest distance between the spline and the resampled polyline (closing segment excluded)."""
+    from scipy.interpolate import splev
+
+    # Recover each sample's spline parameter by nearest match on a dense curve
+    dense_u = np.linspace(0, 1, 20001)
+    dense_x, dense_y = splev(dense_u, tck)
+    nearest = [np.argmin(np.hypot(dense_x - px, dense_y - py)) for px, py in zip(x[:-1], y[:-1])]
+    worst = 0.0
+    for i0, i1 in zip(nearest[:-1], nearest[1:]):
+        lo, hi = sorted((i0, i1))
+        ax, ay, bx, by = dense_x[i0], dense_y[i0], dense_x[i1], dense_y[i1]
+        length = np.hypot(bx - ax, by - ay)
+        if length == 0:
+            continue
+        px, py = dense_x[lo:hi + 1], dense_y[lo:hi + 1]
+        worst = max(worst, float(np.max(np.abs((bx - ax) * (py - ay) - (by - ay) * (px - ax)) / length)))
+    return worst
+
+
+def write_stl(x, y, directory):
+    """Builds the STL the way the app does; returns (stl path, triangles, seconds)."""
+    from stl_builder import STL_HEADER_SIZE, STL_RECORD, build_airfoil_stl
+
+    stl = os.path.join(directory, "airfoil.stl")
+    start = time.perf_counter()
+    data = build_airfoil_stl(x, y, CHORD_LENGTH, STL_THICKNESS, stl)
+    elapsed = time.perf_counter() - start
+    return stl, (len(data) - STL_HEADER_SIZE - 4) // STL_RECORD.itemsize, elapsed
+
+
+def mesh_time(stl):
+    """Meshes `stl` in a fresh workspace (with an empty cache) and returns the wall time."""
+    from cfd_runner import run_openfoam_meshing
+    from workspace import create_workspace, remove_workspace
+
+    workspace = create_workspace()
+    try:
+        shutil.copy(stl, os.path.join(workspace, "Mesh", "constant", "triSurface", "airfoil.stl"))
+        start = time.perf_counter()
+        run_openfoam_meshing(workspace)
+        return time.perf_counter() - start
+    finally:
+        remove_workspace(workspace)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--naca", default="0012", help="NACA 4-digit section to click.")
+    parser.add_argument("--clicks", type=int, default=12, help="Number of clicked points.")
+    parser.add_argument("--mesh", action="store_true", help="Also time OpenFOAM meshing of every STL.")
+    args = parser.parse_args()
+
+    if args.mesh:
+        if shutil.which("blockMesh") is None:
+            parser.error("--mesh needs an OpenFOAM environment (blockMesh not found on PATH)")
+        # Every STL must really be meshed, not restored from a previous benchmark run
+        os.environ["AIRFOIL_CACHE_DIR"] = tempfile.mkdtemp(prefix="airfoil_bench_cache_")
+
+    from scipy.interpolate import splprep
+    from utils_old import interpolate_airfoil_adaptive, interpolate_airfoil_and_close
+
+    x_clicks, y_clicks = naca_clicks(args.naca, args.clicks)
+    tck, _ = splprep([x_clicks, y_clicks], s=SMOOTHNESS, k=3)
+
+    cases = [(f"uniform n={n}", lambda n=n: interpolate_airfoil_and_close(x_clicks, y_clicks, num_points=n, smoothness=SMOOTHNESS))
+             for n in UNIFORM_POINTS]
+    cases += [(f"adaptive tol={tol:.0e}", lambda tol=tol: interpolate_airfoil_adaptive(x_clicks, y_clicks, tolerance=tol, smoothness=SMOOTHNESS))
+              for tol in ADAPTIVE_TOLERANCES]
+
+    header = f"{'mode':<22}{'points':>8}{'max dev':>11}{'triangles':>11}{'resample ms':>13}{'stl ms':>9}"
+    if args.mesh:
+        header += f"{'mesh s':>9}"
+    print(f"NACA {args.naca}, {len(x_clicks)} clicked points")
+    print(header)
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, resample in cases:
+            start = time.perf_counter()
+            x, y = resample()
+            resample_ms = (time.perf_counter() - start) * 1e3
+            stl, triangles, stl_seconds = write_stl(x, y, tmp)
+            row = (f"{label:<22}{len(x):>8}{max_deviation(x, y, tck):>11.2e}{triangles:>11}"
+                   f"{resample_ms:>13.1f}{stl_seconds * 1e3:>9.1f}")
+            if args.mesh:
+                row += f"{mesh_time(stl):>9.1f}"
+            print(row)
+    if args.mesh:
+        shutil.rmtree(os.environ["AIRFOIL_CACHE_DIR"], ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
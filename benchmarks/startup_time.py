@@ -0,0 +1,101 @@
+"""
+Start-up time benchmark for the Streamlit entry point.
+
+Imports every module `streamlit_interface.py` imports at the top level in a fresh
+interpreter, the way `streamlit run` does before the first paint, and fails if that
+takes longer than the budget or pulls in one of the heavy pipeline dependencies,
+which must only be imported when their stage first runs.
+
+Usage:
+    python benchmarks/startup_time.py [--runs 5] [--budget 1.5]
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+ENTRY_POINT = os.path.join(SRC_DIR, "streamlit_interface.py")
+
+# Must not be imported before the corresponding pipeline stage runs.
+HEAVY_MODULES = ["pyvista", "vtkmodules", "trimesh", "shapely", "imageio", "scipy", "matplotlib"]
+
+_PROBE = """
+import json, sys, time
+skipped = []
+start = time.perf_counter()
+for name in {modules!r}:
+    try:
+        __import__(name)
+    except ImportError as e:
+        # A third-party widget that is not installed (or incompatible) in this environment
+        if name in {local!r}:
+            raise
+        skipped.append(f"{{name}} ({{e}})")
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "skipped": skipped,
+                  "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def entry_point_imports(path=ENTRY_POINT):
+    """Returns the modules imported at the top level of the entry point, in order."""
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            names = [node.module]
+        else:
+            continue
+        modules.extend(n for n in names if n not in modules)
+    return modules
+
+
+def measure(modules):
+    """Imports `modules` in a fresh interpreter and returns the probe's result."""
+    local = [m for m in modules if os.path.exists(os.path.join(SRC_DIR, m + ".py"))]
+    code = _PROBE.format(modules=modules, local=local, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold interpreter runs.")
+    parser.add_argument("--budget", type=float, default=float(os.environ.get("AIRFOIL_STARTUP_BUDGET", "1.5")),
+                        help="Maximum median import time in seconds.")
+    args = parser.parse_args()
+
+    modules = entry_point_imports()
+    results = [measure(modules) for _ in range(args.runs)]
+    times = [r["seconds"] for r in results]
+    loaded = sorted({m for r in results for m in r["loaded"]})
+    skipped = results[0]["skipped"]
+    median = statistics.median(times)
+
+    print(f"Entry point imports: {', '.join(modules)}")
+    if skipped:
+        print(f"Skipped (not importable here, not counted): {'; '.join(skipped)}")
+    print(f"Import time over {args.runs} runs: median {median:.3f} s, min {min(times):.3f} s, max {max(times):.3f} s")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: heavy modules imported at start-up: {', '.join(loaded)}")
+        failed = True
+    if median > args.budget:
+        print(f"FAIL: median start-up import time {median:.3f} s exceeds the {args.budget:.3f} s budget")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
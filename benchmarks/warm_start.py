@@ -0,0 +1,125 @@
+"""
+Iterations saved by warm-starting the solver from a previous solution.
+
+Without arguments, summarises the runs recorded in the app's cache: how many iterations
+cold-started and warm-started runs took until the convergence monitor stopped them.
+
+With --run (requires an OpenFOAM environment), measures it directly in a fresh cache:
+the --base section is solved from uniform fields, then the --target section is solved
+twice, warm-started from the base solution and from uniform fields, and the iterations
+and wall times of the three runs are reported.
+
+Usage:
+    python benchmarks/warm_start.py [--run] [--base 0012] [--target 0015]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+CLICKS = 12
+CHORD_LENGTH = 1.0 # Same as the app's FIXED_CHORD_LENGTH / FIXED_STL_THICKNESS
+STL_THICKNESS = 0.1
+CONVERGENCE = {'window': 50, 'min_iterations': 100, 'coeff_tolerance': 1e-3, 'residual_tolerance': 1e-4,
+               'divergence_limit': 1e3} # Sidebar defaults
+
+
+def summarise():
+    from warm_start import iteration_statistics
+
+    stats = iteration_statistics()
+    print(f"{'runs':<8}{'count':>7}{'mean iterations':>17}")
+    print(f"{'cold':<8}{stats['cold']:>7}{stats['cold_mean']:>17.0f}")
+    print(f"{'warm':<8}{stats['warm']:>7}{stats['warm_mean']:>17.0f}")
+    if stats['warm']:
+        print(f"Warm starts took {stats['saved']:.0f} fewer iterations on average than the runs they started from.")
+
+
+def mesh_workspace(code):
+    """Meshes a NACA section in a fresh workspace and returns the workspace."""
+    from resampling import naca_clicks
+
+    from cfd_runner import run_openfoam_meshing
+    from stl_builder import build_airfoil_stl
+    from utils_old import interpolate_airfoil_and_close
+    from workspace import create_workspace
+
+    workspace = create_workspace()
+    x, y = interpolate_airfoil_and_close(*naca_clicks(code, CLICKS))
+    build_airfoil_stl(x, y, CHORD_LENGTH, STL_THICKNESS,
+                      os.path.join(workspace, "Mesh", "constant", "triSurface", "airfoil.stl"))
+    if not run_openfoam_meshing(workspace):
+        raise RuntimeError(f"Meshing NACA {code} failed")
+    return workspace
+
+
+def solve(workspace, warm_start):
+    """Solves a meshed workspace; returns (iterations, seconds)."""
+    from cfd_runner import run_openfoam_simulation
+    from warm_start import iterations_run
+
+    start = time.perf_counter()
+    if not run_openfoam_simulation(workspace, convergence=CONVERGENCE, animate=False, warm_start=warm_start):
+        raise RuntimeError(f"Solving {workspace} failed")
+    return iterations_run(os.path.join(workspace, "Run")), time.perf_counter() - start
+
+
+def forget_solution(workspace):
+    """Drops the cached solution (and seed) of a workspace, so solving it again really runs."""
+    from pipeline_cache import lookup, make_key, read_case_key
+
+    key = read_case_key(os.path.join(workspace, "Run"))
+    for entry in (lookup(key), lookup(make_key("warm_start", key) if key else None)):
+        if entry is not None:
+            shutil.rmtree(entry)
+
+
+def measure(base, target):
+    from workspace import remove_workspace
+
+    workspaces = []
+    try:
+        workspaces.append(mesh_workspace(base))
+        workspaces.append(mesh_workspace(target))
+        rows = [(f"NACA {base} cold", *solve(workspaces[0], warm_start=False))]
+        rows.append((f"NACA {target} warm", *solve(workspaces[1], warm_start=True)))
+        forget_solution(workspaces[1])
+        rows.append((f"NACA {target} cold", *solve(workspaces[1], warm_start=False)))
+    finally:
+        for workspace in workspaces:
+            remove_workspace(workspace)
+
+    print(f"{'run':<20}{'iterations':>12}{'seconds':>10}")
+    for label, iterations, seconds in rows:
+        print(f"{label:<20}{iterations:>12}{seconds:>10.1f}")
+    saved = rows[2][1] - rows[1][1]
+    print(f"Warm start saved {saved} iterations ({saved / rows[2][1]:.0%}) and {rows[2][2] - rows[1][2]:.1f} s.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--run", action="store_true", help="Run the cold/warm comparison with OpenFOAM.")
+    parser.add_argument("--base", default="0012", help="NACA 4-digit section solved first (the seed).")
+    parser.add_argument("--target", default="0015", help="NACA 4-digit section warm-started from the base.")
+    args = parser.parse_args()
+
+    if not args.run:
+        summarise()
+        return
+    if shutil.which("foamRun") is None:
+        parser.error("--run needs an OpenFOAM environment (foamRun not found on PATH)")
+    # Neither the seed choice nor the solutions may come from earlier runs of the app
+    os.environ["AIRFOIL_CACHE_DIR"] = tempfile.mkdtemp(prefix="airfoil_bench_cache_")
+    try:
+        measure(args.base, args.target)
+    finally:
+        shutil.rmtree(os.environ["AIRFOIL_CACHE_DIR"], ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,268 @@
+import logging
+import logging.handlers
 import os
+import shutil
+import signal
 import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
+from convergence import CONVERGED, DIVERGED, ConvergenceMonitor, set_stop_at
+from decomposition import (
+    choose_subdomains,
+    count_cells,
+    detect_cores,
+    mpi_available,
+    parallel_env,
+    write_decompose_par_dict,
+)
+from field_store import ingest_run
+from frame_renderer import ANIMATION_FIELDS, IncrementalAnimation
+from job_manager import report_progress
+from log_parser import FoamLogParser, MeshQualityParser
+from mesh_quality import (
+    MAX_ATTEMPTS,
+    QUALITY_FILE,
+    MeshQualityError,
+    adjust_settings,
+    check_quality,
+    read_mesh_quality,
+    write_mesh_quality,
+)
+from pipeline_cache import (
+    make_key,
+    read_case_key,
+    remove_time_dirs,
+    restore,
+    stage_key,
+    stage_outputs,
+    store,
+    write_case_key,
+)
+from polar_sweep import (
+    POLAR_DIR,
+    POLAR_FILE,
+    case_name,
+    create_mesh_case,
+    create_sweep_case,
+    read_force_coefficients,
+    write_polar,
+)
+from progressive import COARSE_LEVEL, create_coarse_case, final_fields
+from warm_start import find_seed, map_seed, record_seed
 
-def run_openfoam_meshing(case_path: str):
+# Seconds between checks for new time directories while rendering alongside the solver.
+LIVE_RENDER_INTERVAL = 2.0
+
+# Rotation settings for the per-run log files (log.Allrun, log.Allrun.1, ...)
+LOG_MAX_BYTES = 20 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+# Number of trailing output lines kept in memory for error messages.
+LOG_TAIL_LINES = 50
+
+
+def _open_run_log(log_path):
+    """Creates a logger writing raw solver output to a size-rotated log file."""
+    logger = logging.getLogger(f"airfoil.run.{os.path.abspath(log_path)}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    handler = logging.handlers.RotatingFileHandler(
+        log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT
+    )
+    if os.path.getsize(log_path) > 0:
+        # Start every run in a fresh file; the previous run's log becomes the first backup.
+        handler.doRollover()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    return logger
+
+
+def _close_run_log(logger):
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def _run_streamed(command, cwd, monitor=None, env=None, log_name="log.Allrun", report=True, parser=None):
+    """
+    Runs an Allrun script (or a single OpenFOAM utility), streaming its output line by line.
+
+    Output goes to a rotating `log_name` file in `cwd` instead of being buffered in memory.
+    Residuals and force coefficients are parsed on the fly and published with
+    `job_manager.report_progress` so the UI can plot convergence while the run is going.
+
+    Args:
+        command (list): Command line, e.g. [<absolute path of the Allrun script>] or ['blockMesh'].
+        cwd (str): Case directory the script is run from.
+        monitor (ConvergenceMonitor): Optional monitor fed with every parsed time step. On
+                                      convergence the solver is asked to stop via `stopAt writeNow`
+                                      (reset to `endTime` once the script exits); on divergence
+                                      the whole script is killed.
+        env (dict): Environment for the script (defaults to the current one).
+        log_name (str): Name of the log file written in `cwd`.
+        report (bool): Publish the parsed samples with `report_progress`. Turned off when
+                       several cases run side by side in one job.
+        parser: Line parser with the interface of `FoamLogParser` (the default), e.g. a
+                `MeshQualityParser` collecting metrics from the meshing output.
+
+    Raises:
+        subprocess.CalledProcessError: If the script exits with a non-zero code. Its `output`
+                                       holds the last lines of the log.
+        RuntimeError: If the monitor detected divergence.
+    """
+    log_path = os.path.join(cwd, log_name)
+    logger = _open_run_log(log_path)
+    parser = parser if parser is not None else FoamLogParser()
+    tail = deque(maxlen=LOG_TAIL_LINES)
+    stop_requested = False
+    diverged = False
+    print(f"Streaming output of {' '.join(command)} to {log_path}")
+
+    try:
+        with subprocess.Popen(
+            command,
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            start_new_session=True, # Own process group, so the solver can be killed with the script
+        ) as process:
+            for line in process.stdout:
+                line = line.rstrip("\n")
+                logger.info(line)
+                tail.append(line)
+                sample = parser.feed(line)
+                if sample is None:
+                    continue
+                if report:
+                    report_progress(sample)
+                if monitor is None or stop_requested:
+                    continue
+                status = monitor.update(sample)
+                if status == CONVERGED:
+                    print(monitor.message)
+                    set_stop_at(cwd, "writeNow")
+                    stop_requested = True
+                elif status == DIVERGED:
+                    print(f"Aborting run: {monitor.message}")
+                    os.killpg(process.pid, signal.SIGTERM)
+                    diverged = True
+                    break
+            returncode = process.wait()
+        sample = parser.flush()
+        if sample is not None and report:
+            report_progress(sample)
+    finally:
+        _close_run_log(logger)
+        if stop_requested:
+            # The early stop belongs to this run only; later runs and copies of the case run to endTime
+            set_stop_at(cwd, "endTime")
+
+    if diverged:
+        raise RuntimeError(f"Run diverged: {monitor.message}")
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, command, output="\n".join(tail))
+
+
+def _prepare_parallel(case_dir, parallel, n_cells=None, reconstruct_options="-newTimes"):
+    """
+    Sets up a case for the parallel branch of its Allrun script.
+
+    Args:
+        case_dir (str): OpenFOAM case directory.
+        parallel (bool or int): False/1 for a serial run, True to size the decomposition
+                                automatically, or an explicit number of subdomains.
+        n_cells (int): Cell count of the mesh to decompose, if known.
+        reconstruct_options (str): reconstructPar options for the solver case.
+
+    Returns:
+        dict or None: Environment for `_run_streamed`, or None for a serial run.
+    """
+    if not parallel:
+        return None
+    if not mpi_available():
+        print("WARNING: mpirun not found, running serially.")
+        return None
+    if parallel is True:
+        n_subdomains = choose_subdomains(n_cells)
+    else:
+        n_subdomains = int(parallel)
+    if n_subdomains <= 1:
+        print("Not enough cores (or cells) for a parallel run, running serially.")
+        return None
+    write_decompose_par_dict(case_dir, n_subdomains)
+    print(f"Running in parallel on {n_subdomains} subdomains.")
+    return parallel_env(n_subdomains, reconstruct_options)
+
+
+# Meshing steps whose output only depends on a few input files, and so can be shared between
+# all airfoils: (utility, Allrun skip variable, inputs, outputs), paths relative to the workspace.
+_SHARED_MESH_STEPS = [
+    # The background hex mesh is identical for every airfoil.
+    ("blockMesh", "SKIP_BLOCKMESH",
+     ["Mesh/system/blockMeshDict"],
+     ["Mesh/constant/polyMesh"]),
+    # Feature edges only depend on the STL.
+    ("surfaceFeatures", "SKIP_SURFACE_FEATURES",
+     ["Mesh/constant/triSurface/airfoil.stl", "Mesh/system/surfaceFeaturesDict"],
+     ["Mesh/constant/triSurface/airfoil.eMesh", "Mesh/constant/extendedFeatureEdgeMesh"]),
+]
+
+
+def _run_shared_mesh_steps(workspace, env=None):
+    """
+    Produces the background mesh and feature edges from the cache, running them on a miss.
+
+    Args:
+        workspace (str): Case workspace holding the Mesh case.
+        env (dict): Environment prepared for the Mesh Allrun script, if any.
+
+    Returns:
+        dict: Environment telling the Allrun script to skip the steps done here.
+    """
+    mesh_dir = os.path.join(workspace, "Mesh")
+    env = dict(env) if env is not None else dict(os.environ)
+    for utility, skip_variable, inputs, outputs in _SHARED_MESH_STEPS:
+        key = make_key(utility, paths=inputs, root=workspace)
+        if restore(key, workspace):
+            print(f"{utility} output restored from the cache.")
+        else:
+            for rel_path in outputs:
+                # Drop outputs of the previous job, e.g. snappyHexMesh's cellLevel in polyMesh
+                shutil.rmtree(os.path.join(workspace, rel_path), ignore_errors=True)
+            _run_streamed([utility], mesh_dir, log_name=f"log.{utility}")
+            store(key, workspace, [p for p in outputs if os.path.exists(os.path.join(workspace, p))])
+        env[skip_variable] = "1"
+    return env
+
+
+def run_openfoam_meshing(case_path: str, parallel=False):
     """
     Runs the OpenFOAM meshing process (blockMesh, surfaceFeatureExtract, snappyHexMesh).
+
+    The snappyHexMesh layer summary and the checkMesh output are parsed into metrics and
+    checked against the limits of `mesh_quality`. A mesh that fails them is meshed again
+    with the `mesh_quality.RETRY_SETTINGS` for the kind of failure (up to
+    `mesh_quality.MAX_ATTEMPTS` times in all), then refused; only a passing mesh is cached.
+    The workspace's snappyHexMeshDict is left unchanged, so the mesh is cached under the
+    key of the original settings.
+
+    Args:
+        case_path (str): Directory holding the Mesh and Run cases.
+        parallel (bool or int): Run snappyHexMesh under MPI, on an automatically sized
+                                (True) or given number of subdomains.
+
+    Returns:
+        dict: The mesh quality metrics (see `log_parser.MeshQualityParser`), or False on failure.
+
+    Raises:
+        MeshQualityError: If no attempt produced a mesh within the limits.
     """
     print(f"Starting OpenFOAM meshing in {case_path}...")
     try:
@@ -24,34 +282,139 @@ def run_openfoam_meshing(case_path: str):
             print(f"ERROR: Failed to make {mesh_allrun_absolute_path} executable: {e.stderr}")
             raise RuntimeError(f"Failed to set executable permissions for Allrun: {e.stderr}")
 
-        process = subprocess.run(
-            [mesh_allrun_absolute_path],
-            cwd=process_cwd,
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        workspace = os.path.join(script_dir, case_path)
+        cache_key = stage_key(workspace, "mesh")
+        polymesh_dir = os.path.join(process_cwd, "constant", "polyMesh")
+        if os.path.exists(os.path.join(process_cwd, QUALITY_FILE)):
+            os.remove(os.path.join(process_cwd, QUALITY_FILE))
+        if restore(cache_key, workspace):
+            write_case_key(process_cwd, cache_key)
+            print("OpenFOAM mesh restored from the cache.")
+            # Entries cached before the quality check have no metrics
+            return read_mesh_quality(process_cwd) or {'cells': count_cells(polymesh_dir)}
+        write_case_key(process_cwd, None)
 
+        env = _prepare_parallel(process_cwd, parallel)
+        mesh_dict = os.path.join(process_cwd, "system", "snappyHexMeshDict")
+        with open(mesh_dict) as f:
+            original_settings = f.read()
+        try:
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                # snappyHexMesh refines the background mesh in place: start every attempt from blockMesh's
+                env = _run_shared_mesh_steps(workspace, env)
+                quality = MeshQualityParser()
+                _run_streamed([mesh_allrun_absolute_path], process_cwd, env=env, parser=quality)
+                # Recorded for a failing mesh too, so that the solver refuses it
+                write_mesh_quality(process_cwd, quality.metrics)
+                violations = check_quality(quality.metrics)
+                if not violations:
+                    break
+                summary = "; ".join(message for _, message in violations)
+                if attempt == MAX_ATTEMPTS:
+                    raise MeshQualityError(f"Mesh quality check failed after {attempt} attempt(s): {summary}")
+                changed = adjust_settings(mesh_dict, violations)
+                print(f"Mesh quality check failed ({summary}), meshing again with adjusted {', '.join(changed)}.")
+        finally:
+            with open(mesh_dict, "w") as f:
+                f.write(original_settings)
+
+        store(cache_key, workspace, stage_outputs(workspace, "mesh"))
+        write_case_key(process_cwd, cache_key)
         print("OpenFOAM meshing completed successfully.")
-        print("STDOUT:\n", process.stdout)
-        return True
+        return quality.metrics
 
     except subprocess.CalledProcessError as e:
         print(f"Meshing failed with return code {e.returncode}")
-        print(f"STDOUT:\n{e.stdout}")
-        print(f"STDERR:\n{e.stderr}")
-        raise RuntimeError(f"OpenFOAM meshing failed: {e.stderr}")
+        print(f"Last lines of output:\n{e.output}")
+        raise RuntimeError(f"OpenFOAM meshing failed: {e.output}")
     except FileNotFoundError as e:
         print(f"Error during OpenFOAM meshing: {e}")
         # Re-raise to be caught by Streamlit's error handling if preferred, or handle gracefully
         raise
+    except MeshQualityError as e:
+        print(f"Error during OpenFOAM meshing: {e}")
+        raise
     except Exception as e:
         print(f"Error during OpenFOAM meshing: {e}")
         return False
 
-def run_openfoam_simulation(case_path: str):
+def _check_mesh_quality(workspace):
+    """Refuses to solve a mesh whose recorded metrics fail the quality limits."""
+    violations = check_quality(read_mesh_quality(os.path.join(workspace, "Mesh")))
+    if violations:
+        raise MeshQualityError(f"Mesh fails the quality limits: {'; '.join(message for _, message in violations)}")
+
+
+def _airfoil_stl(workspace):
+    return os.path.join(workspace, "Mesh", "constant", "triSurface", "airfoil.stl")
+
+
+def _warm_start(case_dir, stl_path, alpha, env):
+    """
+    Initialises the 0/ fields of a case from the closest stored seed, if there is one.
+
+    constant/polyMesh must already hold the extruded mesh.
+
+    Returns:
+        tuple: (seed record or None, environment for `_run_streamed`).
+    """
+    seed = find_seed(stl_path, alpha)
+    if seed is None or not map_seed(seed, case_dir, alpha):
+        print("No stored solution is close enough to warm-start from, starting from 0.org.")
+        return None, env
+    print(f"Warm-starting from seed {seed['key'][:12]} (alpha {seed['alpha']:g}, score {seed['score']:.4f} chords).")
+    env = dict(env) if env is not None else dict(os.environ)
+    env["SKIP_INITIAL_FIELDS"] = "1"
+    return seed, env
+
+
+def _report_iterations(workspace, case_dir, cache_key, alpha, seed):
+    """Stores the run's final fields as a seed and prints the iterations it took."""
+    try:
+        iterations = record_seed(workspace, case_dir, cache_key, _airfoil_stl(workspace), alpha, seed)
+    except Exception as e:
+        # Seeds only speed up later runs; a failure here must not fail this one.
+        print(f"Could not store the warm start seed of {case_dir}: {e}")
+        return
+    if seed is None:
+        print(f"Cold start took {iterations} iterations.")
+    else:
+        print(f"Warm start took {iterations} iterations; the run it started from took {seed['iterations']} "
+              f"({seed['iterations'] - iterations:+d} saved).")
+
+
+def _render_while_running(animation, stop_event, interval=LIVE_RENDER_INTERVAL):
+    """Thread body appending new time steps to the animations until `stop_event` is set."""
+    while not stop_event.wait(interval):
+        try:
+            animation.poll()
+        except Exception as e:
+            # Rendering is best effort here; the animations are regenerated after the run if needed.
+            print(f"Live rendering stopped: {e}")
+            return
+
+
+def run_openfoam_simulation(case_path: str, convergence=None, parallel=False, reconstruct="all", animate=True,
+                            warm_start=False):
     """
     Runs the main OpenFOAM simulation (e.g., simpleFoam).
+
+    Args:
+        case_path (str): Directory holding the Mesh and Run cases.
+        convergence (dict): Optional keyword arguments for `ConvergenceMonitor`. When given, the
+                            solver is stopped as soon as Cl/Cd and the residuals have settled and
+                            aborted if the force coefficients blow up.
+        parallel (bool or int): Run foamRun under MPI, on an automatically sized (True)
+                                or given number of subdomains.
+        reconstruct (str): Time directories to reconstruct after a parallel run: 'all'
+                           (needed for the animations) or 'latest' (final solution only).
+        animate (bool): Render the animations of `ANIMATION_FIELDS` while the solver runs,
+                        appending each time directory as soon as it is written.
+        warm_start (bool): Initialise the fields from the closest previously converged solution
+                           (see `warm_start`) instead of the uniform 0.org fields. Only used
+                           together with `convergence`, since a run to endTime saves nothing. The
+                           cache key is unchanged: a converged solution does not depend on its
+                           initial fields.
     """
     print(f"Starting OpenFOAM simulation in {case_path}...")
     try:
@@ -67,22 +430,238 @@ def run_openfoam_simulation(case_path: str):
         # Make sure the script is executable
         subprocess.run(["chmod", "+x", run_allrun_absolute_path], check=True)
 
-        process = subprocess.run(
-            [run_allrun_absolute_path],
-            cwd=process_cwd,
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        # A previous run may have been stopped early; always start out running to endTime.
+        set_stop_at(process_cwd, "endTime")
+
+        # Only a mesh that came out of (or went into) the cache has a key to chain onto.
+        workspace = os.path.join(script_dir, case_path)
+        _check_mesh_quality(workspace)
+        mesh_key = read_case_key(os.path.join(workspace, "Mesh"))
+        cache_key = stage_key(workspace, "solution", mesh_key, convergence, reconstruct) if mesh_key else None
+        remove_time_dirs(process_cwd)
+        if restore(cache_key, workspace):
+            write_case_key(process_cwd, cache_key)
+            print("OpenFOAM solution restored from the cache.")
+            return True
+        write_case_key(process_cwd, None)
+
+        monitor = ConvergenceMonitor(**convergence) if convergence is not None else None
+        n_cells = count_cells(os.path.join(script_dir, case_path, "Mesh", "constant", "polyMesh"))
+        reconstruct_options = "-latestTime" if reconstruct == "latest" else "-newTimes"
+        env = _prepare_parallel(process_cwd, parallel, n_cells, reconstruct_options)
+
+        seed = None
+        if warm_start and monitor is None:
+            print("Warm start needs the convergence monitor, starting from 0.org.")
+        elif warm_start:
+            # The fields are mapped onto the extruded mesh, so extrude it before the Allrun script
+            _run_streamed(["extrudeMesh"], process_cwd, log_name="log.extrudeMesh")
+            env = dict(env) if env is not None else dict(os.environ)
+            env["SKIP_EXTRUDE"] = "1"
+            seed, env = _warm_start(process_cwd, _airfoil_stl(workspace), 0.0, env)
+
+        animation = None
+        if animate:
+            animation_dir = os.path.join(process_cwd, "animations")
+            os.makedirs(animation_dir, exist_ok=True)
+            write_case_key(animation_dir, None)
+            animation = IncrementalAnimation(process_cwd, animation_dir, ANIMATION_FIELDS)
+            stop_rendering = threading.Event()
+            render_thread = threading.Thread(target=_render_while_running, args=(animation, stop_rendering), daemon=True)
+            render_thread.start()
+
+        try:
+            _run_streamed([run_allrun_absolute_path], process_cwd, monitor, env)
+        except subprocess.CalledProcessError as e:
+            print(f"Simulation failed with errors:\n{e.output}")
+            raise RuntimeError(f"OpenFOAM simulation failed: {e.output}")
+        finally:
+            if animation is not None:
+                stop_rendering.set()
+                render_thread.join()
+        ingest_run(process_cwd)
+        store(cache_key, workspace, stage_outputs(workspace, "solution"))
+        write_case_key(process_cwd, cache_key)
+        if monitor is not None:
+            _report_iterations(workspace, process_cwd, cache_key, 0.0, seed)
 
-        if process.returncode != 0:
-            print(f"Simulation failed with errors:\n{process.stderr}")
-            raise RuntimeError(f"OpenFOAM simulation failed: {process.stderr}")
+        if animation is not None:
+            try:
+                animation.poll(final=True)
+                animation.close()
+                # Same key the UI looks the animations up under
+                animations_key = make_key("animations", cache_key, ANIMATION_FIELDS) if cache_key else None
+                store(animations_key, workspace, stage_outputs(workspace, "animations"))
+                write_case_key(animation.output_dir, animations_key)
+            except Exception as e:
+                animation.close()
+                print(f"Could not finish the animations, they will be rendered on display: {e}")
         print("OpenFOAM simulation completed successfully.")
-        print("STDOUT:\n", process.stdout)
         return True
     except Exception as e:
         print(f"Error during OpenFOAM simulation: {e}")
         return False
 
 
+def run_coarse_pass(case_path: str, level=COARSE_LEVEL, convergence=None, parallel=False, warm_start=False):
+    """
+    First pass of the progressive mode: meshes and solves the airfoil on a coarse mesh.
+
+    The coarse cases live in the workspace's `progressive.COARSE_DIR` and go through the same
+    (cached) meshing and solving pipeline as the production cases, without animations. The
+    converged coarse solution is stored as a warm start seed, which `run_refinement_pass`
+    then maps onto the production mesh; seeds are only kept for runs stopped by the
+    convergence monitor, so `convergence` is required.
+
+    Args:
+        case_path (str): Directory holding the Mesh and Run cases.
+        level (int): snappyHexMesh refinement level of the airfoil surface and feature edges.
+        convergence (dict): Keyword arguments for `ConvergenceMonitor`.
+        parallel (bool or int): Run snappyHexMesh and the solver under MPI.
+        warm_start (bool): Start the coarse solve from the closest stored solution.
+
+    Returns:
+        dict: 'Cl', 'Cd', 'Cm', the number of 'cells' of the coarse mesh and its final
+              'fields' (see `progressive.final_fields`), or False on failure.
+
+    Raises:
+        ValueError: If `convergence` is not given.
+    """
+    if convergence is None:
+        raise ValueError("A progressive run needs the convergence monitor (Stop at convergence).")
+    print(f"Starting coarse pass (refinement level {level}) in {case_path}...")
+    try:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        coarse = create_coarse_case(os.path.join(script_dir, case_path), level)
+        if not run_openfoam_meshing(coarse, parallel):
+            raise RuntimeError("Coarse meshing failed.")
+        if not run_openfoam_simulation(coarse, convergence, parallel, reconstruct="latest", animate=False,
+                                       warm_start=warm_start):
+            raise RuntimeError("Coarse simulation failed.")
+        run_dir = os.path.join(coarse, "Run")
+        coefficients = read_force_coefficients(run_dir)
+        cells = count_cells(os.path.join(coarse, "Mesh", "constant", "polyMesh"))
+        print(f"Coarse pass: {cells} cells, Cl={coefficients['Cl']:.4f} Cd={coefficients['Cd']:.4f}")
+        return {**coefficients, "cells": cells, "fields": final_fields(run_dir)}
+    except Exception as e:
+        print(f"Error during coarse pass: {e}")
+        return False
+
+
+def run_refinement_pass(case_path: str, convergence=None, parallel=False):
+    """
+    Second pass of the progressive mode: meshes at the production level and solves from the
+    coarse solution.
+
+    The coarse solution is picked up as the warm start seed (same outline, same angle of
+    attack), which like any warm start needs `convergence`.
+
+    Args:
+        case_path (str): Directory holding the Mesh and Run cases.
+        convergence (dict): Keyword arguments for `ConvergenceMonitor`.
+        parallel (bool or int): Run snappyHexMesh and the solver under MPI.
+
+    Returns:
+        dict: 'Cl', 'Cd', 'Cm' and 'cells' of the production solution, or False on failure.
+
+    Raises:
+        ValueError: If `convergence` is not given.
+    """
+    if convergence is None:
+        raise ValueError("A progressive run needs the convergence monitor (Stop at convergence).")
+    print(f"Starting refinement pass in {case_path}...")
+    try:
+        if not run_openfoam_meshing(case_path, parallel):
+            raise RuntimeError("Meshing failed.")
+        if not run_openfoam_simulation(case_path, convergence, parallel, warm_start=True):
+            raise RuntimeError("Simulation failed.")
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        workspace = os.path.join(script_dir, case_path)
+        coefficients = read_force_coefficients(os.path.join(workspace, "Run"))
+        return {**coefficients, "cells": count_cells(os.path.join(workspace, "Mesh", "constant", "polyMesh"))}
+    except Exception as e:
+        print(f"Error during refinement pass: {e}")
+        return False
+
+
+def _run_polar_case(workspace, alpha, mesh_key, convergence, n_procs, warm_start=False):
+    """Solves one angle of attack of a polar sweep and returns its polar row."""
+    case_dir = create_sweep_case(workspace, alpha)
+    name = case_name(alpha)
+    cache_key = stage_key(workspace, "solution", mesh_key, convergence, "polar", alpha) if mesh_key else None
+    try:
+        if restore(cache_key, workspace):
+            print(f"Polar case {name} restored from the cache.")
+        else:
+            monitor = ConvergenceMonitor(**convergence) if convergence is not None else None
+            env = _prepare_parallel(case_dir, n_procs, reconstruct_options="-latestTime") if n_procs > 1 else None
+            env = dict(env) if env is not None else dict(os.environ)
+            env["SKIP_EXTRUDE"] = "1"
+            seed = None
+            if warm_start and monitor is not None:
+                seed, env = _warm_start(case_dir, _airfoil_stl(workspace), alpha, env)
+            _run_streamed([os.path.join(case_dir, "Allrun")], case_dir, monitor, env, report=False)
+            store(cache_key, workspace, [os.path.join(POLAR_DIR, name, "postProcessing")])
+            if monitor is not None:
+                _report_iterations(workspace, case_dir, cache_key, alpha, seed)
+        coefficients = read_force_coefficients(case_dir)
+        print(f"Polar case {name}: Cl={coefficients['Cl']:.4f} Cd={coefficients['Cd']:.4f} Cm={coefficients['Cm']:.4f}")
+        return {"alpha": alpha, **coefficients, "status": "ok"}
+    except Exception as e:
+        print(f"Polar case {name} failed: {e}")
+        return {"alpha": alpha, "Cl": float("nan"), "Cd": float("nan"), "Cm": float("nan"), "status": "failed"}
+
+
+def run_polar_sweep(case_path: str, alphas, convergence=None, parallel=False, warm_start=False):
+    """
+    Solves the meshed airfoil at several angles of attack and assembles the polar.
+
+    The 2D mesh is extruded once; every angle gets a lightweight copy of the Run case with a
+    rotated freestream and matching lift/drag directions, linking the shared polyMesh. The
+    cases run side by side, as many at a time as there are cores (each on its share of the
+    cores when `parallel` is set), and are cached per angle.
+
+    Args:
+        case_path (str): Directory holding the Mesh and Run cases.
+        alphas (list): Angles of attack in degrees.
+        convergence (dict): Optional keyword arguments for `ConvergenceMonitor`, applied to every case.
+        parallel (bool): Let each case run under MPI on its share of the cores.
+        warm_start (bool): Initialise every case from the closest stored solution, which
+                           includes the angles of this sweep that have already finished.
+
+    Returns:
+        list: Polar rows {'alpha', 'Cl', 'Cd', 'Cm', 'status'} sorted by angle, or False on failure.
+    """
+    print(f"Starting polar sweep over {len(alphas)} angles of attack in {case_path}...")
+    try:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        workspace = os.path.join(script_dir, case_path)
+        alphas = sorted({float(a) for a in alphas})
+        if not alphas:
+            raise ValueError("No angles of attack given.")
+
+        _check_mesh_quality(workspace)
+        # The per-angle cache keys hash Run/system, which must not carry an early stop
+        set_stop_at(os.path.join(workspace, "Run"), "endTime")
+        mesh_key = read_case_key(os.path.join(workspace, "Mesh"))
+        mesh_case = create_mesh_case(workspace)
+        _run_streamed(["extrudeMesh"], mesh_case, log_name="log.extrudeMesh")
+        n_cells = count_cells(os.path.join(mesh_case, "constant", "polyMesh"))
+
+        cores = detect_cores()
+        n_concurrent = min(len(alphas), cores)
+        n_procs = choose_subdomains(n_cells, cores // n_concurrent) if parallel and mpi_available() else 1
+        print(f"Running {n_concurrent} case(s) at a time on {n_procs} core(s) each.")
+        with ThreadPoolExecutor(max_workers=n_concurrent) as executor:
+            polar = list(executor.map(
+                lambda alpha: _run_polar_case(workspace, alpha, mesh_key, convergence, n_procs, warm_start), alphas))
+
+        write_polar(os.path.join(workspace, POLAR_DIR, POLAR_FILE), polar)
+        n_failed = sum(row["status"] != "ok" for row in polar)
+        if n_failed == len(polar):
+            raise RuntimeError("Every case of the polar sweep failed.")
+        print(f"Polar sweep completed ({n_failed} failed case(s)).")
+        return polar
+    except Exception as e:
+        print(f"Error during polar sweep: {e}")
+        return False
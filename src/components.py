@@ -1,26 +1,25 @@
+import os
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
-from scipy.interpolate import splprep, splev
 import streamlit as st
 
-def create_grid_image(width, height, x_min_val, x_max_val, y_min_val, y_max_val, x_step, y_step, points_to_draw, convert_func):
+from job_manager import PROGRESS_HISTORY, get_job
+
+GRID_CACHE_SIZE = 16
+SPLINE_CACHE_SIZE = 64
+SPLINE_SAMPLES = 500
+
+@lru_cache(maxsize=GRID_CACHE_SIZE)
+def _grid_background(width, height, x_min_val, x_max_val, y_min_val, y_max_val, x_step, y_step, convert_func):
     """
-    Function to create the image with grid, border, clicked points, and spline.
+    Draws the static part of the canvas (grid, labels, axes and border).
 
-    Args:
-        width (int): Width of the image.
-        height (int): Height of the image.
-        x_min_val (float): Minimum custom X-coordinate.
-        x_max_val (float): Maximum custom X-coordinate.
-        y_min_val (float): Minimum custom Y-coordinate.
-        y_max_val (float): Maximum custom Y-coordinate.
-        x_step (float): Step size for X-grid lines.
-        y_step (float): Step size for Y-grid lines.
-        points_to_draw (list): List of dictionaries, each with 'x' and 'y' custom coordinates.
-        convert_func (function): The function to convert custom coordinates to pixel coordinates.
+    The result only depends on the arguments, so it is cached and shared between reruns;
+    callers must copy it before drawing on it.
 
     Returns:
-        PIL.Image.Image: The generated image.
+        PIL.Image.Image: The background image.
     """
     image = Image.new("RGB", (width, height), (255, 255, 255))
     draw = ImageDraw.Draw(image)
@@ -34,30 +33,35 @@ def create_grid_image(width, height, x_min_val, x_max_val, y_min_val, y_max_val,
     text_color = (50, 50, 50)
     axis_line_color = (100, 100, 100) # For X and Y axes
 
-    # Draw vertical grid lines and X-axis labels
-    start_x_grid = np.floor(x_min_val / x_step) * x_step
+    # Grid line positions, accumulated the same way the labels are formatted
+    grid_x = []
+    current_x = np.floor(x_min_val / x_step) * x_step
     end_x_grid = np.ceil(x_max_val / x_step) * x_step
-
-    current_x = start_x_grid
     while current_x <= end_x_grid:
         if x_min_val <= current_x <= x_max_val:
-            px, _ = convert_func(current_x, y_min_val, width, height, x_min_val, x_max_val, y_min_val, y_max_val)
-            draw.line([(px, 0), (px, height)], fill=grid_color, width=1)
-            draw.text((px + 2, 2), f"{current_x:.2f}", fill=text_color, font=font)
+            grid_x.append(current_x)
         current_x += x_step
 
-    # Draw horizontal grid lines and Y-axis labels
-    start_y_grid = np.floor(y_min_val / y_step) * y_step
+    grid_y = []
+    current_y = np.floor(y_min_val / y_step) * y_step
     end_y_grid = np.ceil(y_max_val / y_step) * y_step
-
-    current_y = start_y_grid
     while current_y <= end_y_grid:
         if y_min_val <= current_y <= y_max_val:
-            _, py = convert_func(x_min_val, current_y, width, height, x_min_val, x_max_val, y_min_val, y_max_val)
-            draw.line([(0, py), (width, py)], fill=grid_color, width=1)
-            draw.text((2, py + 2), f"{current_y:.2f}", fill=text_color, font=font)
+            grid_y.append(current_y)
         current_y += y_step
 
+    # Draw vertical grid lines and X-axis labels
+    grid_px, _ = convert_func(grid_x, np.full(len(grid_x), y_min_val), width, height, x_min_val, x_max_val, y_min_val, y_max_val)
+    for value, px in zip(grid_x, grid_px.tolist()):
+        draw.line([(px, 0), (px, height)], fill=grid_color, width=1)
+        draw.text((px + 2, 2), f"{value:.2f}", fill=text_color, font=font)
+
+    # Draw horizontal grid lines and Y-axis labels
+    _, grid_py = convert_func(np.full(len(grid_y), x_min_val), grid_y, width, height, x_min_val, x_max_val, y_min_val, y_max_val)
+    for value, py in zip(grid_y, grid_py.tolist()):
+        draw.line([(0, py), (width, py)], fill=grid_color, width=1)
+        draw.text((2, py + 2), f"{value:.2f}", fill=text_color, font=font)
+
     # Draw X-axis (where Y=0)
     if y_min_val <= 0 <= y_max_val:
         _, y_axis_py = convert_func(0, 0, width, height, x_min_val, x_max_val, y_min_val, y_max_val)
@@ -73,48 +77,275 @@ def create_grid_image(width, height, x_min_val, x_max_val, y_min_val, y_max_val,
     border_width = 2
     draw.rectangle([(0, 0), (width - 1, height - 1)], outline=border_color, width=border_width)
 
-    # Draw all previously clicked points as dots
-    dot_radius = 5
-    for point in points_to_draw:
-        px, py = convert_func(point['x'], point['y'], width, height, x_min_val, x_max_val, y_min_val, y_max_val)
-        # Ensure points are drawn within image bounds
-        clamped_px = max(dot_radius, min(px, width - dot_radius))
-        clamped_py = max(dot_radius, min(py, height - dot_radius))
-        draw.ellipse(
-            (clamped_px - dot_radius, clamped_py - dot_radius,
-             clamped_px + dot_radius, clamped_py + dot_radius),
-            fill="red", outline="darkred"
-        )
+    return image
 
-    # Draw spline if enough points are present (at least 2 for a line, generally 4 for a smooth cubic spline)
-    if len(points_to_draw) >= 2:
-        x_coords_custom = np.array([p['x'] for p in points_to_draw])
-        y_coords_custom = np.array([p['y'] for p in points_to_draw])
 
-        try:
-            current_k = min(3, len(points_to_draw) - 1)
-            if current_k >= 1: # splprep requires k >= 1
-                tck, u = splprep([x_coords_custom, y_coords_custom], s=0, k=current_k)
-                x_new_custom, y_new_custom = splev(np.linspace(0, 1, 500), tck)
-            else: # Fallback to just drawing lines between points
-                x_new_custom, y_new_custom = x_coords_custom, y_coords_custom
+@lru_cache(maxsize=SPLINE_CACHE_SIZE)
+def _spline_curve(points):
+    """
+    Samples the interpolating spline through the clicked points.
+
+    Memoized on the point tuple, so reruns that do not change the points (e.g. any widget
+    interaction other than a click) reuse the previous fit.
+
+    Args:
+        points (tuple): Tuple of (x, y) custom coordinates, at least 2.
+
+    Returns:
+        tuple: (x, y) read-only arrays of the sampled curve in custom coordinates.
+    """
+    x_coords_custom, y_coords_custom = np.array(points, dtype=float).T
+
+    current_k = min(3, len(points) - 1)
+    if current_k >= 1: # splprep requires k >= 1
+        from scipy.interpolate import splprep, splev
+
+        tck, u = splprep([x_coords_custom, y_coords_custom], s=0, k=current_k)
+        x_new_custom, y_new_custom = (np.asarray(c) for c in splev(np.linspace(0, 1, SPLINE_SAMPLES), tck))
+    else: # Fallback to just drawing lines between points
+        x_new_custom, y_new_custom = x_coords_custom, y_coords_custom
+
+    x_new_custom.setflags(write=False)
+    y_new_custom.setflags(write=False)
+    return x_new_custom, y_new_custom
+
+
+def create_grid_image(width, height, x_min_val, x_max_val, y_min_val, y_max_val, x_step, y_step, points_to_draw, convert_func):
+    """
+    Function to create the image with grid, border, clicked points, and spline.
+
+    The static background is cached per range/step combination and the spline is memoized
+    on the clicked points, so a rerun only composites the points and the curve onto a copy
+    of the background.
+
+    Args:
+        width (int): Width of the image.
+        height (int): Height of the image.
+        x_min_val (float): Minimum custom X-coordinate.
+        x_max_val (float): Maximum custom X-coordinate.
+        y_min_val (float): Minimum custom Y-coordinate.
+        y_max_val (float): Maximum custom Y-coordinate.
+        x_step (float): Step size for X-grid lines.
+        y_step (float): Step size for Y-grid lines.
+        points_to_draw (list): List of dictionaries, each with 'x' and 'y' custom coordinates.
+        convert_func (function): The function to convert custom coordinates to pixel coordinates;
+                                 called with whole coordinate arrays (see `utils_old.convert_custom_to_pixel`).
+
+    Returns:
+        PIL.Image.Image: The generated image.
+    """
+    image = _grid_background(width, height, x_min_val, x_max_val, y_min_val, y_max_val,
+                             x_step, y_step, convert_func).copy()
+    if not points_to_draw:
+        return image
+    draw = ImageDraw.Draw(image)
+    ranges = (width, height, x_min_val, x_max_val, y_min_val, y_max_val)
 
-            spline_points_pixel = []
-            for i in range(len(x_new_custom)):
-                px, py = convert_func(x_new_custom[i], y_new_custom[i], width, height, x_min_val, x_max_val, y_min_val, y_max_val)
-                spline_points_pixel.append((px, py))
+    points = tuple((p['x'], p['y']) for p in points_to_draw)
+    px, py = convert_func([p[0] for p in points], [p[1] for p in points], *ranges)
+
+    # Draw all previously clicked points as dots, kept within image bounds
+    dot_radius = 5
+    clamped_px = np.clip(px, dot_radius, width - dot_radius)
+    clamped_py = np.clip(py, dot_radius, height - dot_radius)
+    for cx, cy in zip(clamped_px.tolist(), clamped_py.tolist()):
+        draw.ellipse((cx - dot_radius, cy - dot_radius, cx + dot_radius, cy + dot_radius),
+                     fill="red", outline="darkred")
 
-            if len(spline_points_pixel) > 1:
-                draw.line(spline_points_pixel, fill="blue", width=2)
+    # Draw spline if enough points are present (at least 2 for a line, generally 4 for a smooth cubic spline)
+    if len(points) >= 2:
+        try:
+            x_new_custom, y_new_custom = _spline_curve(points)
+            spline_px, spline_py = convert_func(x_new_custom, y_new_custom, *ranges)
+            draw.line(list(zip(spline_px.tolist(), spline_py.tolist())), fill="blue", width=2)
 
         except Exception as e:
             st.warning(f"Could not draw smooth spline on image (try adding more points or adjusting smoothness if plotting fails). Error: {e}")
             # Fallback to simple lines if spline fails
-            if len(points_to_draw) > 1:
-                line_points_pixel = []
-                for p in points_to_draw:
-                    px, py = convert_func(p['x'], p['y'], width, height, x_min_val, x_max_val, y_min_val, y_max_val)
-                    line_points_pixel.append((px,py))
-                draw.line(line_points_pixel, fill="blue", width=2)
+            draw.line(list(zip(px.tolist(), py.tolist())), fill="blue", width=2)
 
     return image
+
+
+@st.fragment(run_every=2)
+def job_status_panel(job_id, label, preview_images=None):
+    """
+    Polls a background job every few seconds without rerunning the whole page.
+
+    Once the job has finished, a full app rerun is triggered so that the main
+    script can pick up the result.
+
+    Args:
+        job_id (str): Id returned by `job_manager.submit_job`.
+        label (str): Name of the stage shown to the user (e.g. 'Meshing').
+        preview_images (list): Image files the job keeps updating (e.g. the latest rendered
+                               frames); those that exist are shown below the progress plot.
+    """
+    job = get_job(job_id)
+    panels = st.session_state.setdefault('job_progress', {})
+    if job is None or job.finished:
+        panels.pop(job_id, None)
+        st.rerun(scope="app")
+        return
+    st.info(f"{label} {job.state}... ({job.elapsed:.0f} s elapsed). You can keep working on the page meanwhile.")
+    # Only the samples published since the last poll are fetched, and the plot is redrawn only if there are any
+    panel = panels.setdefault(job_id, {'count': 0, 'samples': [], 'image': None})
+    new_samples, panel['count'] = job.progress_since(panel['count'])
+    if new_samples:
+        import io
+
+        import matplotlib.pyplot as plt
+
+        panel['samples'] = (panel['samples'] + new_samples)[-PROGRESS_HISTORY:]
+        fig = create_convergence_plot(panel['samples'])
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png")
+        plt.close(fig)
+        panel['image'] = buffer.getvalue()
+    if panel['image'] is not None:
+        st.image(panel['image'])
+    for path in preview_images or []:
+        if os.path.exists(path):
+            st.image(path, caption=f"Latest frame: {os.path.basename(path)}")
+
+
+FORCE_COEFFICIENTS = ('Cd', 'Cl', 'Cm', 'Cs')
+
+def create_convergence_plot(samples):
+    """
+    Function to plot solver residuals and force coefficients against time.
+
+    Args:
+        samples (list): Progress samples as produced by `log_parser.FoamLogParser`, i.e.
+                        dictionaries with a 'time' key plus residual and coefficient values.
+
+    Returns:
+        matplotlib.figure.Figure: Figure with the residuals (log scale) on the left and Cl/Cd on the right.
+    """
+    import matplotlib.pyplot as plt
+
+    fig, (ax_res, ax_coeff) = plt.subplots(1, 2, figsize=(10, 4))
+
+    fields = []
+    for sample in samples:
+        for key in sample:
+            if key != 'time' and key not in fields:
+                fields.append(key)
+
+    for field in fields:
+        times = [s['time'] for s in samples if field in s]
+        values = [s[field] for s in samples if field in s]
+        if field in FORCE_COEFFICIENTS:
+            if field in ('Cd', 'Cl'):
+                ax_coeff.plot(times, values, label=field)
+        else:
+            ax_res.semilogy(times, values, label=field)
+
+    ax_res.set_xlabel('Iteration')
+    ax_res.set_title('Initial residuals')
+    ax_res.grid(True)
+    ax_coeff.set_xlabel('Iteration')
+    ax_coeff.set_title('Force coefficients')
+    ax_coeff.grid(True)
+    if ax_res.lines:
+        ax_res.legend()
+    if ax_coeff.lines:
+        ax_coeff.legend()
+    fig.tight_layout()
+    return fig
+
+
+def create_polar_plot(polar):
+    """
+    Function to plot the lift, drag and moment polars of a polar sweep.
+
+    Args:
+        polar (list): Polar rows as returned by `cfd_runner.run_polar_sweep`, i.e. dictionaries
+                      with 'alpha', 'Cl', 'Cd', 'Cm' and 'status'; failed angles are skipped.
+
+    Returns:
+        matplotlib.figure.Figure: Figure with Cl(alpha), Cd(alpha), Cm(alpha) and Cl(Cd).
+    """
+    import matplotlib.pyplot as plt
+
+    rows = [row for row in polar if row['status'] == 'ok']
+    alpha = [row['alpha'] for row in rows]
+    cl = [row['Cl'] for row in rows]
+    cd = [row['Cd'] for row in rows]
+    cm = [row['Cm'] for row in rows]
+
+    fig, axes = plt.subplots(2, 2, figsize=(10, 8))
+    for ax, values, label in ((axes[0, 0], cl, 'Cl'), (axes[0, 1], cd, 'Cd'), (axes[1, 0], cm, 'Cm')):
+        ax.plot(alpha, values, 'o-')
+        ax.set_xlabel('Angle of attack (deg)')
+        ax.set_ylabel(label)
+        ax.set_title(f'{label} vs angle of attack')
+        ax.grid(True)
+    axes[1, 1].plot(cd, cl, 'o-')
+    axes[1, 1].set_xlabel('Cd')
+    axes[1, 1].set_ylabel('Cl')
+    axes[1, 1].set_title('Drag polar')
+    axes[1, 1].grid(True)
+    fig.tight_layout()
+    return fig
+
+
+def create_cp_plot(preview):
+    """
+    Function to plot the pressure distribution of a panel method preview.
+
+    Args:
+        preview (dict): Result of `panel_method.solve_airfoil` ('x', 'cp', 'transition').
+
+    Returns:
+        matplotlib.figure.Figure: Figure with -Cp against x.
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 4))
+    ax.plot(preview['x'], -preview['cp'], 'b-', label='-Cp')
+    if preview['transition'] is not None:
+        for x_transition, label, color in zip(preview['transition'], ('Upper transition', 'Lower transition'), ('k', 'gray')):
+            ax.axvline(x_transition, linestyle='--', color=color, label=label)
+    ax.set_xlabel('X Coordinate')
+    ax.set_ylabel('-Cp')
+    ax.set_title('Panel Method Pressure Distribution')
+    ax.grid(True)
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+def create_field_plot(fields, outline=None):
+    """
+    Function to plot the pressure and velocity magnitude of a solution around the airfoil.
+
+    Args:
+        fields (dict): Cell centres 'x', 'y' and cell values 'p', 'U' (see `progressive.final_fields`).
+        outline (np.ndarray): (n, 2) airfoil coordinates; triangles inside the airfoil are masked.
+
+    Returns:
+        matplotlib.figure.Figure: Filled contours of p (left) and |U| (right).
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.path import Path
+    from matplotlib.tri import Triangulation
+
+    triangulation = Triangulation(fields['x'], fields['y'])
+    if outline is not None:
+        centroids = np.column_stack([fields['x'][triangulation.triangles].mean(axis=1),
+                                     fields['y'][triangulation.triangles].mean(axis=1)])
+        triangulation.set_mask(Path(outline).contains_points(centroids))
+
+    fig, axes = plt.subplots(1, 2, figsize=(10, 4))
+    for ax, name, label in ((axes[0], 'p', 'Pressure'), (axes[1], 'U', 'Velocity magnitude')):
+        contours = ax.tricontourf(triangulation, fields[name], levels=50, cmap='jet')
+        fig.colorbar(contours, ax=ax, shrink=0.8)
+        if outline is not None:
+            ax.fill(outline[:, 0], outline[:, 1], color='lightgray', edgecolor='k', linewidth=0.5)
+        ax.set_aspect('equal')
+        ax.set_title(label)
+        ax.set_xlabel('X Coordinate')
+    axes[0].set_ylabel('Y Coordinate')
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,96 @@
+import math
+import os
+import re
+from collections import deque
+
+import numpy as np
+
+from foam_dict import rewrite_dict
+
+CONVERGED = "converged"
+DIVERGED = "diverged"
+
+_STOP_AT_RE = re.compile(r"^(\s*stopAt\s+)\w+(\s*;)", re.MULTILINE)
+
+
+class ConvergenceMonitor:
+    """
+    Decides from the streamed solver samples whether a run has converged or diverged.
+
+    A run is considered converged once, after `min_iterations`, the standard deviation of
+    Cl and Cd over the last `window` samples is below `coeff_tolerance` and every initial
+    residual of the latest time step is below `residual_tolerance`.
+    It is considered diverged as soon as Cl or Cd becomes non-finite or exceeds
+    `divergence_limit` in magnitude.
+    """
+
+    def __init__(self, window=50, coeff_tolerance=1e-3, residual_tolerance=1e-4,
+                 divergence_limit=1e3, min_iterations=100):
+        """
+        Args:
+            window (int): Number of time steps over which Cl/Cd fluctuations are measured.
+            coeff_tolerance (float): Maximum standard deviation of Cl and Cd over the window.
+            residual_tolerance (float): Maximum initial residual of every solved field.
+            divergence_limit (float): |Cl| or |Cd| above this value aborts the run.
+            min_iterations (int): Time steps to run before convergence is checked at all.
+        """
+        self.window = int(window)
+        self.coeff_tolerance = coeff_tolerance
+        self.residual_tolerance = residual_tolerance
+        self.divergence_limit = divergence_limit
+        self.min_iterations = int(min_iterations)
+        self._cl = deque(maxlen=self.window)
+        self._cd = deque(maxlen=self.window)
+        self._iterations = 0
+        self.message = ""
+
+    def update(self, sample):
+        """
+        Feeds one time step sample (as produced by `log_parser.FoamLogParser`).
+
+        Returns:
+            str or None: 'converged', 'diverged' or None while the run should carry on.
+        """
+        self._iterations += 1
+        time_value = sample.get('time')
+
+        for name in ('Cl', 'Cd'):
+            value = sample.get(name)
+            if value is None:
+                continue
+            if not math.isfinite(value) or abs(value) > self.divergence_limit:
+                self.message = f"{name} = {value} at time {time_value} exceeds the divergence limit {self.divergence_limit}."
+                return DIVERGED
+
+        if 'Cl' in sample and 'Cd' in sample:
+            self._cl.append(sample['Cl'])
+            self._cd.append(sample['Cd'])
+
+        if self._iterations < self.min_iterations or len(self._cl) < self.window:
+            return None
+
+        residuals = [v for k, v in sample.items() if k not in ('time', 'Cl', 'Cd', 'Cm', 'Cs')]
+        if any(not r <= self.residual_tolerance for r in residuals): # NaN residuals never pass
+            return None
+
+        cl_std = float(np.std(self._cl))
+        cd_std = float(np.std(self._cd))
+        if cl_std < self.coeff_tolerance and cd_std < self.coeff_tolerance:
+            self.message = (f"Converged at time {time_value}: std(Cl) = {cl_std:.2e}, std(Cd) = {cd_std:.2e} "
+                            f"over the last {self.window} steps.")
+            return CONVERGED
+        return None
+
+
+def set_stop_at(case_dir, value="endTime"):
+    """
+    Sets the `stopAt` entry of a case's system/controlDict.
+
+    With `runTimeModifiable true` a running solver re-reads the dictionary, so
+    writing `writeNow` stops it cleanly after writing the current time step.
+
+    Args:
+        case_dir (str): OpenFOAM case directory.
+        value (str): New stopAt value ('endTime', 'writeNow', ...).
+    """
+    rewrite_dict(os.path.join(case_dir, "system", "controlDict"), _STOP_AT_RE, rf"\g<1>{value}\g<2>", count=1)
@@ -0,0 +1,137 @@
+import os
+import re
+import shutil
+
+from job_manager import MAX_WORKERS
+
+# Below this many cells per subdomain the MPI communication outweighs the gain.
+MIN_CELLS_PER_PROC = 5000
+
+_DECOMPOSE_PAR_DICT = """/*--------------------------------*- C++ -*----------------------------------*\\
+| =========                 |                                                 |
+| \\\\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox           |
+|  \\\\    /   O peration     | Version:  12                                    |
+|   \\\\  /    A nd           | Web:      www.OpenFOAM.org                      |
+|    \\\\/     M anipulation  |                                                 |
+\\*---------------------------------------------------------------------------*/
+FoamFile
+{{
+    version     2.0;
+    format      ascii;
+    class       dictionary;
+    location    "system";
+    object      decomposeParDict;
+}}
+// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * //
+// Written by cfd_runner for a parallel run.
+
+numberOfSubdomains {n_subdomains};
+
+method          {method};
+
+// ************************************************************************* //
+"""
+
+_N_CELLS_RE = re.compile(r"nCells:\s*(\d+)")
+
+
+def detect_cores():
+    """
+    Returns the number of cores available to this process for parallel runs.
+
+    Respects CPU affinity/cgroup pinning where the platform exposes it, and can be capped
+    with the AIRFOIL_MAX_PROCS environment variable. The cores are shared between the
+    concurrent background jobs of `job_manager`.
+    """
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    cores = max(1, cores // max(1, MAX_WORKERS))
+    max_procs = os.environ.get("AIRFOIL_MAX_PROCS")
+    if max_procs:
+        cores = min(cores, int(max_procs))
+    return max(1, cores)
+
+
+def count_cells(polymesh_dir):
+    """
+    Reads the number of cells of a mesh from the header note of its `owner` file.
+
+    Args:
+        polymesh_dir (str): Path to a constant/polyMesh directory.
+
+    Returns:
+        int or None: Number of cells, or None if the mesh has not been generated yet.
+    """
+    owner_path = os.path.join(polymesh_dir, "owner")
+    if not os.path.exists(owner_path):
+        return None
+    with open(owner_path, errors="replace") as f:
+        header = f.read(2048)
+    match = _N_CELLS_RE.search(header)
+    return int(match.group(1)) if match else None
+
+
+def choose_subdomains(n_cells=None, cores=None):
+    """
+    Sizes the decomposition for the available cores and, if known, the mesh size.
+
+    Args:
+        n_cells (int): Number of cells of the mesh to decompose (None if unknown).
+        cores (int): Number of cores to use; detected automatically if None.
+
+    Returns:
+        int: Number of subdomains (1 means run serially).
+    """
+    if cores is None:
+        cores = detect_cores()
+    if n_cells is not None:
+        cores = min(cores, max(1, n_cells // MIN_CELLS_PER_PROC))
+    return max(1, cores)
+
+
+def mpi_available():
+    """Returns True if an `mpirun` launcher is on the PATH."""
+    return shutil.which("mpirun") is not None
+
+
+def write_decompose_par_dict(case_dir, n_subdomains, method="scotch"):
+    """
+    Writes system/decomposeParDict for the given number of subdomains.
+
+    scotch needs no per-direction split counts, so it works for any subdomain count and
+    for the one-cell-thick 2D meshes used here.
+
+    Args:
+        case_dir (str): OpenFOAM case directory.
+        n_subdomains (int): Number of subdomains (MPI ranks).
+        method (str): Decomposition method.
+    """
+    path = os.path.join(case_dir, "system", "decomposeParDict")
+    with open(path, "w") as f:
+        f.write(_DECOMPOSE_PAR_DICT.format(n_subdomains=n_subdomains, method=method))
+    return path
+
+
+def parallel_env(n_subdomains, reconstruct_options="-newTimes"):
+    """
+    Builds the environment for the Allrun scripts' parallel branch.
+
+    Args:
+        n_subdomains (int): Number of MPI ranks, exported as NPROCS.
+        reconstruct_options (str): Options for reconstructPar, exported as RECONSTRUCT_OPTS.
+                                   '-newTimes' skips times already reconstructed,
+                                   '-latestTime' only rebuilds the final solution.
+
+    Returns:
+        dict: A copy of the current environment with the parallel settings added.
+    """
+    env = dict(os.environ)
+    env["NPROCS"] = str(n_subdomains)
+    env["RECONSTRUCT_OPTS"] = reconstruct_options
+    if hasattr(os, "geteuid") and os.geteuid() == 0:
+        # The Docker image runs as root, which Open MPI refuses by default.
+        env.setdefault("OMPI_ALLOW_RUN_AS_ROOT", "1")
+        env.setdefault("OMPI_ALLOW_RUN_AS_ROOT_CONFIRM", "1")
+    return env
@@ -0,0 +1,159 @@
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+
+from foam_reader import build_grid, list_times, read_field, read_polymesh
+
+# Directory, inside a case, holding the binary store of its time series.
+STORE_DIR = "fieldStore"
+FIELDS = ('U', 'p', 'phi', 'nut', 'k', 'omega')
+
+_INDEX_FILE = "index.json"
+_MESH_ARRAYS = ('points', 'face_sizes', 'faces', 'owner', 'neighbour')
+
+
+def ingest_run(case_dir, fields=FIELDS, dtype=np.float32, store_dir=None):
+    """
+    Converts the ASCII time directories of a finished run into a binary store.
+
+    The mesh topology is written once and every field becomes a single contiguous
+    (n_times, n_values[, 3]) .npy array, filled one time step at a time through a memory
+    map so the whole run is never held in RAM. Time steps a field is missing from (e.g.
+    phi at time 0) are filled with NaN.
+
+    Args:
+        case_dir (str): OpenFOAM case directory with constant/polyMesh and the time directories.
+        fields (tuple): Fields to ingest; fields absent from every time directory are skipped.
+        dtype: Floating point type the fields are stored as.
+        store_dir (str): Output directory, '<case_dir>/fieldStore' by default.
+
+    Returns:
+        str: Path of the store.
+    """
+    if store_dir is None:
+        store_dir = os.path.join(case_dir, STORE_DIR)
+    times = list_times(case_dir)
+    if not times:
+        raise RuntimeError(f"No time directories found in {case_dir}")
+    mesh = read_polymesh(os.path.join(case_dir, "constant", "polyMesh"))
+    n_cells = mesh['n_cells']
+
+    # Written next to the final location and renamed, so readers never see a partial store.
+    tmp_dir = f"{store_dir}.{uuid.uuid4().hex}.tmp"
+    os.makedirs(tmp_dir)
+    try:
+        for name in _MESH_ARRAYS:
+            np.save(os.path.join(tmp_dir, f"mesh_{name}.npy"), mesh[name])
+
+        stored_fields = {}
+        for field in fields:
+            paths = [os.path.join(case_dir, t, field) for t in times]
+            present = [i for i, p in enumerate(paths) if os.path.exists(p) or os.path.exists(p + ".gz")]
+            if not present:
+                continue
+            first = read_field(paths[present[0]], n_cells)
+            array = np.lib.format.open_memmap(os.path.join(tmp_dir, f"{field}.npy"), mode="w+",
+                                              dtype=dtype, shape=(len(times),) + first.shape)
+            array[:] = np.nan
+            for i in present:
+                values = first if i == present[0] else read_field(paths[i], n_cells)
+                if values.shape != first.shape:
+                    raise ValueError(f"{paths[i]} has shape {values.shape}, expected {first.shape}")
+                array[i] = values
+            array.flush()
+            del array
+            stored_fields[field] = list(first.shape)
+
+        with open(os.path.join(tmp_dir, _INDEX_FILE), "w") as f:
+            json.dump({"times": times, "n_cells": n_cells, "fields": stored_fields,
+                       "dtype": np.dtype(dtype).name}, f)
+        shutil.rmtree(store_dir, ignore_errors=True)
+        os.rename(tmp_dir, store_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    print(f"Ingested {len(times)} time steps of {list(stored_fields)} into {store_dir}")
+    return store_dir
+
+
+class FieldStore:
+    """
+    Read-only access to a store written by `ingest_run`.
+
+    Arrays are opened with `numpy.memmap`, so indexing a time step or a cell range only
+    reads those bytes from disk.
+    """
+
+    def __init__(self, store_dir):
+        with open(os.path.join(store_dir, _INDEX_FILE)) as f:
+            index = json.load(f)
+        self.store_dir = store_dir
+        self.times = index["times"]
+        self.fields = list(index["fields"])
+        self.n_cells = index["n_cells"]
+        self._arrays = {}
+        self._grid = None
+
+    def field(self, name):
+        """Returns the memory-mapped (n_times, n_values[, 3]) array of a field."""
+        if name not in self._arrays:
+            if name not in self.fields:
+                raise KeyError(f"Field '{name}' is not in {self.store_dir}. Available fields: {self.fields}")
+            self._arrays[name] = np.load(os.path.join(self.store_dir, f"{name}.npy"), mmap_mode="r")
+        return self._arrays[name]
+
+    def time_index(self, time):
+        """Returns the index on the time axis of a time directory name (or value)."""
+        values = [float(t) for t in self.times]
+        return values.index(float(time))
+
+    def mesh(self):
+        """Returns the mesh arrays, memory-mapped, in the layout of `foam_reader.read_polymesh`."""
+        mesh = {name: np.load(os.path.join(self.store_dir, f"mesh_{name}.npy"), mmap_mode="r")
+                for name in _MESH_ARRAYS}
+        mesh['n_cells'] = self.n_cells
+        return mesh
+
+    def grid(self, time=None, fields=None, point_data=True):
+        """
+        Returns the mesh as a pyvista grid, with the cell fields of one time step attached.
+
+        Args:
+            time (str): Time directory name; None returns the bare mesh.
+            fields (list): Cell fields to attach (all cell fields by default).
+            point_data (bool): Also interpolate the fields to the points.
+        """
+        if self._grid is None:
+            self._grid = build_grid(self.mesh())
+        grid = self._grid.copy(deep=False)
+        if time is None:
+            return grid
+        i = self.time_index(time)
+        for name in fields if fields is not None else self.fields:
+            values = self.field(name)[i]
+            if values.shape[0] != self.n_cells:
+                continue  # face fields such as phi
+            grid.cell_data[name] = np.asarray(values, dtype=np.float64)
+        if point_data and grid.cell_data:
+            grid = grid.cell_data_to_point_data(pass_cell_data=True)
+        grid.set_active_scalars(None)
+        return grid
+
+
+def open_store(case_dir):
+    """
+    Opens the store of a case if it exists and covers the case's current time directories.
+
+    Returns:
+        FieldStore or None: None if the run has not been ingested (or has changed since).
+    """
+    store_dir = os.path.join(case_dir, STORE_DIR)
+    try:
+        store = FieldStore(store_dir)
+    except (OSError, ValueError, KeyError):
+        return None
+    if store.times != list_times(case_dir):
+        return None
+    return store
@@ -0,0 +1,35 @@
+import os
+
+
+def rewrite_dict(path, pattern, replacement, count=0, required=True):
+    """
+    Substitutes a regular expression in an OpenFOAM dictionary file.
+
+    The file is replaced atomically, so a solver re-reading its dictionaries
+    (`runTimeModifiable true`) never sees one half written, and is left untouched when
+    the substitution changes nothing.
+
+    Args:
+        path (str): Dictionary file.
+        pattern (re.Pattern): Compiled pattern of the entry to change.
+        replacement (str): Replacement, as for `re.sub`.
+        count (int): Maximum number of substitutions, 0 for all.
+        required (bool): Whether it is an error for the pattern not to occur in the file.
+
+    Returns:
+        int: Number of substitutions made.
+
+    Raises:
+        RuntimeError: If `required` and the pattern does not occur in the file.
+    """
+    with open(path) as f:
+        text = f.read()
+    new_text, substitutions = pattern.subn(replacement, text, count=count)
+    if substitutions == 0 and required:
+        raise RuntimeError(f"Pattern {pattern.pattern!r} not found in {path}")
+    if new_text != text:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(new_text)
+        os.replace(tmp_path, path)
+    return substitutions
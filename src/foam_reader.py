@@ -0,0 +1,241 @@
+import gzip
+import os
+import re
+
+import numpy as np
+
+# Lists with at most this many entries may be written on a single line by OpenFOAM.
+_SHORT_LIST_SIZE = 10
+
+_TIME_DIR_RE = re.compile(r"^[-+]?\d+(\.\d+)?([eE][-+]?\d+)?$")
+_FORMAT_RE = re.compile(r"\bformat\s+(\w+)\s*;")
+_INTERNAL_FIELD_RE = re.compile(
+    r"internalField\s+(?:(uniform)\s+([^;]+);|nonuniform\s+List<(\w+)>\s*(\d+)\s*\()"
+)
+_FACE_SIZES_RE = re.compile(r"(\d+)\(")
+
+
+def _read_text(path):
+    """Reads an (optionally gzip compressed) OpenFOAM ASCII file."""
+    if not os.path.exists(path) and os.path.exists(path + ".gz"):
+        path = path + ".gz"
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", errors="replace") as f:
+        text = f.read()
+    match = _FORMAT_RE.search(text, 0, 2048)
+    if match and match.group(1) != "ascii":
+        raise ValueError(f"{path} is written in '{match.group(1)}' format; only ascii is supported.")
+    return text
+
+
+def _list_end(text, open_pos, count, nested):
+    """Returns the position of the ')' closing the list opened at `open_pos`."""
+    if count <= _SHORT_LIST_SIZE:
+        # Short lists may be written inline, so find the matching parenthesis.
+        depth = 0
+        for pos in range(open_pos, len(text)):
+            if text[pos] == "(":
+                depth += 1
+            elif text[pos] == ")":
+                depth -= 1
+                if depth == 0:
+                    return pos
+        raise ValueError("Unterminated list")
+    if not nested:
+        return text.index(")", open_pos)
+    # Long lists put every entry on its own line, so the outer list closes with ')' at line start.
+    return text.index("\n)", open_pos) + 1
+
+
+def _parse_numbers(text, dtype):
+    values = np.fromstring(text.replace("(", " ").replace(")", " "), sep=" ")
+    return values.astype(dtype, copy=False)
+
+
+def _read_list(text, nested, dtype, search_from=0):
+    """Parses the first `N ( ... )` list found after the FoamFile header of `text`."""
+    header_end = text.index("}", text.index("FoamFile")) + 1 if "FoamFile" in text else 0
+    match = re.compile(r"(\d+)\s*\(").search(text, max(header_end, search_from))
+    if match is None:
+        raise ValueError("No list found")
+    count = int(match.group(1))
+    open_pos = match.end() - 1
+    end = _list_end(text, open_pos, count, nested)
+    return count, text[open_pos + 1:end]
+
+
+def read_points(polymesh_dir):
+    """Returns the mesh points as an (N, 3) float array."""
+    count, body = _read_list(_read_text(os.path.join(polymesh_dir, "points")), True, np.float64)
+    return _parse_numbers(body, np.float64).reshape(count, 3)
+
+
+def read_faces(polymesh_dir):
+    """
+    Reads the mesh faces.
+
+    Returns:
+        tuple: (sizes, flat) where `sizes` holds the number of points of each face and `flat`
+               the size-prefixed point ids of all faces ([n0, p, p, ..., n1, p, p, ...]).
+    """
+    count, body = _read_list(_read_text(os.path.join(polymesh_dir, "faces")), True, np.int64)
+    sizes = np.array(_FACE_SIZES_RE.findall(body), dtype=np.int64)
+    flat = _parse_numbers(body, np.int64)
+    if sizes.size != count or flat.size != count + sizes.sum():
+        raise ValueError(f"Could not parse the faces of {polymesh_dir}")
+    return sizes, flat
+
+
+def read_labels(path):
+    """Reads a labelList file such as owner or neighbour."""
+    count, body = _read_list(_read_text(path), False, np.int64)
+    labels = _parse_numbers(body, np.int64)
+    if labels.size != count:
+        raise ValueError(f"Expected {count} labels in {path}, found {labels.size}")
+    return labels
+
+
+def read_field(path, n_cells):
+    """
+    Reads the internal field of a volScalarField or volVectorField.
+
+    Args:
+        path (str): Field file, e.g. '<case>/100/U'.
+        n_cells (int): Number of cells of the mesh (needed to expand uniform fields).
+
+    Returns:
+        np.ndarray: (n_cells,) array for scalars, (n_cells, 3) for vectors.
+    """
+    text = _read_text(path)
+    match = _INTERNAL_FIELD_RE.search(text)
+    if match is None:
+        raise ValueError(f"No internalField found in {path}")
+    if match.group(1):
+        value = _parse_numbers(match.group(2), np.float64)
+        if value.size == 1:
+            return np.full(n_cells, value[0])
+        return np.tile(value, (n_cells, 1))
+    kind, count = match.group(3), int(match.group(4))
+    open_pos = match.end() - 1
+    body = text[open_pos + 1:_list_end(text, open_pos, count, kind != "scalar")]
+    values = _parse_numbers(body, np.float64)
+    if kind == "scalar":
+        return values
+    return values.reshape(count, -1)
+
+
+def read_polymesh(polymesh_dir):
+    """
+    Reads a constant/polyMesh directory.
+
+    Returns:
+        dict: 'points', 'face_sizes', 'faces' (size-prefixed flat array), 'owner', 'neighbour'
+              and 'n_cells'.
+    """
+    points = read_points(polymesh_dir)
+    face_sizes, faces = read_faces(polymesh_dir)
+    owner = read_labels(os.path.join(polymesh_dir, "owner"))
+    neighbour = read_labels(os.path.join(polymesh_dir, "neighbour"))
+    n_cells = int(max(owner.max(), neighbour.max() if neighbour.size else -1)) + 1
+    return {
+        'points': points,
+        'face_sizes': face_sizes,
+        'faces': faces,
+        'owner': owner,
+        'neighbour': neighbour,
+        'n_cells': n_cells,
+    }
+
+
+def polyhedron_cells(face_sizes, faces, owner, neighbour, n_cells):
+    """
+    Builds the VTK polyhedron cell array of a polyMesh without looping over cells in Python.
+
+    Every cell is written as [n_values, n_faces, n_pts, p0, p1, ..., n_pts, ...]. Faces are
+    listed with outward normals, i.e. reversed for the neighbour cell of an internal face.
+
+    Returns:
+        np.ndarray: Flat cell array accepted by `pyvista.UnstructuredGrid`.
+    """
+    n_faces = face_sizes.size
+    n_internal = neighbour.size
+    face_starts = np.cumsum(face_sizes + 1) - (face_sizes + 1)
+
+    # One (cell, face) pair per face side, grouped by cell
+    pair_cell = np.concatenate([owner, neighbour])
+    pair_face = np.concatenate([np.arange(n_faces), np.arange(n_internal)])
+    pair_flip = np.concatenate([np.zeros(n_faces, bool), np.ones(n_internal, bool)])
+    order = np.argsort(pair_cell, kind="stable")
+    pair_cell, pair_face, pair_flip = pair_cell[order], pair_face[order], pair_flip[order]
+
+    seg_len = face_sizes[pair_face] + 1
+    faces_per_cell = np.bincount(pair_cell, minlength=n_cells)
+    cell_values = np.bincount(pair_cell, weights=seg_len, minlength=n_cells).astype(np.int64) + 1
+    cell_starts = np.cumsum(cell_values + 1) - (cell_values + 1)
+
+    seg_starts = np.cumsum(seg_len) - seg_len
+    first_pair = np.cumsum(faces_per_cell) - faces_per_cell
+    seg_pos = cell_starts[pair_cell] + 2 + seg_starts - seg_starts[first_pair][pair_cell]
+
+    out = np.empty(int((cell_values + 1).sum()), dtype=np.int64)
+    out[cell_starts] = cell_values
+    out[cell_starts + 1] = faces_per_cell
+
+    pair_of_value = np.repeat(np.arange(pair_cell.size), seg_len)
+    local = np.arange(pair_of_value.size) - np.repeat(seg_starts, seg_len)
+    src_local = np.where(pair_flip[pair_of_value] & (local > 0), seg_len[pair_of_value] - local, local)
+    out[seg_pos[pair_of_value] + local] = faces[face_starts[pair_face][pair_of_value] + src_local]
+    return out
+
+
+def build_grid(mesh):
+    """
+    Builds a pyvista UnstructuredGrid from the output of `read_polymesh`.
+    """
+    import pyvista as pv
+
+    cells = polyhedron_cells(mesh['face_sizes'], mesh['faces'], mesh['owner'], mesh['neighbour'], mesh['n_cells'])
+    cell_types = np.full(mesh['n_cells'], pv.CellType.POLYHEDRON, dtype=np.uint8)
+    return pv.UnstructuredGrid(cells, cell_types, mesh['points'])
+
+
+def list_times(case_dir, include_zero=True):
+    """Returns the time directory names of a case, sorted numerically."""
+    times = [name for name in os.listdir(case_dir)
+             if _TIME_DIR_RE.match(name) and os.path.isdir(os.path.join(case_dir, name))]
+    if not include_zero:
+        times = [t for t in times if float(t) != 0]
+    return sorted(times, key=float)
+
+
+def read_case(case_dir, time=None, fields=('U', 'p', 'k', 'nut', 'omega'), point_data=True, grid=None):
+    """
+    Reads an OpenFOAM ASCII case straight into a pyvista grid, replacing foamToVTK + pv.read.
+
+    Args:
+        case_dir (str): Case directory holding constant/polyMesh.
+        time (str): Time directory to read fields from; None reads the mesh only.
+        fields (tuple): Fields to load (missing ones are skipped).
+        point_data (bool): Also interpolate the cell fields to the points, like foamToVTK does.
+        grid (pyvista.UnstructuredGrid): Grid from a previous call to reuse, since the mesh is
+                                         the same for every time step of a run.
+
+    Returns:
+        pyvista.UnstructuredGrid: The mesh with the fields as cell (and point) data.
+    """
+    if grid is None:
+        grid = build_grid(read_polymesh(os.path.join(case_dir, "constant", "polyMesh")))
+    else:
+        grid = grid.copy(deep=False)
+        grid.clear_data()
+    if time is None:
+        return grid
+    for field in fields:
+        path = os.path.join(case_dir, str(time), field)
+        if os.path.exists(path) or os.path.exists(path + ".gz"):
+            grid.cell_data[field] = read_field(path, grid.n_cells)
+    if point_data and grid.cell_data:
+        grid = grid.cell_data_to_point_data(pass_cell_data=True)
+    # Leave no array active, like a file written by foamToVTK, so callers pick arrays explicitly.
+    grid.set_active_scalars(None)
+    return grid
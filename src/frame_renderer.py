@@ -0,0 +1,172 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from field_store import open_store
+from foam_reader import list_times
+from render_server import FieldScene, FrameSource, ensure_display, get_render_server
+
+# Number of off-screen renderer processes (defaults to one per core).
+RENDER_WORKERS = int(os.environ.get("AIRFOIL_RENDER_WORKERS", "0")) or (os.cpu_count() or 1)
+
+# Fields animated after a run.
+ANIMATION_FIELDS = ['U', 'p']
+VIDEO_FPS = 10
+
+# Per process frame source and warm scene, set by `_init_worker`
+_source = None
+_scene = None
+
+
+def _init_worker(case_dir):
+    global _source, _scene
+    ensure_display()
+    _source = FrameSource(case_dir)
+    _scene = FieldScene()
+
+
+def render_frame(time, index, fields, frame_dir=None):
+    """
+    Renders the frames of every field for one time step in a worker's warm scene.
+
+    Args:
+        time (str): Time directory name.
+        index (int): Frame number, used in the debug file names ('<field>_frame_<index>.png').
+        fields (list): Fields to render.
+        frame_dir (str): If given, the frames are also written there as PNG files (debug output).
+
+    Returns:
+        dict: RGB image (height x width x 3 uint8 array) per field rendered; fields missing
+              from this time step are skipped.
+    """
+    if _source is None:
+        raise RuntimeError("render_frame must run in a worker started by render_frames")
+    return _scene.render_time(_source, time, fields, frame_dir, index)
+
+
+def render_frames(case_dir, fields, times=None, workers=RENDER_WORKERS, frame_dir=None):
+    """
+    Renders the frames of a run across a pool of off-screen renderer processes.
+
+    Each worker reads the mesh and sets up its plotter once and then renders whole time
+    steps, so throughput scales with the number of cores. Frames are yielded in time order as soon as they are
+    ready, and only a few time steps are in flight at once, so memory use does not grow
+    with the length of the run.
+
+    Args:
+        case_dir (str): OpenFOAM case directory.
+        fields (list): Fields to render.
+        times (list): Time directories to render (all of them by default).
+        workers (int): Number of renderer processes.
+        frame_dir (str): Optional directory to also dump the frames to as PNG files.
+
+    Yields:
+        tuple: (index, time, {field: image}) for every time step.
+    """
+    if times is None:
+        store = open_store(case_dir)
+        times = store.times if store is not None else list_times(case_dir)
+    if frame_dir:
+        os.makedirs(frame_dir, exist_ok=True)
+    workers = max(1, min(workers, len(times)))
+    max_in_flight = 2 * workers
+    # spawn: VTK/OpenGL state must not be inherited through fork
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(case_dir,)) as executor:
+        pending = deque()
+        for i, time in enumerate(times):
+            pending.append((i, time, executor.submit(render_frame, time, i, list(fields), frame_dir)))
+            if len(pending) >= max_in_flight:
+                index, frame_time, future = pending.popleft()
+                yield index, frame_time, future.result()
+        while pending:
+            index, frame_time, future = pending.popleft()
+            yield index, frame_time, future.result()
+
+
+def video_path(output_dir, field):
+    """Returns the path of the animation video of a field."""
+    return os.path.join(output_dir, f'{field}_contour.mp4')
+
+
+def preview_path(output_dir, field):
+    """Returns the path of the latest frame of a field written while a run is in progress."""
+    return os.path.join(output_dir, f'{field}_latest.png')
+
+
+def open_video_writer(output_dir, field):
+    """Opens an ffmpeg writer for the animation of a field; frames are added with append_data."""
+    import imageio
+
+    return imageio.get_writer(video_path(output_dir, field), format='FFMPEG', fps=VIDEO_FPS, macro_block_size=16)
+
+
+class IncrementalAnimation:
+    """
+    Renders the time directories of a running case as they are written and appends them
+    to the growing animations, so the videos are nearly done when the solver finishes.
+
+    A time directory is only rendered once a later one exists (the solver has finished
+    writing it) or the run is over. Frames are rendered by the process' render server,
+    so a rendering failure cannot take the solver down. Runs decomposed for MPI only
+    produce time directories when they are reconstructed at the end.
+    """
+
+    def __init__(self, case_dir, output_dir, fields=ANIMATION_FIELDS):
+        """
+        Args:
+            case_dir (str): OpenFOAM case directory being solved.
+            output_dir (str): Directory the videos and latest frame previews are written to.
+            fields (list): Fields to animate.
+        """
+        self.case_dir = case_dir
+        self.output_dir = output_dir
+        self.fields = list(fields)
+        self.rendered = []
+        self._writers = {}
+        os.makedirs(output_dir, exist_ok=True)
+        for field in self.fields:
+            for path in (video_path(output_dir, field), preview_path(output_dir, field)):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def poll(self, final=False):
+        """
+        Renders the time directories written since the last call.
+
+        Args:
+            final (bool): The run is over, so the latest time directory is complete too.
+
+        Returns:
+            int: Number of time steps rendered by this call.
+        """
+        import imageio
+
+        times = list_times(self.case_dir)
+        ready = times if final else times[:-1]
+        last = float(self.rendered[-1]) if self.rendered else None
+        count = 0
+        for time in ready:
+            if last is not None and float(time) <= last:
+                continue
+            images = get_render_server().request("frame", case_dir=self.case_dir, time=time, fields=self.fields)
+            for field, image in images.items():
+                if field not in self._writers:
+                    self._writers[field] = open_video_writer(self.output_dir, field)
+                self._writers[field].append_data(image)
+                # Replaced atomically since the UI may be reading it
+                tmp_path = preview_path(self.output_dir, field) + ".tmp"
+                imageio.imwrite(tmp_path, image, format='PNG')
+                os.replace(tmp_path, preview_path(self.output_dir, field))
+            self.rendered.append(time)
+            last = float(time)
+            count += 1
+        return count
+
+    def close(self):
+        """Finalises the videos."""
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
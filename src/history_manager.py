@@ -1,13 +1,99 @@
+import os
+
+import numpy as np
 import streamlit as st
 
+from intersections import IntersectionChecker
+from workspace import create_workspace, remove_workspace, touch_workspace
+
+MAX_HISTORY_DEPTH = 200 # Undo steps kept per session; older states are dropped
+
+
+class PointHistory:
+    """
+    Undo/redo history of the clicked points, stored compactly.
+
+    All states share one append-only (n, 2) float buffer; a state is just a (start, length)
+    slice of it. A click extends the current state by one point, so it appends a single row
+    and the new state reuses the rows of the previous one. Any other edit appends a full
+    copy. Memory is therefore O(points) for a normal clicking session instead of one list
+    copy per click.
+    """
+
+    def __init__(self, max_depth=MAX_HISTORY_DEPTH):
+        self.max_depth = max_depth
+        self._buffer = np.empty((64, 2))
+        self._end = 0 # Rows of the buffer in use
+        self._states = [(0, 0)] # Start with an empty state in history
+        self.index = 0
+
+    def __len__(self):
+        return len(self._states)
+
+    def state(self, index=None):
+        """Returns the points of a state (default: the current one) as a new list of dicts."""
+        start, length = self._states[self.index if index is None else index]
+        return [{'x': x, 'y': y} for x, y in self._buffer[start:start + length].tolist()]
+
+    def push(self, points):
+        """
+        Records `points` as the state after the current one, discarding any redo states.
+
+        Args:
+            points (list): List of dictionaries with 'x' and 'y' custom coordinates.
+
+        Returns:
+            bool: False if `points` equals the current state and nothing was recorded.
+        """
+        del self._states[self.index + 1:]
+        self._end = max(start + length for start, length in self._states)
+
+        start, length = self._states[self.index]
+        current = self._buffer[start:start + length]
+        coords = np.array([(p['x'], p['y']) for p in points], dtype=float).reshape(-1, 2)
+        if len(coords) == length and np.array_equal(coords, current):
+            return False
+
+        if start + length == self._end and len(coords) > length and np.array_equal(coords[:length], current):
+            self._append(coords[length:]) # Points were added: share the rows of the current state
+            self._states.append((start, len(coords)))
+        else:
+            self._states.append((self._append(coords), len(coords)))
+
+        if len(self._states) > self.max_depth:
+            del self._states[:len(self._states) - self.max_depth]
+            self._compact()
+        self.index = len(self._states) - 1
+        return True
+
+    def _append(self, rows):
+        """Appends rows to the buffer, growing it geometrically, and returns their start."""
+        start = self._end
+        needed = start + len(rows)
+        if needed > len(self._buffer):
+            grown = np.empty((max(needed, 2 * len(self._buffer)), 2))
+            grown[:start] = self._buffer[:start]
+            self._buffer = grown
+        self._buffer[start:needed] = rows
+        self._end = needed
+        return start
+
+    def _compact(self):
+        """Drops buffer rows that no remaining state refers to any more."""
+        offset = min((start for start, length in self._states if length), default=self._end)
+        if offset < self._end // 2:
+            return
+        self._buffer = self._buffer[offset:self._end].copy()
+        self._end -= offset
+        self._states = [(start - offset, length) if length else (0, 0) for start, length in self._states]
+
+
 def initialize_session_state():
     """Initializes all necessary session state variables."""
     if 'points' not in st.session_state:
         st.session_state.points = []
     if 'history' not in st.session_state:
-        st.session_state.history = [[]] # Start with an empty state in history
-    if 'history_index' not in st.session_state:
-        st.session_state.history_index = 0
+        st.session_state.history = PointHistory()
     if 'last_click_processed' not in st.session_state:
         st.session_state.last_click_processed = None # To prevent re-adding same point on rerun
     if 'canvas_key_counter' not in st.session_state:
@@ -23,25 +109,45 @@ def initialize_session_state():
     if 'stl_thickness' not in st.session_state: # This will be unused in the UI but remains in session state
         st.session_state.stl_thickness = 0.1
     if 'interpolated_coords' not in st.session_state:
-        st.session_state.interpolated_coords = None
+        st.session_state.interpolated_coords = None # (n, 2) coordinates saved for the STL
+    if 'stl_data' not in st.session_state:
+        st.session_state.stl_data = None # Binary STL shown in the viewer and offered for download
+    if 'overlap_checker' not in st.session_state:
+        st.session_state.overlap_checker = IntersectionChecker() # Reuses overlap results between reruns
 
     if 'meshing' not in st.session_state:
         st.session_state.meshing = False
     if 'running' not in st.session_state:
         st.session_state.running = False
+    if 'mesh_job' not in st.session_state:
+        st.session_state.mesh_job = None # Id of the background meshing job, if any
+    if 'run_job' not in st.session_state:
+        st.session_state.run_job = None # Id of the background simulation job, if any
+    if 'polar_job' not in st.session_state:
+        st.session_state.polar_job = None # Id of the background polar sweep job, if any
+    if 'polar' not in st.session_state:
+        st.session_state.polar = None # Rows of the last finished polar sweep
+    if 'coarse_job' not in st.session_state:
+        st.session_state.coarse_job = None # Id of the coarse pass of a progressive run, if any
+    if 'fine_job' not in st.session_state:
+        st.session_state.fine_job = None # Id of the refinement pass of a progressive run, if any
+    if 'coarse_result' not in st.session_state:
+        st.session_state.coarse_result = None # Coefficients and fields of the last coarse pass
+    if 'fine_result' not in st.session_state:
+        st.session_state.fine_result = None # Coefficients of the refinement pass that followed it
+
+    # Per-session case directory, so concurrent users never share Mesh/Run trees
+    if 'workspace' not in st.session_state or not os.path.isdir(st.session_state.workspace):
+        st.session_state.workspace = create_workspace()
+    else:
+        touch_workspace(st.session_state.workspace)
 
 def add_to_history():
     """Adds the current state of points to the history."""
     if st.session_state.suppress_point_add:
         return
 
-    if st.session_state.history_index < len(st.session_state.history) - 1:
-        st.session_state.history = st.session_state.history[:st.session_state.history_index + 1]
-
-    current_points_copy = list(st.session_state.points)
-    if not st.session_state.history or current_points_copy != st.session_state.history[-1]:
-        st.session_state.history.append(current_points_copy)
-        st.session_state.history_index = len(st.session_state.history) - 1
+    st.session_state.history.push(st.session_state.points)
 
 def undo_action():
     """Performs an undo operation, reverting to a previous state."""
@@ -52,9 +158,13 @@ def undo_action():
     st.session_state.stl_generated = False
     st.session_state.meshing = False
     st.session_state.running = False
-    if st.session_state.history_index > 0:
-        st.session_state.history_index -= 1
-        st.session_state.points = list(st.session_state.history[st.session_state.history_index])
+    st.session_state.polar = None
+    st.session_state.coarse_result = None
+    st.session_state.fine_result = None
+    history = st.session_state.history
+    if history.index > 0:
+        history.index -= 1
+        st.session_state.points = history.state()
     else:
         st.warning("No more steps to undo.")
 
@@ -67,9 +177,13 @@ def redo_action():
     st.session_state.stl_generated = False
     st.session_state.meshing = False
     st.session_state.running = False
-    if st.session_state.history_index < len(st.session_state.history) - 1:
-        st.session_state.history_index += 1
-        st.session_state.points = list(st.session_state.history[st.session_state.history_index])
+    st.session_state.polar = None
+    st.session_state.coarse_result = None
+    st.session_state.fine_result = None
+    history = st.session_state.history
+    if history.index < len(history) - 1:
+        history.index += 1
+        st.session_state.points = history.state()
     else:
         st.warning("No more steps to redo.")
 
@@ -80,10 +194,17 @@ def clear_all_points():
     st.session_state.suppress_point_add = False
     st.session_state.last_click_processed = None
     st.session_state.points = []
-    st.session_state.history = [[]]
-    st.session_state.history_index = 0
+    st.session_state.history = PointHistory()
     st.session_state.canvas_key_counter += 1
     st.session_state.stl_generated = False
     st.session_state.meshing = False
     st.session_state.running = False
+    st.session_state.polar = None
+    st.session_state.coarse_result = None
+    st.session_state.fine_result = None
+    # The design is finished with; start over in a fresh workspace unless a job still uses it
+    jobs = ('mesh_job', 'run_job', 'polar_job', 'coarse_job', 'fine_job')
+    if all(st.session_state[job] is None for job in jobs):
+        remove_workspace(st.session_state.workspace)
+        st.session_state.workspace = create_workspace()
 
@@ -0,0 +1,162 @@
+import numpy as np
+
+# A segment never spans more than this many grid cells along either axis.
+MAX_CELLS_PER_AXIS = 4
+
+
+def _segments(x, y):
+    """
+    Returns the segments [x0, y0, x1, y1] of the closed polyline through (x, y).
+
+    Zero-length segments (repeated consecutive points) are dropped, as shapely does: they
+    would touch both of their neighbours.
+
+    Returns:
+        tuple: (m, 4) array of the remaining segments and (m,) array of their indices.
+    """
+    points = np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)])
+    if len(points) and not np.array_equal(points[0], points[-1]):
+        points = np.vstack([points, points[:1]]) # Close the ring like shapely's Polygon does
+    segments = np.hstack([points[:-1], points[1:]])
+    index = np.flatnonzero(np.any(segments[:, :2] != segments[:, 2:], axis=1))
+    return segments[index], index
+
+
+def _candidate_pairs(segments):
+    """
+    Pairs of non-adjacent segments whose bounding boxes share a cell of a uniform grid.
+
+    Returns:
+        np.ndarray: (k, 2) array of segment indices with i < j.
+    """
+    m = len(segments)
+    lo = np.minimum(segments[:, :2], segments[:, 2:])
+    hi = np.maximum(segments[:, :2], segments[:, 2:])
+    lengths = np.hypot(*(segments[:, 2:] - segments[:, :2]).T)
+    cell = max(2 * lengths.mean(), lengths.max() / MAX_CELLS_PER_AXIS)
+    if cell == 0:
+        return np.empty((0, 2), dtype=int)
+
+    origin = lo.min(axis=0)
+    first = np.floor((lo - origin) / cell).astype(np.int64)
+    last = np.floor((hi - origin) / cell).astype(np.int64)
+    span = last - first + 1
+    n_rows = int(last[:, 1].max()) + 1
+
+    # One (cell, segment) entry per grid cell a segment's bounding box covers
+    counts = span[:, 0] * span[:, 1]
+    segment = np.repeat(np.arange(m), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    ix = first[segment, 0] + local % span[segment, 0]
+    iy = first[segment, 1] + local // span[segment, 0]
+    key = ix * n_rows + iy
+
+    # Sorted by cell, then segment: pairs sharing a cell are runs of equal keys
+    order = np.argsort(key * m + segment)
+    key, segment = key[order], segment[order]
+    pair_codes = []
+    for offset in range(1, len(key)):
+        same_cell = key[:-offset] == key[offset:]
+        if not same_cell.any():
+            break
+        i, j = segment[:-offset][same_cell], segment[offset:][same_cell]
+        # Consecutive segments (including the last and the first of the ring) share an end point
+        apart = (j - i > 1) & (j - i < m - 1)
+        pair_codes.append(i[apart] * m + j[apart])
+    if not pair_codes:
+        return np.empty((0, 2), dtype=int)
+    i, j = np.divmod(np.unique(np.concatenate(pair_codes)), m)
+    return np.column_stack([i, j])
+
+
+def _orientation(ax, ay, bx, by, cx, cy):
+    return np.sign((bx - ax) * (cy - ay) - (by - ay) * (cx - ax))
+
+
+def _within(ax, ay, bx, by, cx, cy):
+    """Whether c lies inside the bounding box of segment ab (c is known to be collinear)."""
+    return ((np.minimum(ax, bx) <= cx) & (cx <= np.maximum(ax, bx)) &
+            (np.minimum(ay, by) <= cy) & (cy <= np.maximum(ay, by)))
+
+
+def _intersecting(segments, pairs):
+    """Exact crossing/touching test for every pair of segments; returns a boolean mask."""
+    ax, ay, bx, by = segments[pairs[:, 0]].T
+    cx, cy, dx, dy = segments[pairs[:, 1]].T
+    d1 = _orientation(cx, cy, dx, dy, ax, ay)
+    d2 = _orientation(cx, cy, dx, dy, bx, by)
+    d3 = _orientation(ax, ay, bx, by, cx, cy)
+    d4 = _orientation(ax, ay, bx, by, dx, dy)
+    crossing = (d1 * d2 < 0) & (d3 * d4 < 0)
+    touching = (((d1 == 0) & _within(cx, cy, dx, dy, ax, ay)) |
+                ((d2 == 0) & _within(cx, cy, dx, dy, bx, by)) |
+                ((d3 == 0) & _within(ax, ay, bx, by, cx, cy)) |
+                ((d4 == 0) & _within(ax, ay, bx, by, dx, dy)))
+    return crossing | touching
+
+
+def find_self_intersections(x, y):
+    """
+    Finds the segments of a closed polyline that cross or touch each other.
+
+    Segment i joins point i and point i + 1; the ring is closed with a segment back to the
+    first point if the last point does not already repeat it. Segments sharing an end point
+    with their neighbours do not count, and zero-length segments are ignored.
+
+    Args:
+        x (np.ndarray): X coordinates of the curve.
+        y (np.ndarray): Y coordinates of the curve.
+
+    Returns:
+        np.ndarray: (k, 2) array of intersecting segment index pairs (i < j), sorted.
+    """
+    segments, index = _segments(x, y)
+    if len(segments) < 3:
+        return np.empty((0, 2), dtype=int)
+    pairs = _candidate_pairs(segments)
+    return index[pairs[_intersecting(segments, pairs)]]
+
+
+class IntersectionChecker:
+    """
+    `find_self_intersections` that reuses the previous result between calls.
+
+    Reruns that do not touch the curve return the cached pairs. When a curve with the same
+    number of points changes only in places (e.g. a click only bends the spline locally),
+    just the candidate pairs involving a changed segment are tested again.
+    """
+
+    def __init__(self):
+        self._segments = None
+        self._index = np.empty(0, dtype=int)
+        self._pairs = np.empty((0, 2), dtype=int) # Indices into `_segments`, not into the curve
+
+    def check(self, x, y):
+        """
+        Args:
+            x (np.ndarray): X coordinates of the curve.
+            y (np.ndarray): Y coordinates of the curve.
+
+        Returns:
+            np.ndarray: (k, 2) array of intersecting segment index pairs (i < j), sorted.
+        """
+        segments, self._index = _segments(x, y)
+        previous, self._segments = self._segments, segments
+        if len(segments) < 3:
+            self._pairs = np.empty((0, 2), dtype=int)
+            return self._pairs
+        if previous is None or previous.shape != segments.shape:
+            pairs = _candidate_pairs(segments)
+            self._pairs = pairs[_intersecting(segments, pairs)]
+            return self._index[self._pairs]
+
+        changed = np.any(previous != segments, axis=1)
+        if not changed.any():
+            return self._index[self._pairs]
+        kept = self._pairs[~changed[self._pairs].any(axis=1)]
+        candidates = _candidate_pairs(segments)
+        candidates = candidates[changed[candidates].any(axis=1)]
+        found = candidates[_intersecting(segments, candidates)]
+        pairs = np.vstack([kept, found])
+        self._pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+        return self._index[self._pairs]
@@ -0,0 +1,223 @@
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Number of pipeline stages (meshing, solving, ...) allowed to run at once on this host.
+MAX_WORKERS = int(os.environ.get("AIRFOIL_JOB_WORKERS", "2"))
+
+_executor = None
+_events = None
+_jobs = {}
+_lock = threading.Lock()
+
+# Number of progress samples (residuals, force coefficients, ...) kept per job.
+PROGRESS_HISTORY = 2000
+
+# Set inside worker processes only.
+_worker_events = None
+_worker_job_id = None
+
+
+class Job:
+    """
+    Handle for a pipeline stage submitted to the background worker pool.
+
+    The Streamlit script only keeps the job id in session state and polls the
+    handle on each rerun; the stage itself runs in a separate worker process.
+    """
+
+    def __init__(self, job_id, name, future):
+        self.id = job_id
+        self.name = name
+        self.future = future
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.progress = deque(maxlen=PROGRESS_HISTORY)
+        self.progress_count = 0
+
+    @property
+    def state(self):
+        """Returns one of 'queued', 'running', 'done' or 'failed'."""
+        _drain_events()
+        if self.future.done():
+            if self.finished_at is None:
+                self.finished_at = time.time()
+            if self.future.cancelled() or self.future.exception() is not None:
+                return FAILED
+            return DONE
+        if self.started_at is not None:
+            return RUNNING
+        return QUEUED
+
+    @property
+    def finished(self):
+        return self.state in (DONE, FAILED)
+
+    @property
+    def elapsed(self):
+        """Seconds spent running (or waiting in the queue if not started yet)."""
+        _drain_events()
+        start = self.started_at if self.started_at is not None else self.submitted_at
+        end = self.finished_at if self.finished_at is not None else time.time()
+        return max(0.0, end - start)
+
+    @property
+    def result(self):
+        """Return value of the stage, or None while it is not done."""
+        if self.state != DONE:
+            return None
+        return self.future.result()
+
+    @property
+    def error(self):
+        """Error message of a failed stage, or None."""
+        if self.state != FAILED:
+            return None
+        if self.future.cancelled():
+            return "Job was cancelled."
+        return str(self.future.exception())
+
+    def progress_since(self, count):
+        """
+        Returns the progress samples published after the first `count` ones.
+
+        Args:
+            count (int): Value of `progress_count` at the previous poll (0 for all samples).
+
+        Returns:
+            tuple: (list of new samples still held in the bounded history, new `progress_count`).
+        """
+        _drain_events()
+        new_samples = min(self.progress_count - count, len(self.progress))
+        if new_samples <= 0:
+            return [], self.progress_count
+        return list(self.progress)[-new_samples:], self.progress_count
+
+    def cancel(self):
+        """Cancels the job if it has not started running yet."""
+        return self.future.cancel()
+
+
+def _init_worker(events):
+    global _worker_events
+    _worker_events = events
+
+
+def _run_job(job_id, func, args, kwargs):
+    """Runs a stage inside a worker process, reporting start/finish times to the parent."""
+    global _worker_job_id
+    _worker_job_id = job_id
+    _worker_events.put((job_id, "started", time.time()))
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        traceback.print_exc()
+        raise
+    finally:
+        _worker_events.put((job_id, "finished", time.time()))
+        _worker_job_id = None
+
+
+def report_progress(sample):
+    """
+    Publishes a progress sample from inside a running job to the UI process.
+
+    Does nothing when called outside of a job, so stages can also be run directly.
+
+    Args:
+        sample (dict): Small picklable dictionary, e.g. {'time': 12.0, 'Ux': 1e-3, 'Cl': 0.3}.
+    """
+    if _worker_events is None or _worker_job_id is None:
+        return
+    _worker_events.put((_worker_job_id, "progress", sample))
+
+
+def _get_executor():
+    global _executor, _events
+    if _executor is None:
+        # 'spawn' avoids forking the multi-threaded Streamlit server process.
+        context = multiprocessing.get_context("spawn")
+        _events = context.Queue()
+        _executor = ProcessPoolExecutor(
+            max_workers=MAX_WORKERS,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(_events,),
+        )
+    return _executor
+
+
+def _drain_events():
+    """Applies the timing and progress events posted by the workers to the matching job handles."""
+    if _events is None:
+        return
+    with _lock:
+        while True:
+            try:
+                job_id, kind, payload = _events.get_nowait()
+            except Exception:
+                break
+            job = _jobs.get(job_id)
+            if job is None:
+                continue
+            if kind == "started":
+                job.started_at = payload
+            elif kind == "finished":
+                job.finished_at = payload
+            elif kind == "progress":
+                job.progress.append(payload)
+                job.progress_count += 1
+
+
+def submit_job(name, func, *args, **kwargs):
+    """
+    Submits a pipeline stage to the background worker pool.
+
+    Args:
+        name (str): Human readable name of the stage (e.g. 'meshing').
+        func (function): Module-level (picklable) function to run in the worker.
+        *args, **kwargs: Arguments passed to `func`.
+
+    Returns:
+        str: The job id, to be stored in session state and passed to `get_job`.
+    """
+    global _executor
+    job_id = uuid.uuid4().hex
+    with _lock:
+        try:
+            future = _get_executor().submit(_run_job, job_id, func, args, kwargs)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed by the OOM killer); start a fresh pool.
+            _executor = None
+            future = _get_executor().submit(_run_job, job_id, func, args, kwargs)
+        _jobs[job_id] = Job(job_id, name, future)
+    print(f"Submitted {name} job {job_id}.")
+    return job_id
+
+
+def get_job(job_id):
+    """Returns the Job handle for `job_id`, or None if it is unknown (e.g. after a server restart)."""
+    if job_id is None:
+        return None
+    with _lock:
+        return _jobs.get(job_id)
+
+
+def forget_job(job_id):
+    """Drops a finished job handle so its result can be garbage collected."""
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is not None and job.future.done():
+            del _jobs[job_id]
@@ -0,0 +1,152 @@
+import re
+
+_NUMBER = r"([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)"
+# Solver values may also blow up to "nan", "-nan" or "inf", which must reach the convergence monitor
+_VALUE = r"([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|[-+]?(?:nan|inf))"
+
+# "Time = 12" (older releases) or "Time = 12s" (OpenFOAM 11+)
+TIME_RE = re.compile(r"^Time = " + _NUMBER + r"s?\s*$")
+# "smoothSolver:  Solving for Ux, Initial residual = 0.0123, Final residual = 1e-05, No Iterations 3"
+RESIDUAL_RE = re.compile(r"Solving for (\w+), Initial residual = " + _VALUE + r", Final residual = " + _VALUE)
+# forceCoeffs with 'log true' prints e.g. "    Cd    = 0.0123" (or "Cd: 0.0123" in some releases)
+COEFF_RE = re.compile(r"^\s*(Cm|Cd|Cl|Cs)\s*[=:]\s*" + _VALUE + r"\s*$")
+
+
+class FoamLogParser:
+    """
+    Incrementally parses OpenFOAM solver output, one line at a time.
+
+    Residuals and force coefficients are accumulated for the current time step
+    and emitted as a single sample dictionary when the next time step starts, e.g.
+    {'time': 12.0, 'Ux': 1.2e-3, 'p': 4.5e-2, 'Cd': 0.012, 'Cl': 0.31}.
+    Only the initial residual of the first solve of each field per time step is kept,
+    which is what residual plots conventionally show.
+    """
+
+    def __init__(self):
+        self._current = None
+
+    def feed(self, line):
+        """
+        Parses one line of log output.
+
+        Args:
+            line (str): A line of solver output.
+
+        Returns:
+            dict or None: The completed sample of the previous time step, if `line` started a new one.
+        """
+        match = TIME_RE.match(line)
+        if match:
+            finished = self.flush()
+            self._current = {'time': float(match.group(1))}
+            return finished
+
+        if self._current is None:
+            return None
+
+        match = RESIDUAL_RE.search(line)
+        if match:
+            self._current.setdefault(match.group(1), float(match.group(2)))
+            return None
+
+        match = COEFF_RE.match(line)
+        if match:
+            self._current[match.group(1)] = float(match.group(2))
+        return None
+
+    def flush(self):
+        """Returns the sample of the time step in progress (if it holds any data) and resets it."""
+        sample, self._current = self._current, None
+        if sample is None or len(sample) == 1:
+            return None
+        return sample
+
+
+# checkMesh: "    cells:            17318"
+CELLS_RE = re.compile(r"^\s*cells:\s+(\d+)")
+# checkMesh: "    Mesh non-orthogonality Max: 64.9 average: 8.3"
+NON_ORTHO_RE = re.compile(r"Mesh non-orthogonality Max: " + _NUMBER + r" average: " + _NUMBER)
+# checkMesh: "    Max skewness = 2.1 OK." or "   ***Max skewness = 5.3, 12 highly skew faces detected ..."
+SKEWNESS_RE = re.compile(r"Max skewness = " + _NUMBER)
+# checkMesh: "    Max aspect ratio = 35.2 OK." or "   ***High aspect ratio cells found, Max aspect ratio: 1500, ..."
+ASPECT_RATIO_RE = re.compile(r"Max aspect ratio(?: =|:) " + _NUMBER)
+# checkMesh: " ***Zero or negative cell volume detected.  Minimum negative volume: -1e-09, Number of negative volume cells: 3"
+NEGATIVE_VOLUME_RE = re.compile(r"Number of negative volume cells: (\d+)")
+# checkMesh: " ***Error in face pyramids: 12 faces are incorrectly oriented."
+PYRAMIDS_RE = re.compile(r"Error in face pyramids: (\d+) faces")
+# checkMesh: "Failed 2 mesh checks." or "Mesh OK."
+FAILED_CHECKS_RE = re.compile(r"^\s*Failed (\d+) mesh checks")
+MESH_OK_RE = re.compile(r"^\s*Mesh OK\.")
+# snappyHexMesh layer summary: header "patch faces layers overall thickness", then rows
+# "airfoil     1612     2.98     0.00364   97.6" (thickness in m and in % of the requested one)
+LAYER_HEADER_RE = re.compile(r"^\s*patch\s+faces\s+layers\s+overall thickness")
+LAYER_ROW_RE = re.compile(r"^\s*(\S+)\s+(\d+)\s+" + _NUMBER + r"\s+" + _NUMBER + r"\s+" + _NUMBER + r"\s*$")
+
+
+class MeshQualityParser:
+    """
+    Incrementally collects mesh quality metrics from snappyHexMesh and checkMesh output.
+
+    Has the `feed`/`flush` interface of `FoamLogParser` (and never emits samples), so it
+    can take its place when streaming the meshing script. Metrics that did not appear in
+    the output stay None.
+    """
+
+    def __init__(self):
+        self.metrics = {
+            'cells': None,
+            'max_non_orthogonality': None,
+            'average_non_orthogonality': None,
+            'max_skewness': None,
+            'max_aspect_ratio': None,
+            'negative_volume_cells': 0,
+            'incorrectly_oriented_faces': 0,
+            'failed_checks': None,
+            'layers': None, # Mean number of layers added to the wall patches
+            'layer_thickness': None, # Lowest overall layer thickness of a wall patch, in %
+        }
+        self._layer_rows = None # Rows of the layer summary being read, None outside of it
+
+    def feed(self, line):
+        """Parses one line of meshing output; always returns None."""
+        if LAYER_HEADER_RE.match(line):
+            self._layer_rows = [] # Only the last summary counts
+            return None
+        if self._layer_rows is not None:
+            match = LAYER_ROW_RE.match(line)
+            if match:
+                if int(match.group(2)):
+                    self._layer_rows.append((int(match.group(2)), float(match.group(3)), float(match.group(5))))
+                    self._summarise_layers()
+                return None
+            if not line.strip() and self._layer_rows:
+                self._layer_rows = None # End of the table
+
+        for pattern, keys, cast in (
+            (CELLS_RE, ('cells',), int),
+            (NON_ORTHO_RE, ('max_non_orthogonality', 'average_non_orthogonality'), float),
+            (SKEWNESS_RE, ('max_skewness',), float),
+            (ASPECT_RATIO_RE, ('max_aspect_ratio',), float),
+            (NEGATIVE_VOLUME_RE, ('negative_volume_cells',), int),
+            (PYRAMIDS_RE, ('incorrectly_oriented_faces',), int),
+            (FAILED_CHECKS_RE, ('failed_checks',), int),
+        ):
+            match = pattern.search(line)
+            if match:
+                for i, key in enumerate(keys):
+                    self.metrics[key] = cast(match.group(i + 1))
+                return None
+        if MESH_OK_RE.match(line):
+            self.metrics['failed_checks'] = 0
+        return None
+
+    def _summarise_layers(self):
+        faces = sum(row[0] for row in self._layer_rows)
+        if faces:
+            self.metrics['layers'] = sum(n * layers for n, layers, _ in self._layer_rows) / faces
+        self.metrics['layer_thickness'] = min(row[2] for row in self._layer_rows)
+
+    def flush(self):
+        """Nothing is pending between lines; returns None."""
+        return None
@@ -0,0 +1,110 @@
+import json
+import os
+import re
+
+from foam_dict import rewrite_dict
+
+# File, inside the Mesh case, holding the metrics of its current mesh.
+QUALITY_FILE = "meshQuality.json"
+
+# Upper limits of the checkMesh metrics (see `log_parser.MeshQualityParser`); a mesh
+# exceeding any of them is not solved. checkMesh itself flags non-orthogonality above 70
+# and skewness above 4, but the solver copes with a few such faces next to the wall.
+MAX_METRICS = {
+    'max_non_orthogonality': 75.0,
+    'max_skewness': 8.0,
+    'negative_volume_cells': 0,
+    'incorrectly_oriented_faces': 0,
+}
+# Lowest acceptable overall thickness of the boundary layer, in % of the requested one.
+MIN_LAYER_THICKNESS = 50.0
+
+# Meshing attempts before a mesh that fails the limits is given up on.
+MAX_ATTEMPTS = 2
+# snappyHexMeshDict entries changed for the next attempt, by the kind of failure.
+#   'quality' - snappyHexMesh undoes snapping and layers wherever they would exceed these
+#   'layers'  - layers are extruded at sharper corners (the trailing edge) and iterated longer
+RETRY_SETTINGS = {
+    'quality': {'maxNonOrtho': 65, 'maxInternalSkewness': 2, 'maxBoundarySkewness': 10},
+    'layers': {'featureAngle': 130, 'nLayerIter': 100},
+}
+
+
+class MeshQualityError(RuntimeError):
+    """Raised when a mesh fails the quality limits and is not worth solving."""
+
+
+def check_quality(metrics, max_metrics=MAX_METRICS, min_layer_thickness=MIN_LAYER_THICKNESS):
+    """
+    Compares mesh metrics against the quality limits.
+
+    Metrics that are None (not found in the output) are not checked. The number of failed
+    checkMesh checks is not a limit of its own: in a 2D mesh with wall layers the aspect
+    ratio check alone fails routinely.
+
+    Args:
+        metrics (dict): Metrics as collected by `log_parser.MeshQualityParser`, or None.
+
+    Returns:
+        list: (metric, message) pairs of the limits breached, empty if the mesh passes.
+    """
+    violations = []
+    if not metrics:
+        return violations
+    for name, limit in max_metrics.items():
+        value = metrics.get(name)
+        if value is not None and value > limit:
+            violations.append((name, f"{name.replace('_', ' ')} {value:g} > {limit:g}"))
+    thickness = metrics.get('layer_thickness')
+    if thickness is not None and thickness < min_layer_thickness:
+        violations.append(('layer_thickness', f"layer thickness {thickness:g}% < {min_layer_thickness:g}% of the requested one"))
+    return violations
+
+
+def adjust_settings(mesh_dict, violations, retry_settings=RETRY_SETTINGS):
+    """
+    Rewrites snappyHexMeshDict for another meshing attempt after `violations`.
+
+    Args:
+        mesh_dict (str): Path of system/snappyHexMeshDict.
+        violations (list): Pairs returned by `check_quality`.
+
+    Returns:
+        list: Names of the entries changed.
+    """
+    kinds = {'layers' if name == 'layer_thickness' else 'quality' for name, _ in violations}
+    changed = []
+    for kind in sorted(kinds):
+        for entry, value in retry_settings[kind].items():
+            if rewrite_dict(mesh_dict, re.compile(rf"(\b{entry}\s+)[^;]+;"), rf"\g<1>{value};", required=False):
+                changed.append(entry)
+    return changed
+
+
+def write_mesh_quality(mesh_dir, metrics):
+    """Records the metrics of the mesh currently in a Mesh case."""
+    with open(os.path.join(mesh_dir, QUALITY_FILE), "w") as f:
+        json.dump(metrics, f, indent=2)
+
+
+def read_mesh_quality(mesh_dir):
+    """Returns the metrics recorded for the mesh of a Mesh case, or None."""
+    try:
+        with open(os.path.join(mesh_dir, QUALITY_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def describe_quality(metrics):
+    """One-line summary of mesh metrics for the UI, e.g. '16227 cells, max non-orthogonality 64.9 deg, ...'."""
+    parts = []
+    for name, template in (('cells', "{:d} cells"),
+                           ('max_non_orthogonality', "max non-orthogonality {:.1f} deg"),
+                           ('max_skewness', "max skewness {:.2f}"),
+                           ('max_aspect_ratio', "max aspect ratio {:.0f}"),
+                           ('layers', "{:.2f} wall layers"),
+                           ('layer_thickness', "{:.0f}% of the layer thickness")):
+        if metrics.get(name) is not None:
+            parts.append(template.format(metrics[name]))
+    return ", ".join(parts)
@@ -0,0 +1,327 @@
+import math
+import os
+import re
+
+import numpy as np
+
+from stl_builder import clean_outline
+
+# Coordinates closer than this (relative to the airfoil size) to their predecessor are merged.
+PANEL_TOLERANCE = 1e-9
+# Thwaites' laminar separation criterion and the turbulent shape factor taken as separation.
+LAMINAR_SEPARATION = -0.09
+TURBULENT_SEPARATION = 2.4
+# Shape factor the turbulent boundary layer starts with after transition.
+TRANSITION_SHAPE_FACTOR = 1.4
+# Fraction of each surface, ahead of the trailing edge, over which the edge velocity is held.
+TRAILING_EDGE_FREEZE = 0.02
+# Panels per surface; the solve costs a few milliseconds regardless of the input resolution.
+PANELS_PER_SIDE = 100
+
+_NU_RE = re.compile(r"^\s*nu\s+(?:nu\s+\[[^\]]*\]\s+)?([-+\d.eE]+)\s*;", re.MULTILINE)
+
+
+def case_reynolds(run_dir, chord_length=1.0):
+    """
+    Reynolds number of the OpenFOAM case, from the freestream in 0.org/U and nu.
+
+    Args:
+        run_dir (str): Run case directory (template or workspace).
+        chord_length (float): Chord of the meshed airfoil in metres.
+    """
+    from polar_sweep import inlet_speed
+
+    with open(os.path.join(run_dir, "constant", "transportProperties")) as f:
+        match = _NU_RE.search(f.read())
+    if match is None:
+        raise RuntimeError(f"No nu in {run_dir}/constant/transportProperties")
+    return inlet_speed(os.path.join(run_dir, "0.org", "U")) * chord_length / float(match.group(1))
+
+
+def _cosine_resample(points, n_panels):
+    """Resamples a polyline with `n_panels` panels, clustered towards both ends."""
+    arc = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(points, axis=0).T))])
+    targets = arc[-1] * 0.5 * (1 - np.cos(np.linspace(0, np.pi, n_panels + 1)))
+    return np.column_stack([np.interp(targets, arc, points[:, 0]), np.interp(targets, arc, points[:, 1])])
+
+
+def _panels(x, y, panels_per_side=PANELS_PER_SIDE):
+    """
+    Re-panels the interpolated airfoil clockwise, scaled to a unit chord.
+
+    The spline runs from the first point round the leading edge to the trailing edge again;
+    the segment that closes it is left out, so a blunt trailing edge stays open. The
+    outline is split at the leading edge, the point farthest from the trailing edge. Each
+    surface is cut where it is farthest downstream, which drops the small hooks a smoothing
+    spline leaves at the trailing edge, and is resampled with cosine spacing.
+
+    Returns:
+        tuple: (nodes (2 * panels_per_side + 1, 2) from the lower trailing edge round the
+                leading edge to the upper trailing edge, leading edge (2,), chord length).
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    scale = max(np.ptp(x), np.ptp(y))
+    if scale == 0:
+        raise ValueError("The airfoil has zero size.")
+    closed = len(x) > 2 and x[0] == x[-1] and y[0] == y[-1]
+    spline_end = (x[-2], y[-2]) if closed else (x[-1], y[-1])
+
+    # The ring, restarted at the first point, walked the long way round to the spline's end
+    points = clean_outline(x, y, PANEL_TOLERANCE * scale)
+    points = np.roll(points, -np.argmin(np.hypot(points[:, 0] - x[0], points[:, 1] - y[0])), axis=0)
+    end = np.argmin(np.hypot(points[:, 0] - spline_end[0], points[:, 1] - spline_end[1]))
+    if end == 0:
+        path = np.vstack([points, points[:1]])
+    elif end == 1:
+        path = np.vstack([points[:1], points[:0:-1]])
+    else:
+        path = points
+    area = np.dot(path[:, 0], np.roll(path[:, 1], -1)) - np.dot(path[:, 1], np.roll(path[:, 0], -1))
+    if area > 0:
+        path = path[::-1] # Clockwise: lower surface first
+
+    trailing_edge = 0.5 * (path[0] + path[-1])
+    leading = int(np.argmax(np.hypot(*(path - trailing_edge).T)))
+    lower = path[leading::-1]
+    upper = path[leading:]
+    lower = _cosine_resample(lower[:np.argmax(lower[:, 0]) + 1], panels_per_side)
+    upper = _cosine_resample(upper[:np.argmax(upper[:, 0]) + 1], panels_per_side)
+
+    leading_edge = path[leading]
+    chord = float(np.hypot(*(0.5 * (upper[-1] + lower[-1]) - leading_edge)))
+    if chord == 0:
+        raise ValueError("The airfoil has zero chord.")
+    nodes = np.vstack([lower[::-1], upper[1:]])
+    return (nodes - leading_edge) / chord, leading_edge, chord
+
+
+def _influence(nodes):
+    """
+    Geometric influence terms of every panel on every control point.
+
+    Returns:
+        tuple: (theta, lengths, control points, sin(theta_i - theta_j),
+                cos(theta_i - theta_j), log(r_i,j+1 / r_i,j), beta_ij).
+    """
+    d = np.diff(nodes, axis=0)
+    theta = np.arctan2(d[:, 1], d[:, 0])
+    lengths = np.hypot(d[:, 0], d[:, 1])
+    control = 0.5 * (nodes[:-1] + nodes[1:])
+
+    dx1 = control[:, None, 0] - nodes[None, :-1, 0]
+    dy1 = control[:, None, 1] - nodes[None, :-1, 1]
+    dx2 = control[:, None, 0] - nodes[None, 1:, 0]
+    dy2 = control[:, None, 1] - nodes[None, 1:, 1]
+    log_r = np.log(np.hypot(dx2, dy2) / np.hypot(dx1, dy1))
+    beta = np.arctan2(dx1 * dy2 - dy1 * dx2, dx1 * dx2 + dy1 * dy2)
+    np.fill_diagonal(log_r, 0.0)
+    np.fill_diagonal(beta, np.pi)
+
+    angle = theta[:, None] - theta[None, :]
+    return theta, lengths, control, np.sin(angle), np.cos(angle), log_r, beta
+
+
+def solve_inviscid(nodes, alpha):
+    """
+    Hess-Smith panel method: constant source strength per panel plus one uniform vortex
+    strength, with the Kutta condition on the two trailing edge panels.
+
+    Args:
+        nodes (np.ndarray): (n + 1, 2) clockwise panel nodes (see `_panels`).
+        alpha (float): Angle of attack in radians.
+
+    Returns:
+        tuple: (control points (n, 2), panel angles (n,), panel lengths (n,),
+                tangential velocity (n,) over the freestream speed).
+    """
+    theta, lengths, control, sin, cos, log_r, beta = _influence(nodes)
+    n = len(theta)
+    two_pi = 2 * np.pi
+
+    a = np.empty((n + 1, n + 1))
+    a[:n, :n] = (sin * log_r + cos * beta) / two_pi
+    a[:n, n] = (cos * log_r - sin * beta).sum(axis=1) / two_pi
+    ends = [0, n - 1]
+    a[n, :n] = (sin[ends] * beta[ends] - cos[ends] * log_r[ends]).sum(axis=0) / two_pi
+    a[n, n] = (sin[ends] * log_r[ends] + cos[ends] * beta[ends]).sum() / two_pi
+    b = np.empty(n + 1)
+    b[:n] = np.sin(theta - alpha)
+    b[n] = -np.cos(theta[0] - alpha) - np.cos(theta[-1] - alpha)
+
+    solution = np.linalg.solve(a, b)
+    sources, vortex = solution[:n], solution[n]
+    tangential = (np.cos(theta - alpha)
+                  + ((sin * beta - cos * log_r) @ sources) / two_pi
+                  + vortex * (sin * log_r + cos * beta).sum(axis=1) / two_pi)
+    return control, theta, lengths, tangential
+
+
+def _coefficients(control, theta, lengths, cp, alpha, reference):
+    """Lift and moment coefficients from the panel pressures (unit chord)."""
+    # Outward normal of a clockwise panel: (-sin, cos); the pressure pushes against it
+    fx = np.sum(cp * lengths * np.sin(theta))
+    fy = -np.sum(cp * lengths * np.cos(theta))
+    cl = fy * math.cos(alpha) - fx * math.sin(alpha)
+    moment = np.sum((control[:, 0] - reference[0]) * -cp * lengths * np.cos(theta)
+                    - (control[:, 1] - reference[1]) * cp * lengths * np.sin(theta))
+    return float(cl), float(moment)
+
+
+def _michel(re_x):
+    """Momentum thickness Reynolds number at transition (Michel's criterion)."""
+    return 1.174 * (1 + 22400 / np.maximum(re_x, 1.0)) * np.maximum(re_x, 1.0) ** 0.46
+
+
+def _head_shape(h1):
+    """Shape factor H from Head's entrainment shape factor H1."""
+    h1 = max(h1, 3.35)
+    if h1 <= 5.3:
+        return 0.6778 + 1.1538 * (h1 - 3.3) ** -0.326
+    return 1.1 + 0.86 * (h1 - 3.3) ** -0.777
+
+
+def _head_entrainment(h):
+    """Head's entrainment shape factor H1 from the shape factor H."""
+    if h <= 1.6:
+        return 3.3 + 0.8234 * (h - 1.1) ** -1.287
+    return 3.3 + 1.5501 * (h - 0.6778) ** -3.064
+
+
+def boundary_layer(s, ue, reynolds):
+    """
+    Integral boundary layer along one surface, from the stagnation point to the trailing edge.
+
+    The laminar part uses Thwaites' method (vectorized), transition follows Michel's
+    criterion (or laminar separation), and the turbulent part is marched with Head's method.
+
+    Args:
+        s (np.ndarray): Arc length of the control points from the stagnation point.
+        ue (np.ndarray): Edge velocity over the freestream speed at those points.
+        reynolds (float): Chord Reynolds number.
+
+    Returns:
+        dict: 'theta' (momentum thickness), 'H' (shape factor), 'transition' (index of the
+              first turbulent point, len(s) if none) and 'separated' (turbulent separation).
+    """
+    ue = np.maximum(ue, 1e-6)
+    # Thwaites: theta^2 = 0.45 / Re / ue^6 * integral(ue^5 ds); ue rises linearly from the
+    # stagnation point over the first interval, which integrates to ue^5 s / 6 exactly.
+    integrand = ue ** 5
+    integral = np.concatenate([[integrand[0] * s[0] / 6],
+                               integrand[0] * s[0] / 6
+                               + np.cumsum(0.5 * (integrand[1:] + integrand[:-1]) * np.diff(s))])
+    theta = np.sqrt(0.45 / reynolds * integral / ue ** 6)
+    due = np.gradient(ue, s) if len(s) > 1 else np.zeros_like(s)
+    lam = np.clip(theta ** 2 * reynolds * due, -0.1, 0.1)
+    shape = np.where(lam >= 0, 2.61 - 3.75 * lam + 5.24 * lam ** 2, 2.088 + 0.0731 / (lam + 0.14))
+
+    turbulent = (reynolds * ue * theta > _michel(reynolds * ue * s)) | (lam < LAMINAR_SEPARATION)
+    transition = int(np.argmax(turbulent)) if turbulent.any() else len(s)
+
+    separated = False
+    if transition < len(s):
+        t = theta[transition]
+        h = TRANSITION_SHAPE_FACTOR
+        shape[transition] = h
+        for i in range(transition + 1, len(s)):
+            ds = s[i] - s[i - 1]
+            u, du = ue[i - 1], (ue[i] - ue[i - 1]) / ds
+            re_theta = max(reynolds * u * t, 1.0)
+            cf = 0.246 * 10 ** (-0.678 * h) * re_theta ** -0.268
+            h1 = _head_entrainment(h)
+            entrainment = 0.0306 * max(h1 - 3.0, 1e-6) ** -0.6169
+            t_next = max(t + ds * (cf / 2 - (h + 2) * t / u * du), 1e-12)
+            h1 = (u * t * h1 + ds * u * entrainment) / (ue[i] * t_next)
+            h = _head_shape(h1)
+            if h >= TURBULENT_SEPARATION:
+                separated = True
+                h = TURBULENT_SEPARATION
+            t = t_next
+            theta[i], shape[i] = t, h
+    return {"theta": theta, "H": shape, "transition": transition, "separated": separated}
+
+
+def _viscous(nodes, control, lengths, tangential, reynolds):
+    """
+    Runs the boundary layer on both surfaces of an inviscid solution.
+
+    Returns:
+        tuple: (Cd from Squire-Young, displacement thickness per panel,
+                x of transition on the (upper, lower) surface, whether either surface separated).
+    """
+    n = len(control)
+    # Clockwise from the trailing edge: the flow runs against the panels on the lower surface
+    crossings = np.flatnonzero((tangential[:-1] < 0) & (tangential[1:] >= 0))
+    if not len(crossings):
+        raise ValueError("No stagnation point found on the airfoil.")
+    stagnation = crossings[np.argmin(control[crossings, 0])]
+    stagnation_point = nodes[stagnation + 1]
+
+    displacement = np.zeros(n)
+    drag = 0.0
+    transitions = []
+    separated = False
+    for indices in (np.arange(stagnation + 1, n), np.arange(stagnation, -1, -1)):
+        steps = np.concatenate([[np.hypot(*(control[indices[0]] - stagnation_point))],
+                                lengths[indices[:-1]] / 2 + lengths[indices[1:]] / 2])
+        s, ue = np.cumsum(steps), np.abs(tangential[indices])
+        # The inviscid velocity collapses towards the trailing edge stagnation point; hold it
+        # over the last few panels so the layer (and the displaced surface) stays smooth
+        frozen = np.searchsorted(s, (1 - TRAILING_EDGE_FREEZE) * s[-1])
+        ue[frozen:] = ue[max(frozen - 1, 0)]
+        layer = boundary_layer(s, ue, reynolds)
+        displacement[indices] = layer["theta"] * layer["H"]
+        # Squire-Young: momentum deficit far downstream from the trailing edge state
+        drag += 2 * layer["theta"][-1] * ue[-1] ** ((layer["H"][-1] + 5) / 2)
+        transitions.append(float(control[indices[min(layer["transition"], len(indices) - 1)], 0]))
+        separated |= layer["separated"]
+    return drag, displacement, tuple(transitions), separated
+
+
+def solve_airfoil(x, y, alpha=0.0, reynolds=None):
+    """
+    Panel method preview of an airfoil: pressure distribution, Cl and Cm in milliseconds.
+
+    The airfoil is taken as drawn: the chord runs from the leading edge (the point farthest
+    from the first point) to the trailing edge, and the freestream blows along +x rotated by
+    `alpha`, as in the OpenFOAM case. With a
+    Reynolds number, an integral boundary layer is run on the inviscid solution, the drag is
+    estimated with the Squire-Young formula and the airfoil is solved again with its surface
+    displaced by the displacement thickness, which lowers Cl as the real boundary layer does.
+
+    Args:
+        x (np.ndarray): X coordinates as returned by `interpolate_airfoil_and_close`
+                        (trailing edge, upper surface, leading edge, lower surface, closed).
+        y (np.ndarray): Y coordinates.
+        alpha (float): Angle of attack in degrees.
+        reynolds (float): Chord Reynolds number for the viscous correction; None for inviscid.
+
+    Returns:
+        dict: 'x', 'cp' (Cp at the panel centres, x in the input units), 'Cl', 'Cm' (about the
+              quarter chord, positive about +z like the OpenFOAM forceCoeffs), 'Cd' (None if
+              inviscid), 'transition' (x of transition on the upper and lower surface, None
+              if inviscid) and 'separated'.
+    """
+    a = math.radians(alpha)
+    nodes, leading_edge, chord = _panels(x, y)
+    reference = 0.125 * (nodes[0] + nodes[-1])
+
+    control, theta, lengths, tangential = solve_inviscid(nodes, a)
+    result = {"Cd": None, "transition": None, "separated": False}
+    if reynolds:
+        result["Cd"], displacement, result["transition"], result["separated"] = _viscous(
+            nodes, control, lengths, tangential, reynolds)
+        # Move every node out along the mean normal of its panels by their mean displacement
+        normals = np.column_stack([-np.sin(theta), np.cos(theta)])
+        node_normals = np.vstack([normals[:1], normals[:-1] + normals[1:], normals[-1:]])
+        node_normals /= np.hypot(*node_normals.T)[:, None]
+        node_displacement = np.concatenate([displacement[:1], 0.5 * (displacement[:-1] + displacement[1:]),
+                                            displacement[-1:]])
+        control, theta, lengths, tangential = solve_inviscid(nodes + node_normals * node_displacement[:, None], a)
+        result["transition"] = tuple(leading_edge[0] + t * chord for t in result["transition"])
+
+    cp = 1 - tangential ** 2
+    result["Cl"], result["Cm"] = _coefficients(control, theta, lengths, cp, a, reference)
+    result["x"] = leading_edge[0] + control[:, 0] * chord
+    result["cp"] = cp
+    return result
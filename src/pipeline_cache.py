@@ -0,0 +1,254 @@
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+from foam_reader import list_times
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("AIRFOIL_CACHE_DIR", os.path.join(SCRIPT_DIR, "cache"))
+CACHE_MAX_BYTES = int(float(os.environ.get("AIRFOIL_CACHE_MAX_GB", "5")) * 1024 ** 3)
+
+# Name of the file, inside a case directory, holding the key its current outputs were cached under.
+KEY_FILE = ".cache_key"
+_MANIFEST_FILE = "manifest.json"
+
+# Inputs (relative to the workspace) that determine the outputs of each stage.
+# Directories are hashed file by file. decomposeParDict only changes how a result is computed,
+# not the result itself, so it is left out.
+_STAGE_INPUTS = {
+    "mesh": ["Mesh/constant/triSurface/airfoil.stl", "Mesh/system"],
+    "solution": ["Run/system", "Run/0.org", "Run/constant/transportProperties",
+                 "Run/constant/turbulenceProperties"],
+}
+_IGNORED_INPUTS = {"decomposeParDict"}
+
+# Outputs (relative to the workspace) stored for each stage.
+_STAGE_OUTPUTS = {
+    "stl": ["Mesh/constant/triSurface/airfoil.stl"],
+    "mesh": ["Mesh/constant/polyMesh", "Mesh/constant/triSurface/airfoil.eMesh",
+             "Mesh/constant/extendedFeatureEdgeMesh", "Mesh/meshQuality.json"],
+    "solution": ["Run/constant/polyMesh", "Run/postProcessing", "Run/fieldStore"],
+    "animations": ["Run/animations"],
+}
+
+
+def _hash_path(digest, path, name):
+    if os.path.isdir(path):
+        for entry in sorted(os.listdir(path)):
+            if entry in _IGNORED_INPUTS or entry.endswith(".tmp"):
+                continue
+            _hash_path(digest, os.path.join(path, entry), f"{name}/{entry}")
+    elif os.path.exists(path):
+        digest.update(name.encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+
+
+def make_key(*parts, paths=(), root=None):
+    """
+    Builds a content hash from plain values and the contents of files/directories.
+
+    Args:
+        *parts: JSON serialisable values (settings, parent keys, ...) or NumPy arrays.
+        paths (list): Files or directories whose contents are part of the key.
+        root (str): Directory `paths` are relative to.
+
+    Returns:
+        str: Hex digest usable as a cache key.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if hasattr(part, "tobytes"):
+            digest.update(part.astype("<f8").tobytes())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+    for rel_path in paths:
+        path = os.path.join(root, rel_path) if root else rel_path
+        _hash_path(digest, path, rel_path)
+    return digest.hexdigest()
+
+
+def stage_key(workspace, stage, *parts):
+    """
+    Returns the key of a meshing ('mesh') or solver ('solution') stage from its inputs in `workspace`.
+
+    Args:
+        workspace (str): Case workspace holding the Mesh and Run cases.
+        stage (str): 'mesh' or 'solution'.
+        *parts: Additional values the result depends on (e.g. the parent stage key, solver settings).
+    """
+    return make_key(stage, *parts, paths=_STAGE_INPUTS[stage], root=workspace)
+
+
+def read_case_key(case_dir):
+    """Returns the cache key recorded for the outputs currently in `case_dir`, or None."""
+    path = os.path.join(case_dir, KEY_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read().strip() or None
+
+
+def write_case_key(case_dir, key):
+    """Records which cache key the outputs currently in `case_dir` belong to."""
+    with open(os.path.join(case_dir, KEY_FILE), "w") as f:
+        f.write(key or "")
+
+
+def remove_time_dirs(case_dir):
+    """Deletes the time directories (except 0) left in a case by a previous run."""
+    for name in list_times(case_dir, include_zero=False):
+        shutil.rmtree(os.path.join(case_dir, name), ignore_errors=True)
+
+
+def stage_outputs(workspace, stage):
+    """Lists the existing outputs of `stage` in `workspace`, relative to it."""
+    outputs = list(_STAGE_OUTPUTS[stage])
+    if stage == "solution":
+        # The animations are rendered straight from the time directories (see foam_reader).
+        run_dir = os.path.join(workspace, "Run")
+        outputs.extend(f"Run/{name}" for name in list_times(run_dir, include_zero=False))
+    return [p for p in outputs if os.path.exists(os.path.join(workspace, p))]
+
+
+def _entry_path(key, cache_dir):
+    return os.path.join(cache_dir, key)
+
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def lookup(key, cache_dir=CACHE_DIR, touch=True):
+    """
+    Returns the cache entry directory for `key`, or None on a miss.
+
+    A hit marks the entry as recently used for the LRU eviction, unless `touch` is False.
+    """
+    if key is None:
+        return None
+    entry = _entry_path(key, cache_dir)
+    if not os.path.exists(os.path.join(entry, _MANIFEST_FILE)):
+        return None
+    if not touch:
+        return entry
+    try:
+        os.utime(entry)
+    except OSError:
+        return None
+    return entry
+
+
+def restore(key, workspace, cache_dir=CACHE_DIR):
+    """
+    Copies the outputs cached under `key` into `workspace`, replacing existing ones.
+
+    Files are copied rather than linked since OpenFOAM rewrites files in place.
+
+    Returns:
+        bool: True on a cache hit, False on a miss.
+    """
+    entry = lookup(key, cache_dir)
+    if entry is None:
+        return False
+    try:
+        with open(os.path.join(entry, _MANIFEST_FILE)) as f:
+            outputs = json.load(f)["outputs"]
+        for rel_path in outputs:
+            src = os.path.join(entry, rel_path)
+            dst = os.path.join(workspace, rel_path)
+            if os.path.isdir(dst):
+                shutil.rmtree(dst)
+            elif os.path.exists(dst):
+                os.remove(dst)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            if os.path.isdir(src):
+                shutil.copytree(src, dst)
+            else:
+                shutil.copy2(src, dst)
+    except (OSError, ValueError, KeyError) as e:
+        # The entry was evicted while being read; treat it as a miss.
+        print(f"Could not restore cache entry {key}: {e}")
+        return False
+    print(f"Restored {key[:12]} from the cache into {workspace}")
+    return True
+
+
+def store(key, workspace, outputs, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """
+    Stores the given outputs of `workspace` under `key`, then evicts old entries.
+
+    Args:
+        key (str): Cache key of the stage.
+        workspace (str): Directory the outputs are taken from.
+        outputs (list): Paths relative to `workspace` (see `stage_outputs`).
+    """
+    if key is None or not outputs:
+        return
+    entry = _entry_path(key, cache_dir)
+    if os.path.exists(entry):
+        return
+    tmp_entry = f"{entry}.{uuid.uuid4().hex}.tmp"
+    try:
+        for rel_path in outputs:
+            src = os.path.join(workspace, rel_path)
+            dst = os.path.join(tmp_entry, rel_path)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            if os.path.isdir(src):
+                shutil.copytree(src, dst)
+            else:
+                shutil.copy2(src, dst)
+        with open(os.path.join(tmp_entry, _MANIFEST_FILE), "w") as f:
+            json.dump({"outputs": list(outputs), "size": _dir_size(tmp_entry)}, f)
+        # Publish atomically; a concurrent store of the same key simply loses the race.
+        os.rename(tmp_entry, entry)
+        print(f"Stored {key[:12]} in the cache")
+    except OSError as e:
+        print(f"Could not store cache entry {key}: {e}")
+    finally:
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+    evict(cache_dir, max_bytes)
+
+
+def evict(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """
+    Deletes least recently used entries until the cache fits in `max_bytes`.
+
+    Returns:
+        int: Number of entries removed.
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+    entries = []
+    total = 0
+    for name in os.listdir(cache_dir):
+        entry = os.path.join(cache_dir, name)
+        try:
+            with open(os.path.join(entry, _MANIFEST_FILE)) as f:
+                size = int(json.load(f)["size"])
+            last_used = os.path.getmtime(entry)
+        except (OSError, ValueError, KeyError):
+            continue
+        entries.append((last_used, size, entry))
+        total += size
+
+    removed = 0
+    for last_used, size, entry in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+        removed += 1
+    if removed:
+        print(f"Evicted {removed} cache entries ({total / 1024 ** 2:.0f} MB left)")
+    return removed
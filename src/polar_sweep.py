@@ -0,0 +1,184 @@
+import csv
+import math
+import os
+import re
+import shutil
+
+import numpy as np
+
+from convergence import set_stop_at
+from foam_dict import rewrite_dict
+
+# Directory, inside a workspace, holding the cases of a polar sweep.
+POLAR_DIR = "Polar"
+# Case the shared mesh is extruded in; every angle of attack links its constant/polyMesh.
+MESH_CASE = "mesh"
+POLAR_FILE = "polar.csv"
+POLAR_COLUMNS = ["alpha", "Cl", "Cd", "Cm", "status"]
+
+# The polar reports the mean of the coefficients over this many final iterations.
+AVERAGE_ITERATIONS = 50
+
+_INTERNAL_FIELD_RE = re.compile(r"(internalField\s+uniform\s+)\(([^)]*)\)")
+_SOURCE_CASE_RE = re.compile(r'(sourceCase\s+)"[^"]*"')
+
+
+def _direction_re(keyword):
+    return re.compile(rf"({keyword}\s+)\([^)]*\)")
+
+
+def flow_directions(alpha):
+    """
+    Returns the drag and lift directions for an angle of attack.
+
+    The airfoil stays fixed; the freestream is rotated by `alpha` in the x-y plane.
+
+    Args:
+        alpha (float): Angle of attack in degrees.
+
+    Returns:
+        tuple: (drag_dir, lift_dir) unit vectors as 3-tuples.
+    """
+    a = math.radians(alpha)
+    return (math.cos(a), math.sin(a), 0.0), (-math.sin(a), math.cos(a), 0.0)
+
+
+def _vector(values):
+    return "(" + " ".join(f"{v:.9g}" for v in values) + ")"
+
+
+def case_name(alpha):
+    """Name of the case directory of one angle of attack, e.g. 'aoa_+04.00'."""
+    return f"aoa_{alpha:+06.2f}"
+
+
+def inlet_speed(u_file):
+    """Reads the magnitude of the uniform internalField of a 0/U file."""
+    with open(u_file) as f:
+        match = _INTERNAL_FIELD_RE.search(f.read())
+    if match is None:
+        raise RuntimeError(f"No uniform internalField in {u_file}")
+    return math.sqrt(sum(float(v) ** 2 for v in match.group(2).split()))
+
+
+def create_mesh_case(workspace):
+    """
+    Sets up the case the sweep's 2D mesh is extruded in (extrudeMesh is run by the caller).
+
+    Args:
+        workspace (str): Case workspace holding the meshed Mesh case and the Run template.
+
+    Returns:
+        str: Path to the mesh case.
+    """
+    run_dir = os.path.join(workspace, "Run")
+    mesh_case = os.path.join(workspace, POLAR_DIR, MESH_CASE)
+    shutil.rmtree(mesh_case, ignore_errors=True)
+    shutil.copytree(os.path.join(run_dir, "system"), os.path.join(mesh_case, "system"))
+    os.makedirs(os.path.join(mesh_case, "constant"))
+    # The Run case refers to its mesh case relatively ("../Mesh"), which does not hold from here
+    rewrite_dict(os.path.join(mesh_case, "system", "extrudeMeshDict"), _SOURCE_CASE_RE,
+             rf'\g<1>"{os.path.abspath(os.path.join(workspace, "Mesh"))}"')
+    return mesh_case
+
+
+def create_sweep_case(workspace, alpha):
+    """
+    Creates the lightweight case of one angle of attack from the workspace's Run case.
+
+    Dictionaries are copied, the freestream in 0.org/U and the force directions in the
+    controlDict are rotated, stopAt is reset to endTime, and constant/polyMesh is a link to
+    the shared extruded mesh.
+
+    Args:
+        workspace (str): Case workspace holding the Run template and the Polar mesh case.
+        alpha (float): Angle of attack in degrees.
+
+    Returns:
+        str: Path to the case.
+    """
+    run_dir = os.path.join(workspace, "Run")
+    case_dir = os.path.join(workspace, POLAR_DIR, case_name(alpha))
+    shutil.rmtree(case_dir, ignore_errors=True)
+    os.makedirs(os.path.join(case_dir, "constant"))
+    os.makedirs(os.path.join(case_dir, "0"))
+    for entry in ("Allrun", "case.foam", "system", "0.org"):
+        src = os.path.join(run_dir, entry)
+        if os.path.isdir(src):
+            shutil.copytree(src, os.path.join(case_dir, entry))
+        else:
+            shutil.copy2(src, os.path.join(case_dir, entry))
+    for entry in ("transportProperties", "turbulenceProperties"):
+        shutil.copy2(os.path.join(run_dir, "constant", entry), os.path.join(case_dir, "constant", entry))
+    os.symlink(os.path.join("..", "..", MESH_CASE, "constant", "polyMesh"),
+               os.path.join(case_dir, "constant", "polyMesh"))
+
+    # The Run case may still hold the early stop of a run stopped at convergence
+    set_stop_at(case_dir, "endTime")
+    drag_dir, lift_dir = flow_directions(alpha)
+    u_file = os.path.join(case_dir, "0.org", "U")
+    speed = inlet_speed(u_file)
+    rewrite_dict(u_file, _INTERNAL_FIELD_RE, rf"\g<1>{_vector(speed * d for d in drag_dir)}")
+    control_dict = os.path.join(case_dir, "system", "controlDict")
+    rewrite_dict(control_dict, _direction_re("liftDir"), rf"\g<1>{_vector(lift_dir)}")
+    rewrite_dict(control_dict, _direction_re("dragDir"), rf"\g<1>{_vector(drag_dir)}")
+    return case_dir
+
+
+def _start_time(path):
+    """Start time of a function object output file, from its postProcessing/<function>/<time>/ directory."""
+    try:
+        return float(os.path.basename(os.path.dirname(path)))
+    except ValueError:
+        return float("-inf")
+
+
+def read_force_coefficients(case_dir, average=AVERAGE_ITERATIONS):
+    """
+    Averages the force coefficients written by the forceCoeffs function object.
+
+    Args:
+        case_dir (str): Case directory holding postProcessing/<function>/<start time>/.
+        average (int): Number of final iterations averaged.
+
+    Returns:
+        dict: {'Cl': ..., 'Cd': ..., 'Cm': ...}.
+    """
+    post_dir = os.path.join(case_dir, "postProcessing")
+    files = []
+    for root, _, names in os.walk(post_dir):
+        files.extend(os.path.join(root, n) for n in names if n in ("forceCoeffs.dat", "coefficient.dat"))
+    if not files:
+        raise RuntimeError(f"No force coefficients found in {post_dir}")
+    # A restarted run writes a new <start time> directory; the latest one holds the final iterations
+    path = max(files, key=lambda p: (_start_time(p), os.path.getmtime(p)))
+
+    columns = None
+    with open(path) as f:
+        for line in f:
+            if not line.startswith("#"):
+                break
+            if line.lstrip("# \t").startswith("Time"):
+                columns = line.lstrip("# \t").split()
+    if columns is None:
+        raise RuntimeError(f"No column header in {path}")
+    data = np.atleast_2d(np.loadtxt(path, comments="#"))
+    tail = data[-average:]
+    return {name: float(tail[:, columns.index(name)].mean()) for name in ("Cl", "Cd", "Cm")}
+
+
+def write_polar(path, polar):
+    """Writes polar rows (dicts with `POLAR_COLUMNS`) as CSV."""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=POLAR_COLUMNS)
+        writer.writeheader()
+        writer.writerows(polar)
+
+
+def read_polar(path):
+    """Reads a polar written by `write_polar`; returns None if there is none."""
+    if not os.path.exists(path):
+        return None
+    with open(path, newline="") as f:
+        return [{key: (value if key == "status" else float(value)) for key, value in row.items()}
+                for row in csv.DictReader(f)]
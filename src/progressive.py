@@ -0,0 +1,87 @@
+import os
+import re
+import shutil
+
+import numpy as np
+
+from foam_dict import rewrite_dict
+from field_store import open_store
+from warm_start import cell_centres
+from workspace import TEMPLATE_DIR, clone_cases
+
+# Directory, inside a workspace, holding the Mesh and Run cases of the coarse pass.
+COARSE_DIR = "Coarse"
+# snappyHexMesh refinement level of the airfoil surface and its feature edges in the coarse
+# pass; the production mesh of cfd/Mesh uses 6. Every level less quarters the cells near the wall.
+COARSE_LEVEL = 3
+
+# Part of the flow returned with the coarse result, in chord lengths around the airfoil.
+FIELD_WINDOW = ((-0.5, 2.0), (-0.75, 0.75))
+
+_SURFACE_LEVEL_RE = re.compile(r"(\blevel\s+)\(\s*\d+\s+\d+\s*\)")
+_FEATURE_LEVEL_RE = re.compile(r"(\blevel\s+)\d+(\s*;)")
+
+
+def set_refinement_level(mesh_dir, level):
+    """
+    Sets the snappyHexMesh refinement level of the airfoil surface and its feature edges.
+
+    The refinement regions (`levels ((...))`) are left as they are.
+
+    Args:
+        mesh_dir (str): Mesh case holding system/snappyHexMeshDict.
+        level (int): Minimum and maximum surface level, and feature edge level.
+    """
+    path = os.path.join(mesh_dir, "system", "snappyHexMeshDict")
+    rewrite_dict(path, _SURFACE_LEVEL_RE, rf"\g<1>({level} {level})")
+    rewrite_dict(path, _FEATURE_LEVEL_RE, rf"\g<1>{level}\g<2>")
+
+
+def create_coarse_case(workspace, level=COARSE_LEVEL, template_dir=TEMPLATE_DIR):
+    """
+    Creates the Mesh and Run cases of the coarse pass inside a workspace.
+
+    The cases are cloned from the templates like a workspace of their own, so `cfd_runner`
+    can mesh and solve them (and cache them, under keys of their own since the
+    snappyHexMeshDict differs) exactly like the production cases.
+
+    Args:
+        workspace (str): Case workspace whose Mesh case holds the airfoil STL.
+        level (int): Refinement level of the coarse mesh.
+
+    Returns:
+        str: Path of the coarse workspace, usable as `case_path` for `cfd_runner`.
+    """
+    coarse = os.path.join(workspace, COARSE_DIR)
+    shutil.rmtree(coarse, ignore_errors=True)
+    clone_cases(template_dir, coarse)
+    stl_dir = os.path.join("Mesh", "constant", "triSurface")
+    shutil.copy2(os.path.join(workspace, stl_dir, "airfoil.stl"), os.path.join(coarse, stl_dir, "airfoil.stl"))
+    set_refinement_level(os.path.join(coarse, "Mesh"), level)
+    return coarse
+
+
+def final_fields(case_dir, window=FIELD_WINDOW):
+    """
+    Returns the final pressure and velocity magnitude of an ingested run near the airfoil.
+
+    Args:
+        case_dir (str): Run case with a field store (see `field_store.ingest_run`).
+        window (tuple): ((x_min, x_max), (y_min, y_max)) of the cells returned.
+
+    Returns:
+        dict: 'x', 'y' cell centres and 'p', 'U' (magnitude) cell values, float32 arrays.
+    """
+    store = open_store(case_dir)
+    if store is None:
+        raise RuntimeError(f"No field store for the time directories of {case_dir}")
+    centres = cell_centres(store.mesh())
+    (x_min, x_max), (y_min, y_max) = window
+    inside = ((centres[:, 0] >= x_min) & (centres[:, 0] <= x_max) &
+              (centres[:, 1] >= y_min) & (centres[:, 1] <= y_max))
+    return {
+        'x': centres[inside, 0].astype(np.float32),
+        'y': centres[inside, 1].astype(np.float32),
+        'p': np.asarray(store.field('p')[-1])[inside],
+        'U': np.linalg.norm(np.asarray(store.field('U')[-1]), axis=1)[inside].astype(np.float32),
+    }
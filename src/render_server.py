@@ -0,0 +1,355 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import traceback
+import uuid
+
+from field_store import open_store
+from foam_reader import read_case
+
+# Size of the animation frames and part of the domain (x, y) they show.
+WINDOW_SIZE = (1920, 1088)
+VIEW_BOUNDS = [-0.1, 4, -0.1, 0.1, 0, 0]
+
+# Seconds to wait for a render before assuming the server hangs.
+REQUEST_TIMEOUT = float(os.environ.get("AIRFOIL_RENDER_TIMEOUT", "300"))
+# Seconds between checks, while waiting for a render, that the server process is still running.
+ALIVE_CHECK_INTERVAL = 0.5
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def ensure_display():
+    """Starts a virtual X server for VTK if this process has no display yet."""
+    import pyvista as pv
+
+    if os.name == "posix" and not os.environ.get("DISPLAY") and hasattr(pv, "start_xvfb"):
+        pv.start_xvfb()
+
+
+class FrameSource:
+    """
+    Loads the time steps of a run, building the mesh only once.
+
+    Reads from the case's binary field store when it is up to date, otherwise straight
+    from the ASCII time directories.
+    """
+
+    def __init__(self, case_dir):
+        self.case_dir = case_dir
+        self.store = open_store(case_dir)
+        self.grid = self.store.grid() if self.store is not None else read_case(case_dir)
+
+    def refresh(self):
+        """Opens the field store once the run has been ingested; the grid is kept."""
+        if self.store is None:
+            self.store = open_store(self.case_dir)
+
+    def load(self, time, fields):
+        if self.store is not None and str(time) in self.store.times:
+            return self.store.grid(time, fields=[f for f in fields if f in self.store.fields])
+        return read_case(self.case_dir, time, fields=fields, grid=self.grid)
+
+
+class FrameSources:
+    """
+    One `FrameSource` per case, reused for as long as the case's mesh is unchanged.
+
+    While a run is going there is no field store yet; the grid is still built only once
+    and the store is picked up as soon as it appears.
+    """
+
+    def __init__(self, max_cases=4):
+        self.max_cases = max_cases
+        self._sources = {}
+
+    def get(self, case_dir):
+        # The mesh of a case only changes when it is re-meshed or re-run.
+        owner = os.path.join(case_dir, "constant", "polyMesh", "owner")
+        stamp = os.path.getmtime(owner) if os.path.exists(owner) else None
+        cached = self._sources.get(case_dir)
+        if cached is not None and cached[0] == stamp:
+            cached[1].refresh()
+            return cached[1]
+        if len(self._sources) >= self.max_cases:
+            self._sources.clear()
+        self._sources[case_dir] = (stamp, FrameSource(case_dir))
+        return self._sources[case_dir][1]
+
+
+class FieldScene:
+    """
+    Off-screen scene for the field animation frames.
+
+    The plotter (and its OpenGL context) is created once; every frame only swaps the
+    datasets of the named actors and re-renders.
+    """
+
+    def __init__(self, window_size=WINDOW_SIZE):
+        import pyvista as pv
+
+        self.plotter = pv.Plotter(off_screen=True, window_size=list(window_size))
+
+    def render(self, slice_mesh, field, glyphs=None, screenshot=None):
+        """
+        Renders one field of one time step.
+
+        Args:
+            slice_mesh (pyvista.DataSet): z-slice of the time step.
+            field (str): Field to color by.
+            glyphs (pyvista.PolyData): Velocity glyphs, drawn on top for 'U'.
+            screenshot (str): Optional PNG path to also save the image to.
+
+        Returns:
+            np.ndarray: RGB image (height x width x 3 uint8).
+        """
+        plotter = self.plotter
+        # Once a plotter has rendered, every scene change re-renders; only render for the image.
+        plotter.suppress_rendering = True
+        for title in list(plotter.scalar_bars.keys()):
+            plotter.remove_scalar_bar(title)
+        plotter.add_mesh(slice_mesh, scalars=field, cmap='jet', name='field', reset_camera=False)
+        plotter.add_scalar_bar(title=field)
+        if field == 'U' and glyphs is not None:
+            plotter.add_mesh(glyphs, cmap='jet', show_scalar_bar=False, name='glyphs', reset_camera=False)
+        else:
+            plotter.remove_actor('glyphs')
+        plotter.view_xy()
+        plotter.reset_camera(bounds=VIEW_BOUNDS)
+        plotter.camera.zoom(1.7)
+        plotter.suppress_rendering = False
+        plotter.render()
+        return plotter.screenshot(screenshot, return_img=True)
+
+    def render_time(self, source, time, fields, frame_dir=None, index=0):
+        """
+        Renders every field of one time step, reading, slicing and glyphing it only once.
+
+        Args:
+            source (FrameSource): Run to read the time step from.
+            time (str): Time directory name.
+            fields (list): Fields to render.
+            frame_dir (str): If given, the frames are also written there as PNG files.
+            index (int): Frame number used in the PNG file names.
+
+        Returns:
+            dict: RGB image per field rendered; fields missing from the time step are skipped.
+        """
+        mesh = source.load(time, fields)
+        print(f"Processing time {time}, available fields: {mesh.array_names}")
+
+        # Handle 2D slicing for 3D meshes or use mesh directly for 2D
+        slice_mesh = mesh.slice(normal='z') if mesh.n_points > 2 else mesh
+
+        glyphs = None
+        if 'U' in fields and 'U' in mesh.point_data:
+            U_array = mesh.point_data['U']
+            if U_array.ndim == 2 and U_array.shape[1] == 3:  # Check if it's a 3D vector field
+                mesh.point_data['vectors'] = U_array
+                glyphs = mesh.glyph(orient='vectors', scale=True, factor=0.05)
+
+        rendered = {}
+        for field in fields:
+            if field not in mesh.array_names:
+                print(f"Field '{field}' not found in time {time}. Available fields: {mesh.array_names}")
+                continue
+            screenshot = os.path.join(frame_dir, f'{field}_frame_{index:04d}.png') if frame_dir else None
+            rendered[field] = self.render(slice_mesh, field, glyphs, screenshot)
+        return rendered
+
+    def close(self):
+        self.plotter.close()
+
+
+class PreviewScene:
+    """Off-screen scene for the zoomed-in mesh wireframe preview."""
+
+    def __init__(self):
+        self.plotter = None
+        self.window_size = None
+
+    def render(self, mesh_path, output_image_path=None, line_color='black', line_width=1,
+               mesh_color='lightgray', bounds_margin=0.02, z_tolerance=1e-3, window_size=(1600, 1200)):
+        """Renders the preview; see `utils_old.vtk_to_png_surface_wireframe` for the arguments."""
+        import pyvista as pv
+
+        # Load mesh
+        if os.path.isdir(mesh_path):
+            mesh = read_case(mesh_path)
+        else:
+            mesh = pv.read(mesh_path)
+
+        # Extract the nearly-flat 2D slice where airfoil lies (assumes in XY plane)
+        z_vals = mesh.points[:, 2]
+        flat_mask = (z_vals >= z_vals.min() - z_tolerance) & (z_vals <= z_vals.min() + z_tolerance)
+        flat_mesh = mesh.extract_points(flat_mask, adjacent_cells=True)
+
+        if flat_mesh.n_points == 0:
+            raise ValueError("No nearly-2D region found — check z_tolerance or mesh orientation.")
+
+        # Expand bounds a bit to give margin in the plot
+        bounds = list(flat_mesh.bounds)  # (xmin, xmax, ymin, ymax, zmin, zmax)
+        x_margin = (bounds[1] - bounds[0]) * bounds_margin
+        y_margin = (bounds[3] - bounds[2]) * bounds_margin
+        cropped = flat_mesh.clip_box([  # crop tightly around airfoil
+            bounds[0] - x_margin, bounds[1] + x_margin,
+            bounds[2] - y_margin, bounds[3] + y_margin,
+            bounds[4], bounds[5]
+        ], invert=False)
+
+        # Set up 2D orthographic plot, reusing the plotter while the image size is unchanged
+        if self.plotter is None or self.window_size != tuple(window_size):
+            if self.plotter is not None:
+                self.plotter.close()
+            self.plotter = pv.Plotter(off_screen=True, window_size=list(window_size))
+            self.window_size = tuple(window_size)
+        plotter = self.plotter
+        plotter.suppress_rendering = True
+        plotter.add_mesh(cropped, color=mesh_color, show_edges=True, name='mesh',
+                         edge_color=line_color, line_width=line_width, lighting=False)
+
+        plotter.view_xy()
+        plotter.enable_parallel_projection()
+        plotter.reset_camera()
+        plotter.camera.zoom(25)
+        shift_amount = 4.5
+        camera = plotter.camera
+        camera.position = [camera.position[0] - shift_amount, camera.position[1], camera.position[2]]
+        camera.focal_point = [camera.focal_point[0] - shift_amount, camera.focal_point[1], camera.focal_point[2]]
+        # Output filename
+        if output_image_path is None:
+            if os.path.isdir(mesh_path):
+                output_image_path = os.path.join(mesh_path, 'mesh_wireframe.png')
+            else:
+                output_image_path = os.path.splitext(mesh_path)[0] + '_wireframe.png'
+
+        plotter.suppress_rendering = False
+        plotter.render()
+        plotter.screenshot(output_image_path)
+        return output_image_path
+
+    def close(self):
+        if self.plotter is not None:
+            self.plotter.close()
+
+
+def _serve(requests, responses):
+    """Request loop of the render server process."""
+    ensure_display()
+    scenes = {}
+    sources = FrameSources()
+
+    def scene(kind, factory):
+        if kind not in scenes:
+            scenes[kind] = factory()
+        return scenes[kind]
+
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        request_id, kind, kwargs = request
+        try:
+            if kind == "preview":
+                result = scene("preview", PreviewScene).render(**kwargs)
+            elif kind == "frame":
+                case_dir = kwargs.pop("case_dir")
+                result = scene("field", FieldScene).render_time(sources.get(case_dir), **kwargs)
+            else:
+                raise ValueError(f"Unknown render request '{kind}'")
+            responses.put((request_id, result, None))
+        except Exception as e:
+            responses.put((request_id, None, f"{e}\n{traceback.format_exc()}"))
+
+    for s in scenes.values():
+        if hasattr(s, "close"):
+            s.close()
+
+
+class RenderServer:
+    """
+    Long-lived off-screen render process with warm VTK/OpenGL contexts.
+
+    Requests are served one at a time over a local queue; the scenes (plotters, actors,
+    figures) are created on first use and then only updated.
+    """
+
+    def __init__(self):
+        self._process = None
+        self._requests = None
+        self._responses = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        context = multiprocessing.get_context("spawn")
+        self._requests = context.Queue()
+        self._responses = context.Queue()
+        self._process = context.Process(target=_serve, args=(self._requests, self._responses), daemon=True)
+        self._process.start()
+
+    @property
+    def alive(self):
+        return self._process is not None and self._process.is_alive()
+
+    def request(self, kind, timeout=REQUEST_TIMEOUT, **kwargs):
+        """
+        Sends a render request and waits for its result.
+
+        Args:
+            kind (str): 'preview' (mesh wireframe) or 'frame' (field frames of one time step).
+            timeout (float): Seconds to wait for the result.
+            **kwargs: Arguments of the corresponding scene's render method.
+
+        Returns:
+            The render result (image path, or {field: image} for 'frame').
+
+        Raises:
+            RuntimeError: If the render fails, times out or the server process exits (e.g. a
+                          VTK/OpenGL crash) before answering.
+        """
+        with self._lock:
+            if not self.alive:
+                self.start()
+            request_id = uuid.uuid4().hex
+            self._requests.put((request_id, kind, kwargs))
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    response_id, result, error = self._responses.get(timeout=max(min(remaining, ALIVE_CHECK_INTERVAL), 0))
+                except queue.Empty:
+                    if not self.alive:
+                        exitcode = self._process.exitcode
+                        self.stop()
+                        raise RuntimeError(f"Render server exited (code {exitcode}) during request '{kind}'")
+                    if remaining <= 0:
+                        self.stop()
+                        raise RuntimeError(f"Render request '{kind}' timed out after {timeout:.0f} s")
+                    continue
+                if response_id == request_id:
+                    break
+        if error is not None:
+            raise RuntimeError(f"Render request '{kind}' failed: {error}")
+        return result
+
+    def stop(self):
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            self._requests.put(None)
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.kill()
+        self._process = None
+
+
+def get_render_server():
+    """Returns the render server of this process, starting it on first use."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = RenderServer()
+        return _server
@@ -0,0 +1,140 @@
+import os
+
+import numpy as np
+
+# Binary STL: 80 byte header, uint32 triangle count, then one record per triangle.
+STL_RECORD = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")])
+STL_HEADER_SIZE = 80
+
+# Points closer than this (relative to the chord) to their predecessor are dropped.
+CLEAN_TOLERANCE = 1e-7
+
+
+def clean_outline(x, y, tolerance):
+    """
+    Prepares airfoil coordinates for extrusion.
+
+    Drops points closer than `tolerance` to the previous point (these give degenerate
+    triangles), drops the closing point if the curve already returns to its start, and
+    orients the outline counter-clockwise.
+
+    Args:
+        x (np.ndarray): X coordinates of the curve.
+        y (np.ndarray): Y coordinates of the curve.
+        tolerance (float): Minimum distance between consecutive points.
+
+    Returns:
+        np.ndarray: (n, 2) open, counter-clockwise outline.
+    """
+    points = np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)])
+    step = np.hypot(*np.diff(points, axis=0).T)
+    points = points[np.concatenate([[True], step > tolerance])]
+    if len(points) > 1 and np.hypot(*(points[-1] - points[0])) <= tolerance:
+        points = points[:-1]
+    if len(points) < 3:
+        raise ValueError(f"The airfoil outline needs at least 3 distinct points, got {len(points)}.")
+
+    # Shoelace area; negative for a clockwise outline
+    area = 0.5 * (np.dot(points[:, 0], np.roll(points[:, 1], -1)) - np.dot(points[:, 1], np.roll(points[:, 0], -1)))
+    if area == 0:
+        raise ValueError("The airfoil outline has zero area.")
+    return points if area > 0 else points[::-1]
+
+
+def extrude_outline(points, thickness):
+    """
+    Extrudes a closed outline into a watertight prism centred on z = 0.
+
+    Args:
+        points (np.ndarray): (n, 2) open, counter-clockwise outline.
+        thickness (float): Extent of the prism in the Z-direction.
+
+    Returns:
+        np.ndarray: (m, 3, 3) triangles with outward-facing (counter-clockwise) winding.
+    """
+    import mapbox_earcut
+
+    n = len(points)
+    cap = mapbox_earcut.triangulate_float64(points, np.array([n], dtype=np.uint32)).reshape(-1, 3)
+    # Make every cap triangle counter-clockwise seen from +z
+    a, b, c = (points[cap[:, k]] for k in range(3))
+    clockwise = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]) < 0
+    cap[clockwise] = cap[clockwise][:, ::-1]
+
+    half = thickness / 2
+    bottom = np.column_stack([points, np.full(n, -half)])
+    top = np.column_stack([points, np.full(n, half)])
+
+    # Each outline edge i -> i + 1 becomes a quad of two triangles facing outwards
+    i = np.arange(n)
+    j = np.roll(i, -1)
+    walls = np.concatenate([
+        np.stack([bottom[i], bottom[j], top[j]], axis=1),
+        np.stack([bottom[i], top[j], top[i]], axis=1),
+    ])
+    return np.concatenate([top[cap], bottom[cap[:, ::-1]], walls])
+
+
+def stl_bytes(triangles, name="airfoil"):
+    """
+    Packs triangles into a binary STL.
+
+    Args:
+        triangles (np.ndarray): (m, 3, 3) triangle vertices.
+        name (str): Solid name written into the header.
+
+    Returns:
+        bytes: The STL file contents.
+    """
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+    records = np.zeros(len(triangles), dtype=STL_RECORD)
+    records["normal"] = normals
+    records["vertices"] = triangles
+    header = f"solid {name}".encode().ljust(STL_HEADER_SIZE, b"\0")[:STL_HEADER_SIZE]
+    return header + np.uint32(len(triangles)).tobytes() + records.tobytes()
+
+
+def build_airfoil_stl(x, y, chord_length=1.0, thickness=0.001, output_stl_file=None):
+    """
+    Builds a binary STL of the extruded airfoil straight from its coordinates.
+
+    Args:
+        x (np.ndarray): X coordinates of the airfoil, as produced by the interpolation
+                        (trailing edge, upper surface, leading edge, lower surface).
+        y (np.ndarray): Y coordinates of the airfoil.
+        chord_length (float): Scale applied to the (unit chord) coordinates.
+        thickness (float): The thickness of the 3D airfoil in the Z-direction.
+                           This creates a 2D-like body for 2D simulations in OpenFOAM
+                           (by setting appropriate boundary conditions).
+        output_stl_file (str): If given, the STL is also written there (atomically).
+
+    Returns:
+        bytes: The binary STL, ready for the viewer and the download button.
+    """
+    points = clean_outline(np.asarray(x, dtype=float) * chord_length, np.asarray(y, dtype=float) * chord_length,
+                           CLEAN_TOLERANCE * chord_length)
+    data = stl_bytes(extrude_outline(points, thickness))
+
+    if output_stl_file:
+        os.makedirs(os.path.dirname(os.path.abspath(output_stl_file)), exist_ok=True)
+        tmp_path = output_stl_file + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, output_stl_file)
+        print(f"STL file '{output_stl_file}' created successfully.")
+    return data
+
+
+if __name__ == "__main__":
+    input_file      = "airfoil_coordinates.txt"
+    output_directory = "./cfd/Mesh/constant/triSurface"
+    output_filename = "airfoil.stl"
+    output_file     = os.path.join(output_directory, output_filename)
+
+    desired_chord   = 1.0 # meters
+    airfoil_thic    = 0.1 # meters (for 2D simulation extrusion)
+    coordinates     = np.loadtxt(input_file)
+    build_airfoil_stl(coordinates[:, 0], coordinates[:, 1], desired_chord, airfoil_thic, output_file)
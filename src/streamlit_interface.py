@@ -2,7 +2,6 @@ import streamlit as st
 from streamlit_image_coordinates import streamlit_image_coordinates
 from PIL import Image
 import numpy as np
-import matplotlib.pyplot as plt
 import os
 from streamlit_stl import stl_from_text
 
@@ -10,23 +9,52 @@ from streamlit_stl import stl_from_text
 from cfd_runner import (
     run_openfoam_meshing,
     run_openfoam_simulation,
+    run_polar_sweep,
+    run_coarse_pass,
+    run_refinement_pass,
     )
 
-from old_airfoil_to_stl import create_airfoil_stl
+from panel_method import case_reynolds, solve_airfoil
+from stl_builder import build_airfoil_stl
 
 from utils_old import (
     convert_pixel_to_custom,
     convert_custom_to_pixel,
     interpolate_airfoil_and_close,
+    interpolate_airfoil_adaptive,
     check_airfoil_overlap,
     vtk_to_png_surface_wireframe,
     generate_vtk_animations,
     play_video_on_streamlit,
 )
 
+from decomposition import detect_cores
+from frame_renderer import ANIMATION_FIELDS, preview_path
+from mesh_quality import describe_quality, read_mesh_quality
+from progressive import COARSE_LEVEL
+from pipeline_cache import (
+    make_key,
+    read_case_key,
+    restore,
+    stage_outputs,
+    store,
+    write_case_key,
+)
+from warm_start import iteration_statistics
+
 from components import (
+        create_cp_plot,
+        create_field_plot,
         create_grid_image,
+        create_polar_plot,
+        job_status_panel,
     )
+from job_manager import (
+    DONE,
+    submit_job,
+    get_job,
+    forget_job,
+)
 from history_manager import (
     initialize_session_state,
     add_to_history,
@@ -75,9 +103,53 @@ y_grid_step = st.sidebar.number_input("Y Grid Step", min_value=0.01, max_value=1
 
 st.sidebar.markdown("---")
 st.sidebar.header("Airfoil Interpolation Settings")
-num_points_interp = st.sidebar.slider("Interpolated Points", min_value=100, max_value=1000, value=500, step=50, help="Number of points for the interpolated airfoil curve.")
+resampling_mode = st.sidebar.radio("Resampling", ["Uniform", "Adaptive"], horizontal=True, help="Uniform spaces a fixed number of points evenly along the spline. Adaptive places points where the curvature is high (leading edge) so that the shape stays within a tolerance with as few points, and STL triangles, as possible.")
+if resampling_mode == "Uniform":
+    num_points_interp = st.sidebar.slider("Interpolated Points", min_value=100, max_value=1000, value=500, step=50, help="Number of points for the interpolated airfoil curve.")
+else:
+    chordal_tolerance = st.sidebar.number_input("Chordal Tolerance", min_value=1e-6, max_value=1e-2, value=1e-4, step=1e-5, format="%.1e", help="Maximum distance between the smooth spline and the straight segments of the interpolated airfoil, in custom units.")
 smoothness_interp = st.sidebar.number_input("Smoothness (s)", min_value=0.0, max_value=1.0, value=0.0001, step=0.0001, format="%.4f", help="Smoothing factor for the B-spline. Higher values mean more smoothing.")
 
+st.sidebar.markdown("---")
+st.sidebar.header("Panel Method Preview")
+show_panel_preview = st.sidebar.checkbox("Show preview", value=True, help="Estimate Cp, Cl and Cm of the drawn airfoil with a panel method in milliseconds, updated on every click.")
+preview_alpha = st.sidebar.number_input("Preview Angle of Attack (deg)", min_value=-20.0, max_value=20.0, value=0.0, step=1.0, format="%.1f", disabled=not show_panel_preview)
+preview_viscous = st.sidebar.checkbox("Viscous correction", value=True, help="Run an integral boundary layer on the inviscid solution: estimates Cd and the lift lost to the boundary layer.", disabled=not show_panel_preview)
+preview_reynolds = st.sidebar.number_input("Reynolds Number", min_value=1e4, max_value=1e8, value=case_reynolds(os.path.join(os.path.dirname(os.path.abspath(__file__)), "cfd", "Run")), step=1e5, format="%.2e", help="Chord Reynolds number for the viscous correction; defaults to the OpenFOAM case (inlet speed x 1 m / nu).", disabled=not (show_panel_preview and preview_viscous))
+
+st.sidebar.markdown("---")
+st.sidebar.header("Parallel Execution")
+run_parallel = st.sidebar.checkbox("Run in parallel (MPI)", value=detect_cores() > 1, help="Decompose the case and run snappyHexMesh and the solver under mpirun.")
+if run_parallel:
+    st.sidebar.caption(f"Up to **{detect_cores()}** cores will be used per job.")
+
+st.sidebar.markdown("---")
+st.sidebar.header("Convergence Monitor")
+stop_at_convergence = st.sidebar.checkbox("Stop at convergence", value=True, help="Stop the solver as soon as Cl/Cd and the residuals have settled, and abort it if Cl/Cd blow up.")
+convergence_window = st.sidebar.number_input("Averaging Window", min_value=10, max_value=500, value=50, step=10, help="Number of iterations over which Cl/Cd fluctuations are measured.", disabled=not stop_at_convergence)
+convergence_min_iterations = st.sidebar.number_input("Minimum Iterations", min_value=10, max_value=500, value=100, step=10, help="Iterations to run before convergence is checked.", disabled=not stop_at_convergence)
+convergence_coeff_tol = st.sidebar.number_input("Cl/Cd Tolerance", min_value=1e-6, max_value=1.0, value=1e-3, step=1e-4, format="%.1e", help="Maximum standard deviation of Cl and Cd over the averaging window.", disabled=not stop_at_convergence)
+convergence_residual_tol = st.sidebar.number_input("Residual Tolerance", min_value=1e-8, max_value=1.0, value=1e-4, step=1e-5, format="%.1e", help="Maximum initial residual of every solved field.", disabled=not stop_at_convergence)
+convergence_divergence_limit = st.sidebar.number_input("Divergence Limit", min_value=1.0, max_value=1e6, value=1e3, step=100.0, format="%.0f", help="Abort the run when |Cl| or |Cd| exceeds this value.", disabled=not stop_at_convergence)
+warm_start = st.sidebar.checkbox("Warm start", value=True, help="Start the solver from the closest previously converged solution (same or similar airfoil, nearby angle of attack), mapped onto the new mesh, instead of uniform fields.", disabled=not stop_at_convergence)
+if stop_at_convergence and warm_start:
+    warm_stats = iteration_statistics()
+    if warm_stats['warm']:
+        st.sidebar.caption(f"Warm starts so far: **{warm_stats['warm_mean']:.0f}** iterations on average over {warm_stats['warm']} run(s), "
+                           f"**{warm_stats['saved']:.0f}** fewer than the runs they started from. Cold starts: {warm_stats['cold_mean']:.0f} iterations.")
+
+st.sidebar.markdown("---")
+st.sidebar.header("Progressive Mode")
+coarse_level = st.sidebar.slider("Coarse Refinement Level", min_value=1, max_value=5, value=COARSE_LEVEL, help="snappyHexMesh refinement level of the airfoil surface for the quick first pass of a progressive run; the production mesh uses 6.")
+
+st.sidebar.markdown("---")
+st.sidebar.header("Polar Sweep")
+polar_alpha_start = st.sidebar.number_input("First Angle of Attack (deg)", min_value=-30.0, max_value=30.0, value=-4.0, step=1.0, format="%.1f")
+polar_alpha_end = st.sidebar.number_input("Last Angle of Attack (deg)", min_value=-30.0, max_value=30.0, value=12.0, step=1.0, format="%.1f")
+polar_alpha_step = st.sidebar.number_input("Angle Step (deg)", min_value=0.5, max_value=10.0, value=2.0, step=0.5, format="%.1f", help="The mesh is built once and one solver case per angle is run, as many at a time as there are cores.")
+polar_alphas = list(np.round(np.arange(polar_alpha_start, polar_alpha_end + polar_alpha_step / 2, polar_alpha_step), 2)) if polar_alpha_end >= polar_alpha_start else []
+st.sidebar.caption(f"**{len(polar_alphas)}** angle(s) of attack.")
+
 # --- Display the image and capture coordinates ---
 st.subheader("Clickable Area")
 st.write(f"X-axis from **{x_min}** to **{x_max}**, Y-axis from **{y_min}** to **{y_max}**.")
@@ -169,17 +241,43 @@ if len(st.session_state.points) >= 4:
 
     # Generate interpolated points for display and potential saving
     try:
-        x_interp, y_interp = interpolate_airfoil_and_close(
-            x_coords_input, y_coords_input,
-            num_points=num_points_interp,
-            smoothness=smoothness_interp
-        )
+        if resampling_mode == "Uniform":
+            x_interp, y_interp = interpolate_airfoil_and_close(
+                x_coords_input, y_coords_input,
+                num_points=num_points_interp,
+                smoothness=smoothness_interp
+            )
+        else:
+            x_interp, y_interp = interpolate_airfoil_adaptive(
+                x_coords_input, y_coords_input,
+                tolerance=chordal_tolerance,
+                smoothness=smoothness_interp
+            )
+            st.caption(f"Adaptive resampling: **{len(x_interp)}** points.")
 
-        st.session_state.overlap_detected, st.session_state.overlap_message = check_airfoil_overlap(x_interp, y_interp)
+        st.session_state.overlap_detected, st.session_state.overlap_message, overlap_segments = check_airfoil_overlap(
+            x_interp, y_interp, checker=st.session_state.overlap_checker)
 
         if st.session_state.overlap_detected:
             st.error(f"Airfoil Overlap Detected: {st.session_state.overlap_message} Please adjust your points.")
+            if len(overlap_segments):
+                import matplotlib.pyplot as plt
+
+                # Highlight the crossing segments (segment i joins point i and i + 1; the ring is closed)
+                x_ring, y_ring = np.append(x_interp, x_interp[0]), np.append(y_interp, y_interp[0])
+                fig, ax = plt.subplots(figsize=(10, 6))
+                ax.plot(x_coords_input, y_coords_input, 'ro', label='Original Points')
+                ax.plot(x_interp, y_interp, 'b-', label='Interpolated Airfoil Shape')
+                for i in np.unique(overlap_segments):
+                    ax.plot(x_ring[i:i + 2], y_ring[i:i + 2], 'r-', linewidth=3,
+                            label='Intersecting Segments' if i == overlap_segments.min() else None)
+                ax.set_aspect('equal', adjustable='box')
+                ax.grid(True)
+                ax.legend()
+                st.pyplot(fig)
+                plt.close(fig)
         else:
+            import matplotlib.pyplot as plt  # deferred: only needed once there is a shape to plot
 
             fig, ax = plt.subplots(figsize=(10, 6))
             ax.plot(x_coords_input, y_coords_input, 'ro', label='Original Points')
@@ -192,6 +290,21 @@ if len(st.session_state.points) >= 4:
             ax.legend()
             st.pyplot(fig)
 
+            if show_panel_preview:
+                try:
+                    preview = solve_airfoil(x_interp, y_interp, preview_alpha, preview_reynolds if preview_viscous else None)
+                    metric_cols = st.columns(3)
+                    metric_cols[0].metric("Cl (panel)", f"{preview['Cl']:.3f}")
+                    metric_cols[1].metric("Cm (panel, c/4)", f"{preview['Cm']:.4f}", help="About the quarter chord, positive about +z (nose down) like the OpenFOAM forceCoeffs.")
+                    metric_cols[2].metric("Cd (panel)", f"{preview['Cd']:.4f}" if preview['Cd'] is not None else "-")
+                    if preview['separated']:
+                        st.caption("The boundary layer separates ahead of the trailing edge; the preview overestimates Cl there, run OpenFOAM for this design.")
+                    cp_fig = create_cp_plot(preview)
+                    st.pyplot(cp_fig)
+                    plt.close(cp_fig)
+                except (ValueError, np.linalg.LinAlgError) as e:
+                    st.caption(f"No panel method preview for this shape: {e}")
+
             # Prepare the data content as a string for saving
             output_data_string = ""
             for i in range(len(x_interp)):
@@ -200,11 +313,12 @@ if len(st.session_state.points) >= 4:
             with col4: # Put save button in the new column
                 save_disabled = st.session_state.overlap_detected or st.session_state.file_saved
                 if st.button("💾 Save Coordinates", help="Save the interpolated airfoil coordinates to a text file."):
-                    file_name =os.path.join("airfoil_coordinates.txt")
+                    file_name = os.path.join(st.session_state.workspace, "airfoil_coordinates.txt")
                     try:
                         with open(file_name, "w") as f:
                             f.write(output_data_string)
                         st.success(f"Airfoil coordinates saved to **{file_name}**")
+                        st.session_state.interpolated_coords = np.column_stack([x_interp, y_interp]) # STL input
                         st.session_state.file_saved = True # Set flag after saving
                         st.session_state.suppress_point_add = True # Suppress further clicks after saving
                         st.session_state.last_click_processed = None # Clear any stale click when entering save mode
@@ -234,19 +348,23 @@ FIXED_CHORD_LENGTH = 1.0
 if st.session_state.file_saved:
     if st.button("⚙️ Generate STL File", help="Create a 3D STL model from the interpolated airfoil."):
         with st.spinner("Generating 3D STL model..."):
-            input_file      = "airfoil_coordinates.txt"
-            output_directory = "./cfd/Mesh/constant/triSurface"
-            os.makedirs(output_directory, exist_ok=True)
+            output_directory = os.path.join(st.session_state.workspace, "Mesh", "constant", "triSurface")
             output_filename = "airfoil.stl"
             output_file     = os.path.join(output_directory, output_filename)
-            generated_path =  create_airfoil_stl(input_file, output_file, FIXED_CHORD_LENGTH, FIXED_STL_THICKNESS)
-            if generated_path:
-                st.success(f"3D STL file generated successfully at **{generated_path}**!")
+            coords = st.session_state.interpolated_coords
+            stl_key = make_key("stl", FIXED_CHORD_LENGTH, FIXED_STL_THICKNESS, coords)
+            try:
+                if restore(stl_key, st.session_state.workspace):
+                    with open(output_file, "rb") as f:
+                        st.session_state.stl_data = f.read()
+                else:
+                    st.session_state.stl_data = build_airfoil_stl(coords[:, 0], coords[:, 1], FIXED_CHORD_LENGTH,
+                                                                  FIXED_STL_THICKNESS, output_file)
+                    store(stl_key, st.session_state.workspace, stage_outputs(st.session_state.workspace, "stl"))
+                st.success(f"3D STL file generated successfully at **{output_file}**!")
                 st.session_state.stl_generated = True # Set flag
-                # Clean up the temporary coordinate file
-                #st.rerun()
-            else:
-                st.error("Failed to generate STL file.")
+            except Exception as e:
+                st.error(f"Failed to generate STL file: {e}")
 
 
     if st.session_state.stl_generated: # Display STL viewer if generated
@@ -256,78 +374,222 @@ if st.session_state.file_saved:
                             Zoom In/Out to be able to display the preview
                             """
                     )
-                    stl_output_path = os.path.join("cfd/Mesh/constant/triSurface", "airfoil.stl")
-                    if os.path.exists(stl_output_path):
-                        try:
-                            with open(stl_output_path, "rb") as f:
-                                stl_data = f.read()
-                            # Display the STL using streamlit_stl.stl_from_text
-                            stl_from_text(stl_data, height=400, width=600) # Removed 'key' as streamlit-stl might not support it
-                            st.download_button(
-                                label="Download 3D STL File",
-                                data=stl_data,
-                                file_name="airfoil_geometry.stl",
-                                mime="application/octet-stream"
-                            )
-                        except Exception as e:
-                            st.error(f"Error loading or displaying STL: {e}")
-                    else:
-                        st.warning("STL file not found for preview.")
+                    stl_data = st.session_state.stl_data # Bytes written to the workspace, not re-read
+                    try:
+                        # Display the STL using streamlit_stl.stl_from_text
+                        stl_from_text(stl_data, height=400, width=600) # Removed 'key' as streamlit-stl might not support it
+                        st.download_button(
+                            label="Download 3D STL File",
+                            data=stl_data,
+                            file_name="airfoil_geometry.stl",
+                            mime="application/octet-stream"
+                        )
+                    except Exception as e:
+                        st.error(f"Error loading or displaying STL: {e}")
     # --- Mesh & Simulation Results---
     if st.session_state.stl_generated:
-        if st.button("⚙️ Generate Mesh File", help="Create a Mesh from the airfoil stl file."):
-            with st.spinner("Generating Mesh...this may take a while."):
+        convergence_settings = None
+        if stop_at_convergence:
+            convergence_settings = {
+                'window': convergence_window,
+                'min_iterations': convergence_min_iterations,
+                'coeff_tolerance': convergence_coeff_tol,
+                'residual_tolerance': convergence_residual_tol,
+                'divergence_limit': convergence_divergence_limit,
+            }
+        progressive_active = st.session_state.coarse_job is not None or st.session_state.fine_job is not None
+        mesh_job_active = st.session_state.mesh_job is not None
+        # The solver jobs extrude from and run on the Mesh case, so it cannot be rewritten under them
+        solver_jobs_active = st.session_state.run_job is not None or st.session_state.polar_job is not None
+        if st.button("⚙️ Generate Mesh File", help="Create a Mesh from the airfoil stl file.", disabled=mesh_job_active or progressive_active or solver_jobs_active):
+            st.session_state.mesh_job = submit_job("meshing", run_openfoam_meshing, st.session_state.workspace, parallel=run_parallel)
+            st.session_state.meshing = False
+            st.session_state.running = False
+        if st.session_state.mesh_job is not None:
+            mesh_job = get_job(st.session_state.mesh_job)
+            if mesh_job is None:
+                st.error("The meshing job was lost (the server may have restarted), please generate the mesh again.")
+                st.session_state.mesh_job = None
+            elif not mesh_job.finished:
+                job_status_panel(mesh_job.id, "Meshing")
+            else:
+                if mesh_job.state == DONE and mesh_job.result:
+                    st.success(f"Mesh was generated successfully in {mesh_job.elapsed:.0f} s and passed the quality check")
+                    st.session_state.meshing = True # Set flag
+                elif mesh_job.state == DONE:
+                    st.error("Failed to generate the mesh file, check the terminal for details.")
+                    st.session_state.meshing = False
+                else:
+                    st.error(f"An error occurred during meshing: {mesh_job.error}")
+                    st.session_state.meshing = False
+                forget_job(mesh_job.id)
+                st.session_state.mesh_job = None
+
+        # --- Progressive run: coarse mesh and solution first, production level in the background ---
+        other_jobs_active = mesh_job_active or solver_jobs_active
+        if st.button("⚡ Progressive Run", help="Mesh and solve on a coarse mesh first for quick approximate fields and Cl/Cd, then refine to the production mesh in the background, starting from the coarse solution.", disabled=progressive_active or other_jobs_active or not stop_at_convergence):
+            st.session_state.coarse_job = submit_job("coarse pass", run_coarse_pass, st.session_state.workspace, level=coarse_level, convergence=convergence_settings, parallel=run_parallel, warm_start=warm_start)
+            st.session_state.coarse_result = None
+            st.session_state.fine_result = None
+            st.session_state.meshing = False
+            st.session_state.running = False
+        if not stop_at_convergence:
+            st.caption("Progressive runs need **Stop at convergence** (sidebar): the converged coarse solution is what the production solve starts from.")
+        if st.session_state.coarse_job is not None:
+            coarse_job = get_job(st.session_state.coarse_job)
+            if coarse_job is None:
+                st.error("The coarse pass was lost (the server may have restarted), please start the progressive run again.")
+                st.session_state.coarse_job = None
+            elif not coarse_job.finished:
+                job_status_panel(coarse_job.id, "Coarse pass")
+            else:
+                if coarse_job.state == DONE and coarse_job.result:
+                    st.session_state.coarse_result = coarse_job.result
+                    # Chain the production pass; it warm-starts from the coarse solution just stored
+                    st.session_state.fine_job = submit_job("refinement pass", run_refinement_pass, st.session_state.workspace, convergence=convergence_settings, parallel=run_parallel)
+                elif coarse_job.state == DONE:
+                    st.error("The coarse pass failed, check the terminal for details.")
+                else:
+                    st.error(f"An error occurred during the coarse pass: {coarse_job.error}")
+                forget_job(coarse_job.id)
+                st.session_state.coarse_job = None
+        fine_job = None
+        if st.session_state.fine_job is not None:
+            fine_job = get_job(st.session_state.fine_job)
+            if fine_job is None:
+                st.error("The refinement pass was lost (the server may have restarted), please start the progressive run again.")
+                st.session_state.fine_job = None
+            elif fine_job.finished:
+                if fine_job.state == DONE and fine_job.result:
+                    st.success(f"The production solution landed after {fine_job.elapsed:.0f} s")
+                    st.session_state.fine_result = fine_job.result
+                    st.session_state.meshing = True # Shows the production mesh and animations below
+                    st.session_state.running = True
+                elif fine_job.state == DONE:
+                    st.error("The refinement pass failed, check the terminal for details.")
+                else:
+                    st.error(f"An error occurred during the refinement pass: {fine_job.error}")
+                forget_job(fine_job.id)
+                st.session_state.fine_job = None
+                fine_job = None
+        if st.session_state.coarse_result:
+            import matplotlib.pyplot as plt
+
+            coarse = st.session_state.coarse_result
+            fine = st.session_state.fine_result
+            st.subheader("Progressive Run")
+            columns = st.columns(3)
+            for column, name in zip(columns, ("Cl", "Cd", "Cm")):
+                if fine:
+                    column.metric(name, f"{fine[name]:.4f}", f"{fine[name] - coarse[name]:+.4f} vs coarse", delta_color="off")
+                else:
+                    column.metric(f"{name} (coarse)", f"{coarse[name]:.4f}")
+            if fine:
+                st.caption(f"Production mesh: {fine['cells']} cells; coarse mesh: {coarse['cells']} cells.")
+            else:
+                st.caption(f"Approximate solution on the coarse mesh ({coarse['cells']} cells).")
                 try:
-                    mesh =  run_openfoam_meshing("./cfd")
-                    print(mesh)
-                    if mesh:
-                        st.success(f"Mesh was generated successfully")
-                        st.session_state.meshing = True # Set flag
-                    else:
-                        st.error("Failed to generate the mesh file, check the terminal for details.")
-                        st.session_state.meshing = False
+                    fig = create_field_plot(coarse['fields'], st.session_state.interpolated_coords)
+                    st.pyplot(fig)
+                    plt.close(fig)
                 except Exception as e:
-                    st.error(f"An error occurred during meshing: {e}")
-                    st.session_state.meshing = False
+                    st.error(f"Error displaying the coarse fields: {e}")
+        if fine_job is not None:
+            animation_dir = os.path.join(st.session_state.workspace, "Run", "animations")
+            job_status_panel(fine_job.id, "Refinement pass",
+                             preview_images=[preview_path(animation_dir, field) for field in ANIMATION_FIELDS])
         if st.session_state.meshing:
                         st.subheader("Airfoil Mesh Preview")
-                        vtk_path = "cfd/Mesh/VTK/Mesh_0.vtk"
-                        if os.path.exists(vtk_path):
+                        mesh_case = os.path.join(st.session_state.workspace, "Mesh")
+                        if os.path.exists(os.path.join(mesh_case, "constant", "polyMesh", "owner")):
                             try:
-                                vtk_to_png_surface_wireframe(vtk_path)
-                                # Assuming vtk_to_png_surface_wireframe saves to "mesh_preview.png"
-                                st.image("cfd/Mesh/VTK/Mesh_0_wireframe.png", caption="Generated Airfoil Mesh")
+                                wireframe_path = vtk_to_png_surface_wireframe(mesh_case)
+                                st.image(wireframe_path, caption="Generated Airfoil Mesh")
                             except Exception as e:
                                 st.error(f"Error displaying mesh preview: {e}")
+                            mesh_quality = read_mesh_quality(mesh_case)
+                            if mesh_quality:
+                                st.caption(f"Mesh quality: {describe_quality(mesh_quality)}.")
                         else:
-                            st.warning("VTK mesh file not found for preview. Meshing might have failed or not completed properly.")
+                            st.warning("Mesh not found for preview. Meshing might have failed or not completed properly.")
 
         if st.session_state.meshing:
-            if st.button("⚙️ Run Simulation", help="Create Velocity vector and Pressure contour scences using the generated mesh and obtain the coefficient of Lift and coefficient of Drag."):
-                with st.spinner("Running the simulation...this may take a while longer."):
-                    try:
-                        solution_run =  run_openfoam_simulation("./cfd")
-                        print(solution_run)
-                        if solution_run:
-                            st.success(f"Solutions were generated successfully")
-                            st.session_state.running = True # Set flag
-                        else:
-                            st.error("Failed to solve, check the terminal for details.")
-                            st.session_state.running = False
-                    except Exception as e:
-                        st.error(f"An error occurred during solution run: {e}")
+            run_job_active = st.session_state.run_job is not None
+            if st.button("⚙️ Run Simulation", help="Create Velocity vector and Pressure contour scences using the generated mesh and obtain the coefficient of Lift and coefficient of Drag.", disabled=run_job_active or mesh_job_active or progressive_active):
+                st.session_state.run_job = submit_job("simulation", run_openfoam_simulation, st.session_state.workspace, convergence=convergence_settings, parallel=run_parallel, warm_start=warm_start)
+                st.session_state.running = False
+            if st.session_state.run_job is not None:
+                run_job = get_job(st.session_state.run_job)
+                if run_job is None:
+                    st.error("The simulation job was lost (the server may have restarted), please run the simulation again.")
+                    st.session_state.run_job = None
+                elif not run_job.finished:
+                    animation_dir = os.path.join(st.session_state.workspace, "Run", "animations")
+                    job_status_panel(run_job.id, "Simulation",
+                                     preview_images=[preview_path(animation_dir, field) for field in ANIMATION_FIELDS])
+                else:
+                    if run_job.state == DONE and run_job.result:
+                        st.success(f"Solutions were generated successfully in {run_job.elapsed:.0f} s")
+                        st.session_state.running = True # Set flag
+                    elif run_job.state == DONE:
+                        st.error("Failed to solve, check the terminal for details.")
                         st.session_state.running = False
+                    else:
+                        st.error(f"An error occurred during solution run: {run_job.error}")
+                        st.session_state.running = False
+                    forget_job(run_job.id)
+                    st.session_state.run_job = None
             if st.session_state.running:
                 st.subheader("Airfoil Pressure & Velocity scences")
                 with st.spinner("Rendering Results...this may take a while longer."):
                     try:
-                        vtk_directory = './cfd/Run/VTK/'
-                        output_directory = './cfd/Run/animations/'
-                        fields_to_visualize = ['U', 'p']
-                        generate_vtk_animations(vtk_dir=vtk_directory, output_dir=output_directory, fields=fields_to_visualize)
-                        video_path = "./cfd/Run/animations/p_contour.mp4"
+                        run_case = os.path.join(st.session_state.workspace, "Run")
+                        output_directory = os.path.join(st.session_state.workspace, "Run", "animations")
+                        fields_to_visualize = ANIMATION_FIELDS
+                        run_key = read_case_key(run_case)
+                        animations_key = make_key("animations", run_key, fields_to_visualize) if run_key else None
+                        if animations_key is None or read_case_key(output_directory) != animations_key:
+                            if not restore(animations_key, st.session_state.workspace):
+                                generate_vtk_animations(case_dir=run_case, output_dir=output_directory, fields=fields_to_visualize)
+                                store(animations_key, st.session_state.workspace, stage_outputs(st.session_state.workspace, "animations"))
+                            write_case_key(output_directory, animations_key)
+                        video_path = os.path.join(output_directory, "p_contour.mp4")
                         play_video_on_streamlit(video_path,"Pressure Contour" )
-                        video_path = "./cfd/Run/animations/U_contour.mp4"
+                        video_path = os.path.join(output_directory, "U_contour.mp4")
                         play_video_on_streamlit(video_path,"Velocity vector" )
                     except Exception as e:
                         st.error(f"Error displaying mesh preview: {e}")
+
+            # --- Polar sweep ---
+            polar_job_active = st.session_state.polar_job is not None
+            if st.button("📈 Run Polar Sweep", help="Solve the airfoil at every angle of attack set in the sidebar, reusing the generated mesh, and plot Cl, Cd and Cm against the angle.", disabled=polar_job_active or mesh_job_active or progressive_active or not polar_alphas):
+                st.session_state.polar_job = submit_job("polar sweep", run_polar_sweep, st.session_state.workspace, polar_alphas, convergence=convergence_settings, parallel=run_parallel, warm_start=warm_start)
+                st.session_state.polar = None
+            if st.session_state.polar_job is not None:
+                polar_job = get_job(st.session_state.polar_job)
+                if polar_job is None:
+                    st.error("The polar sweep job was lost (the server may have restarted), please run the sweep again.")
+                    st.session_state.polar_job = None
+                elif not polar_job.finished:
+                    job_status_panel(polar_job.id, "Polar sweep")
+                else:
+                    if polar_job.state == DONE and polar_job.result:
+                        st.success(f"Polar sweep finished in {polar_job.elapsed:.0f} s")
+                        st.session_state.polar = polar_job.result
+                    elif polar_job.state == DONE:
+                        st.error("The polar sweep failed, check the terminal for details.")
+                    else:
+                        st.error(f"An error occurred during the polar sweep: {polar_job.error}")
+                    forget_job(polar_job.id)
+                    st.session_state.polar_job = None
+            if st.session_state.polar:
+                import matplotlib.pyplot as plt
+
+                st.subheader("Airfoil Polar")
+                failed = [row['alpha'] for row in st.session_state.polar if row['status'] != 'ok']
+                if failed:
+                    st.warning(f"No converged solution at {', '.join(f'{a:g}' for a in failed)} deg.")
+                st.dataframe(st.session_state.polar, hide_index=True)
+                fig = create_polar_plot(st.session_state.polar)
+                st.pyplot(fig)
+                plt.close(fig)
@@ -1,28 +1,76 @@
 import numpy as np
-from scipy.interpolate import splprep, splev
 import streamlit as st
-from shapely.geometry import LineString, Polygon
-import pyvista as pv
-pv.start_xvfb()
 import os
-import imageio
+from foam_reader import list_times
+from intersections import find_self_intersections
+from field_store import open_store
+from frame_renderer import open_video_writer, render_frames, video_path
+from render_server import get_render_server
 
 def convert_pixel_to_custom(px, py, cw, ch, x_min_val, x_max_val, y_min_val, y_max_val):
-    """Converts pixel coordinates to custom coordinates."""
+    """
+    Converts pixel coordinates to custom coordinates.
+
+    `px` and `py` may be scalars or arrays of any (matching) shape; arrays are transformed
+    in one call and scalars give back plain floats.
+    """
+    px = np.asarray(px, dtype=float)
+    py = np.asarray(py, dtype=float)
     custom_x = x_min_val + (px / cw) * (x_max_val - x_min_val)
     custom_y = y_min_val + (1 - py / ch) * (y_max_val - y_min_val) # Y-axis usually inverted in pixels
+    if custom_x.ndim == 0:
+        return float(custom_x), float(custom_y)
     return custom_x, custom_y
 
 def convert_custom_to_pixel(cx, cy, cw, ch, x_min_val, x_max_val, y_min_val, y_max_val):
-    """Converts custom coordinates to pixel coordinates for drawing on PIL image."""
+    """
+    Converts custom coordinates to pixel coordinates for drawing on PIL image.
+
+    `cx` and `cy` may be scalars or arrays of any (matching) shape. Pixels are truncated
+    towards zero like `int()`; arrays give back integer arrays and scalars plain ints.
+    """
+    cx = np.asarray(cx, dtype=float)
+    cy = np.asarray(cy, dtype=float)
     x_range = x_max_val - x_min_val
     y_range = y_max_val - y_min_val
 
     # Avoid division by zero if ranges are zero
-    px = int(((cx - x_min_val) / x_range) * cw) if x_range != 0 else 0
-    py = int(ch - ((cy - y_min_val) / y_range) * ch) if y_range != 0 else 0 # Y-axis usually inverted in pixels
+    px = (((cx - x_min_val) / x_range) * cw).astype(int) if x_range != 0 else np.zeros(cx.shape, dtype=int)
+    py = (ch - ((cy - y_min_val) / y_range) * ch).astype(int) if y_range != 0 else np.zeros(cy.shape, dtype=int) # Y-axis usually inverted in pixels
+    if px.ndim == 0:
+        return int(px), int(py)
     return px, py
 
+ADAPTIVE_MIN_INTERVALS = 8 # Never fewer segments than this, even for nearly flat shapes
+ADAPTIVE_REFINE_PASSES = 12 # Bisection passes used to enforce the tolerance after the initial placement
+ADAPTIVE_CURVATURE_SAMPLES = 4096 # Parameter samples used to estimate the curvature
+
+def _fit_airfoil_spline(x, y, smoothness):
+    """
+    Fits the B-spline used by the interpolation functions.
+
+    Returns:
+        tuple: (tck, u) as returned by `splprep`, or None (after warning) if there are too
+               few points for a spline.
+    """
+    if len(x) < 4: # Need at least 4 points for a cubic spline (k=3)
+        st.warning("Not enough points for a smooth spline. Need at least 4 points for cubic spline. Plotting direct lines instead.")
+        return None
+
+    # Fit the B-spline to the original set of points.
+    # The degree k must be <= m-1 where m is the number of data points.
+    # For a cubic spline, k=3. Ensure k does not exceed number of points - 1.
+    k_val = min(3, len(x) - 1)
+
+    if k_val < 1: # Cannot create a spline with less than 2 points for k=1, or 4 for k=3
+        st.warning(f"Not enough points ({len(x)}) for a B-spline of degree {k_val}. Plotting direct lines.")
+        return None
+
+    # scipy is only imported once a shape is interpolated, to keep app start-up fast
+    from scipy.interpolate import splprep
+
+    return splprep([x, y], s=smoothness, k=k_val)
+
 def interpolate_airfoil_and_close(x, y, num_points=500, smoothness=0.0001):
     """
     Interpolates airfoil points using a B-spline and then explicitly closes the curve.
@@ -37,20 +85,12 @@ def interpolate_airfoil_and_close(x, y, num_points=500, smoothness=0.0001):
     Returns:
         tuple: (x_interp_closed, y_interp_closed) interpolated coordinates of the closed curve.
     """
-    if len(x) < 4: # Need at least 4 points for a cubic spline (k=3)
-        st.warning("Not enough points for a smooth spline. Need at least 4 points for cubic spline. Plotting direct lines instead.")
+    fit = _fit_airfoil_spline(x, y, smoothness)
+    if fit is None:
         return np.array(x), np.array(y) # Return original points if not enough for spline
+    tck, u = fit
 
-    # Fit the B-spline to the original set of points.
-    # The degree k must be <= m-1 where m is the number of data points.
-    # For a cubic spline, k=3. Ensure k does not exceed number of points - 1.
-    k_val = min(3, len(x) - 1)
-
-    if k_val < 1: # Cannot create a spline with less than 2 points for k=1, or 4 for k=3
-        st.warning(f"Not enough points ({len(x)}) for a B-spline of degree {k_val}. Plotting direct lines.")
-        return np.array(x), np.array(y)
-
-    tck, u = splprep([x, y], s=smoothness, k=k_val)
+    from scipy.interpolate import splev
 
     # Generate new parameter values to create a high-resolution curve
     u_new = np.linspace(u.min(), u.max(), num_points)
@@ -62,48 +102,162 @@ def interpolate_airfoil_and_close(x, y, num_points=500, smoothness=0.0001):
 
     return x_interp_closed, y_interp_closed
 
-def check_airfoil_overlap(interpolated_x, interpolated_y):
+def _chordal_deviation(tck, u_start, u_end):
+    """
+    Largest distance between the spline and the chords joining consecutive samples.
+
+    Measured at the eighths of the parameter range of each interval.
+
+    Returns:
+        np.ndarray: One deviation per interval.
+    """
+    from scipy.interpolate import splev
+
+    ax, ay = splev(u_start, tck)
+    bx, by = splev(u_end, tck)
+    cx, cy = bx - ax, by - ay
+    length = np.hypot(cx, cy)
+    deviation = np.zeros(len(u_start))
+    for fraction in np.arange(1, 8) / 8:
+        px, py = splev(u_start + fraction * (u_end - u_start), tck)
+        # Distance to the chord line, or to its start point for a degenerate chord
+        with np.errstate(divide='ignore', invalid='ignore'):
+            distance = np.where(length > 0, np.abs(cx * (py - ay) - cy * (px - ax)) / length,
+                                np.hypot(px - ax, py - ay))
+        deviation = np.maximum(deviation, distance)
+    return deviation
+
+def adaptive_spline_parameters(tck, tolerance, max_points=2000, u_min=0.0, u_max=1.0):
+    """
+    Chooses spline parameters so that the polyline through them stays within `tolerance`
+    of the spline, using as few points as possible.
+
+    Points are first placed by equidistributing sqrt(curvature) along the arc length: an
+    arc of radius R deviates from a chord of length h by about h^2 / (8 R), so the spacing
+    that just meets the tolerance is sqrt(8 R tolerance). Intervals that still exceed the
+    tolerance (e.g. where the curvature estimate is too coarse) are then bisected.
+
+    Args:
+        tck (tuple): Spline representation from `splprep`.
+        tolerance (float): Maximum chordal deviation, in the units of the coordinates.
+        max_points (int): Upper bound on the number of parameters returned.
+        u_min (float): First parameter of the curve.
+        u_max (float): Last parameter of the curve.
+
+    Returns:
+        tuple: (u, within_tolerance) - increasing parameter values including both ends, and
+               whether every interval meets the tolerance (False if `max_points` or the
+               bisection passes ran out first).
+    """
+    from scipy.interpolate import splev
+
+    if tolerance <= 0:
+        raise ValueError("The chordal deviation tolerance must be positive.")
+
+    dense = np.linspace(u_min, u_max, ADAPTIVE_CURVATURE_SAMPLES)
+    dx, dy = splev(dense, tck, der=1)
+    ddx, ddy = splev(dense, tck, der=2)
+    speed = np.hypot(dx, dy)
+    # Points per unit parameter: sqrt(kappa / (8 tol)) per unit length, times ds/du
+    with np.errstate(divide='ignore', invalid='ignore'):
+        density = np.sqrt(np.abs(dx * ddy - dy * ddx) / (8 * tolerance * speed))
+    density = np.nan_to_num(density, nan=0.0, posinf=0.0)
+    cumulative = np.concatenate([[0.0], np.cumsum(0.5 * (density[1:] + density[:-1]) * np.diff(dense))])
+
+    n_intervals = int(np.clip(np.ceil(cumulative[-1]), ADAPTIVE_MIN_INTERVALS, max_points - 1))
+    if cumulative[-1] > 0:
+        u_new = np.interp(np.linspace(0, cumulative[-1], n_intervals + 1), cumulative, dense)
+    else:
+        u_new = np.linspace(u_min, u_max, n_intervals + 1)
+
+    too_far = _chordal_deviation(tck, u_new[:-1], u_new[1:]) > tolerance
+    for _ in range(ADAPTIVE_REFINE_PASSES):
+        room = max_points - len(u_new)
+        if not too_far.any() or room <= 0:
+            break
+        split = np.flatnonzero(too_far)[:room]
+        u_new = np.insert(u_new, split + 1, 0.5 * (u_new[split] + u_new[split + 1]))
+        too_far = _chordal_deviation(tck, u_new[:-1], u_new[1:]) > tolerance
+    return u_new, not too_far.any()
+
+def interpolate_airfoil_adaptive(x, y, tolerance=1e-4, smoothness=0.0001, max_points=2000):
+    """
+    Interpolates airfoil points using a B-spline, sampled adaptively, and closes the curve.
+
+    Unlike `interpolate_airfoil_and_close`, which samples the spline uniformly in its
+    parameter, points are concentrated where the curvature is high (leading edge) and
+    spread out on flat stretches, so the shape meets a chordal-deviation tolerance with
+    far fewer points (and STL triangles).
+
+    Args:
+        x (np.array): X coordinates of the original points.
+        y (np.array): Y coordinates of the original points.
+        tolerance (float): Maximum distance between the spline and the sampled polyline.
+        smoothness (float): Smoothing factor for the spline.
+                            Higher values mean more smoothing.
+        max_points (int): Upper bound on the number of interpolated points; a warning is
+                          shown if the tolerance cannot be met within it.
+
+    Returns:
+        tuple: (x_interp_closed, y_interp_closed) interpolated coordinates of the closed curve.
+    """
+    fit = _fit_airfoil_spline(x, y, smoothness)
+    if fit is None:
+        return np.array(x), np.array(y)
+    tck, u = fit
+
+    from scipy.interpolate import splev
+
+    u_new, within_tolerance = adaptive_spline_parameters(tck, tolerance, max_points=max_points, u_min=u.min(), u_max=u.max())
+    if not within_tolerance:
+        st.warning(f"Adaptive resampling stopped at {len(u_new)} points (at most {max_points}) with parts of the "
+                   f"curve still farther than {tolerance:g} from the spline. Raise the Chordal Tolerance for fewer points.")
+    x_interp, y_interp = splev(u_new, tck)
+
+    x_interp_closed = np.append(x_interp, x_interp[0])
+    y_interp_closed = np.append(y_interp, y_interp[0])
+
+    return x_interp_closed, y_interp_closed
+
+def check_airfoil_overlap(interpolated_x, interpolated_y, checker=None):
     """
     Checks if the interpolated airfoil curve self-intersects.
 
     Args:
         interpolated_x (np.ndarray): X coordinates of the interpolated curve.
         interpolated_y (np.ndarray): Y coordinates of the interpolated curve.
+        checker (IntersectionChecker): Checker kept between reruns (e.g. in the session state)
+                                       so unchanged parts of the curve are not tested again.
 
     Returns:
-        tuple: (bool, str) - True if overlap detected, False otherwise.
-                           - A descriptive message.
+        tuple: (bool, str, np.ndarray) - True if overlap detected, False otherwise.
+                                       - A descriptive message.
+                                       - (k, 2) indices of the intersecting segments; segment
+                                         i joins point i and point i + 1.
     """
+    no_segments = np.empty((0, 2), dtype=int)
     if len(interpolated_x) < 3:
-        return False, "Not enough points for overlap check." # Cannot form a polygon
-
-    # Convert coordinates to a list of (x, y) tuples
-    coords = list(zip(interpolated_x, interpolated_y))
+        return False, "Not enough points for overlap check.", no_segments # Cannot form a polygon
 
+    x = np.asarray(interpolated_x, dtype=float)
+    y = np.asarray(interpolated_y, dtype=float)
     try:
-        # Create a LineString from the points
-        line = LineString(coords)
+        segments = checker.check(x, y) if checker is not None else find_self_intersections(x, y)
+        if len(segments):
+            i, j = segments[0]
+            return True, (f"The interpolated curve self-intersects (crosses itself): {len(segments)} "
+                          f"intersecting segment pair(s), first between segments {i} and {j}."), segments
 
-        # A simple check for LineString self-intersection
-        if not line.is_simple:
-            return True, "The interpolated curve self-intersects (crosses itself)."
+        # Shoelace area; zero if points are collinear or duplicate
+        area = 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+        if area == 0:
+            return True, "The airfoil has zero area (points are collinear or degenerate).", no_segments
 
-        # More robust check by attempting to create a Polygon.
-        # A non-valid polygon indicates self-intersection, rings not closed, etc.
-        # `is_valid` checks for topological correctness.
-        polygon = Polygon(coords)
-        if not polygon.is_valid:
-            return True, "The interpolated curve forms an invalid polygon (likely self-intersecting or malformed)."
-
-        # Check for zero area, which might happen if points are collinear or duplicate
-        if polygon.area == 0:
-            return True, "The airfoil has zero area (points are collinear or degenerate)."
-
-        return False, "No overlap detected. The airfoil shape is valid."
+        return False, "No overlap detected. The airfoil shape is valid.", no_segments
 
     except Exception as e:
-        # Catch potential errors from Shapely for very degenerate cases
-        return True, f"An error occurred during overlap check: {e}"
+        # Catch potential errors for very degenerate cases (e.g. NaN coordinates)
+        return True, f"An error occurred during overlap check: {e}", no_segments
 
 
 def vtk_to_png_surface_wireframe(vtk_file_path, output_image_path=None,
@@ -116,7 +270,8 @@ def vtk_to_png_surface_wireframe(vtk_file_path, output_image_path=None,
     Renders a zoomed-in 2D orthographic image of the airfoil geometry from a 3D mesh.
 
     Parameters:
-        vtk_file_path (str): Path to the VTK mesh file.
+        vtk_file_path (str): Path to a VTK mesh file, or to an OpenFOAM case directory whose
+                             constant/polyMesh is read directly.
         output_image_path (str): Output image file path. If None, autogenerated.
         line_color (str): Color of wireframe edges.
         line_width (float): Width of mesh edges.
@@ -129,135 +284,61 @@ def vtk_to_png_surface_wireframe(vtk_file_path, output_image_path=None,
         str: Path to saved PNG image.
     """
 
-    # Load mesh
-    mesh = pv.read(vtk_file_path)
-
-    # Extract the nearly-flat 2D slice where airfoil lies (assumes in XY plane)
-    z_vals = mesh.points[:, 2]
-    flat_mask = (z_vals >= z_vals.min() - z_tolerance) & (z_vals <= z_vals.min() + z_tolerance)
-    flat_mesh = mesh.extract_points(flat_mask, adjacent_cells=True)
-
-    if flat_mesh.n_points == 0:
-        raise ValueError("No nearly-2D region found — check z_tolerance or mesh orientation.")
-
-    # Expand bounds a bit to give margin in the plot
-    bounds = list(flat_mesh.bounds)  # (xmin, xmax, ymin, ymax, zmin, zmax)
-    x_margin = (bounds[1] - bounds[0]) * bounds_margin
-    y_margin = (bounds[3] - bounds[2]) * bounds_margin
-    cropped = flat_mesh.clip_box([  # crop tightly around airfoil
-        bounds[0] - x_margin, bounds[1] + x_margin,
-        bounds[2] - y_margin, bounds[3] + y_margin,
-        bounds[4], bounds[5]
-    ], invert=False)
-
-    # Set up 2D orthographic plot
-    plotter = pv.Plotter(off_screen=True, window_size=window_size)
-    plotter.add_mesh(cropped, color=mesh_color, show_edges=True,
-                     edge_color=line_color, line_width=line_width, lighting=False)
-
-    plotter.view_xy()
-    plotter.enable_parallel_projection()
-    plotter.reset_camera()
-    plotter.camera.zoom(25)
-    shift_amount = 4.5
-    camera = plotter.camera
-    camera.position = [camera.position[0] - shift_amount, camera.position[1], camera.position[2]]
-    camera.focal_point = [camera.focal_point[0] - shift_amount, camera.focal_point[1], camera.focal_point[2]]
-    # Output filename
-    if output_image_path is None:
-        output_image_path = os.path.splitext(vtk_file_path)[0] + '_wireframe.png'
-
-    plotter.show(screenshot=output_image_path)
-    plotter.close()
-
-    return output_image_path
-
-def generate_vtk_animations(vtk_dir='./VTK/', output_dir='./animations/', fields=['U', 'p']):
+    # Rendered by the persistent render server, which keeps its plotter warm between previews
+    return get_render_server().request(
+        "preview", mesh_path=vtk_file_path, output_image_path=output_image_path,
+        line_color=line_color, line_width=line_width, mesh_color=mesh_color,
+        bounds_margin=bounds_margin, z_tolerance=z_tolerance, window_size=tuple(window_size))
+
+def generate_vtk_animations(case_dir='./', output_dir='./animations/', fields=['U', 'p'], save_frames=False):
     """
-    Generates animations from VTK files, visualizing specified scalar fields
-    and optionally vector fields (for 'U').
+    Generates animations from the time directories of an OpenFOAM case, visualizing specified
+    scalar fields and optionally vector fields (for 'U').
+
+    Frames are rendered in parallel by `frame_renderer.render_frames`; each time step is
+    read (from the binary field store when available) and sliced once for all fields.
+    Rendered frames are streamed straight into one ffmpeg writer per field, so memory use
+    is constant in the number of time steps.
 
     Args:
-        vtk_dir (str): Directory containing VTK files.
-        output_dir (str): Directory to save animation frames and final videos.
+        case_dir (str): OpenFOAM case directory containing constant/polyMesh and the time directories.
+        output_dir (str): Directory to save the videos to.
         fields (list): List of scalar field names to visualize (e.g., ['U', 'p']).
                        For 'U', if it's a 3-component vector, glyphs will be added.
+        save_frames (bool): Also write every frame as a PNG into '<output_dir>/frames' (debugging).
     """
 
-    frame_dir = os.path.join(output_dir, 'frames')
-    os.makedirs(frame_dir, exist_ok=True)
-
-    vtk_files = sorted([f for f in os.listdir(vtk_dir)
-                         if f.startswith('Run_') and f.endswith('.vtk')])
-
-    if not vtk_files:
-        raise RuntimeError(f"No VTK files found in {vtk_dir} matching 'Run_*.vtk'")
-
-    print(f"Found {len(vtk_files)} VTK files.")
-
-    def plot_and_save(vtk_file, output_name, scalar_field):
-        mesh = pv.read(os.path.join(vtk_dir, vtk_file))
-        print(f"Processing {vtk_file}, available fields: {mesh.array_names}")
-
-        if scalar_field not in mesh.array_names:
-            raise ValueError(f"Field '{scalar_field}' not found in {vtk_file}. Available fields: {mesh.array_names}")
-
-        # Handle 2D slicing for 3D meshes or use mesh directly for 2D
-        if mesh.n_points > 2 :  # Check if it's a 3D mesh
-            slice_mesh = mesh.slice(normal='z')
-        else:
-            slice_mesh = mesh
-
-        plotter = pv.Plotter(off_screen=True, window_size=[1920, 1088])
-        plotter.add_mesh(slice_mesh, scalars=scalar_field, cmap='jet')
-        plotter.add_scalar_bar(title=scalar_field)
-        plotter.view_xy()
-
-        if scalar_field == 'U':
-            U_array = mesh["U"]
-            if U_array.ndim == 2 and U_array.shape[1] == 3:  # Check if it's a 3D vector field
-                mesh["vectors"] = U_array
-                glyphs = mesh.glyph(orient='vectors', scale=True, factor=0.05)
-                plotter.add_mesh(glyphs, cmap='jet', show_scalar_bar=False)
-
-        # Define custom camera bounds
-        corner1 = (-0.1, -0.1)
-        corner2 = (4, 0.1)
-        xmin = min(corner1[0], corner2[0])
-        xmax = max(corner1[0], corner2[0])
-        ymin = min(corner1[1], corner2[1])
-        ymax = max(corner1[1], corner2[1])
-        zmin, zmax = 0, 0  # For 2D plane or small thickness
-        bounds = [xmin, xmax, ymin, ymax, zmin, zmax]
-
-        plotter.reset_camera(bounds=bounds)
-        plotter.camera.zoom(1.7)
-        plotter.show()  # This might not be needed for off_screen=True, but doesn't hurt.
-        plotter.screenshot(os.path.join(frame_dir, output_name))
-        plotter.close()
+    os.makedirs(output_dir, exist_ok=True)
+    frame_dir = os.path.join(output_dir, 'frames') if save_frames else None
+    if frame_dir and os.path.isdir(frame_dir):
+        # Frames of a previous (possibly longer) run would be mixed with the new ones
+        for f in os.listdir(frame_dir):
+            if f.endswith('.png'):
+                os.remove(os.path.join(frame_dir, f))
+
+    store = open_store(case_dir)
+    times = store.times if store is not None else list_times(case_dir)
+
+    if not times:
+        raise RuntimeError(f"No time directories found in {case_dir}")
+
+    print(f"Found {len(times)} time directories.")
+    writers = {}
+    try:
+        for index, time, images in render_frames(case_dir, fields, times=times, frame_dir=frame_dir):
+            for field, image in images.items():
+                if field not in writers:
+                    writers[field] = open_video_writer(output_dir, field)
+                writers[field].append_data(image)
+    finally:
+        for writer in writers.values():
+            writer.close()
 
     for field in fields:
-        for i, vtk_file in enumerate(vtk_files):
-            filename = f'{field}_frame_{i:04d}.png'
-            try:
-                plot_and_save(vtk_file, filename, field)
-            except ValueError as e:
-                print(e)
-                break
-
-        png_files = sorted([f for f in os.listdir(frame_dir) if f.startswith(field + '_frame_') and f.endswith('.png')])
-        if not png_files:
+        if field not in writers:
             print(f"No frames generated for field '{field}'. Skipping video creation.")
             continue
-
-        images = []
-        for png in png_files:
-            img_path = os.path.join(frame_dir, png)
-            images.append(imageio.imread(img_path))
-
-        video_path = os.path.join(output_dir, f'{field}_contour.mp4')
-        imageio.mimsave(video_path, images, fps=10)
-        print(f"Animation saved to {video_path}")
+        print(f"Animation saved to {video_path(output_dir, field)}")
 
 def play_video_on_streamlit(video_path: str, title: str = None):
     """
@@ -0,0 +1,293 @@
+import os
+import re
+import shutil
+import uuid
+
+import numpy as np
+
+from foam_reader import list_times, read_field, read_polymesh
+from pipeline_cache import CACHE_DIR, lookup, make_key, store
+from stl_builder import STL_HEADER_SIZE, STL_RECORD
+
+# Name of the file, inside a case, holding the final fields of a run at its cell centres.
+SEED_FILE = "warmStart.npz"
+# Directory, inside the cache directory, holding one small record per stored seed.
+INDEX_DIR = "warm_start"
+# Fields mapped onto the new mesh; the boundary conditions of 0.org are kept.
+SEED_FIELDS = ('U', 'p', 'k', 'omega', 'nut')
+
+# A seed is used if its mean outline distance plus ALPHA_WEIGHT per degree of angle of
+# attack difference stays below MAX_SCORE (both in chord lengths).
+MAX_SCORE = 0.02
+ALPHA_WEIGHT = 0.002
+# Source cells blended (inverse distance weighted) into every new cell.
+NEIGHBOURS = 4
+
+_UNIFORM_FIELD_RE = re.compile(r"internalField\s+uniform\s+([^;]*);")
+
+
+def outline_signature(stl_path):
+    """
+    Returns the airfoil outline of a binary STL written by `stl_builder`.
+
+    Args:
+        stl_path (str): Path of the extruded airfoil STL.
+
+    Returns:
+        np.ndarray or None: (n, 2) distinct x-y points of the top cap, None if the STL
+                            cannot be read.
+    """
+    try:
+        with open(stl_path, "rb") as f:
+            data = f.read()
+        count = int(np.frombuffer(data, dtype="<u4", count=1, offset=STL_HEADER_SIZE)[0])
+        records = np.frombuffer(data, dtype=STL_RECORD, count=count, offset=STL_HEADER_SIZE + 4)
+    except (OSError, ValueError, IndexError):
+        return None
+    vertices = records["vertices"].reshape(-1, 3)
+    top = vertices[vertices[:, 2] > 0, :2]
+    return np.unique(top.astype(np.float64), axis=0) if len(top) else None
+
+
+def shape_distance(a, b):
+    """Symmetric mean distance between two outlines given as (n, 2) point clouds."""
+    from scipy.spatial import cKDTree
+
+    return 0.5 * (cKDTree(b).query(a)[0].mean() + cKDTree(a).query(b)[0].mean())
+
+
+def cell_centres(mesh):
+    """
+    Returns the cell centres of a mesh as the mean of each cell's distinct points.
+
+    Args:
+        mesh (dict): Mesh arrays as returned by `foam_reader.read_polymesh`.
+
+    Returns:
+        np.ndarray: (n_cells, 3) array.
+    """
+    face_sizes = np.asarray(mesh['face_sizes'])
+    points = np.asarray(mesh['points'])
+    # The flat face list is size-prefixed: drop the prefixes to get the point labels
+    starts = np.cumsum(face_sizes + 1) - face_sizes
+    labels = np.delete(np.asarray(mesh['faces']), starts - 1).astype(np.int64)
+    owner, neighbour = np.asarray(mesh['owner']), np.asarray(mesh['neighbour'])
+
+    # Every (cell, point) pair once: a point is shared by several faces of the same cell
+    n_points = len(points)
+    cells = np.concatenate([np.repeat(owner, face_sizes),
+                            np.repeat(neighbour, face_sizes[:len(neighbour)])]).astype(np.int64)
+    pairs = np.unique(cells * n_points + np.concatenate([labels, labels[:face_sizes[:len(neighbour)].sum()]]))
+    cells, labels = np.divmod(pairs, n_points)
+
+    n_cells = mesh['n_cells']
+    counts = np.bincount(cells, minlength=n_cells)
+    return np.column_stack([np.bincount(cells, points[labels, axis], n_cells) for axis in range(3)]) / counts[:, None]
+
+
+def iterations_run(case_dir):
+    """Number of iterations of the latest time directory of a steady run (0 if none)."""
+    times = list_times(case_dir, include_zero=False)
+    return int(round(float(times[-1]))) if times else 0
+
+
+def _record_path(seed_key, cache_dir):
+    return os.path.join(cache_dir, INDEX_DIR, f"{seed_key}.npz")
+
+
+def _save_npz(destination, **arrays):
+    """Writes an .npz file atomically."""
+    tmp_path = f"{destination}.{uuid.uuid4().hex}.tmp.npz"
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, destination)
+
+
+def record_seed(workspace, case_dir, solution_key, stl_path, alpha=0.0, source=None, cache_dir=CACHE_DIR):
+    """
+    Stores the final fields of a finished run as a seed for later warm starts.
+
+    The seed itself is a cache entry, so it is evicted with the rest of the cache; the small
+    index record next to it keeps the outline, angle of attack and iteration count used to
+    pick seeds and to measure what warm starts save.
+
+    Args:
+        workspace (str): Case workspace `case_dir` lies in.
+        case_dir (str): Case directory of the finished run.
+        solution_key (str): Cache key of the run's solution; no seed is kept without one.
+        stl_path (str): STL the case was meshed from.
+        alpha (float): Angle of attack of the case in degrees.
+        source (dict): The seed record the run was warm-started from, if any.
+
+    Returns:
+        int: Number of iterations the run took.
+    """
+    iterations = iterations_run(case_dir)
+    outline = outline_signature(stl_path)
+    if solution_key is None or outline is None or not iterations:
+        return iterations
+
+    times = list_times(case_dir, include_zero=False)
+    mesh = read_polymesh(os.path.join(case_dir, "constant", "polyMesh"))
+    fields = {}
+    for name in SEED_FIELDS:
+        path = os.path.join(case_dir, times[-1], name)
+        if os.path.exists(path) or os.path.exists(path + ".gz"):
+            fields[name] = read_field(path, mesh['n_cells']).astype(np.float32)
+    _save_npz(os.path.join(case_dir, SEED_FILE), centres=cell_centres(mesh)[:, :2].astype(np.float32), **fields)
+
+    seed_key = make_key("warm_start", solution_key)
+    rel_path = os.path.relpath(os.path.join(case_dir, SEED_FILE), workspace)
+    store(seed_key, workspace, [rel_path], cache_dir=cache_dir)
+    os.makedirs(os.path.join(cache_dir, INDEX_DIR), exist_ok=True)
+    _save_npz(_record_path(seed_key, cache_dir), outline=outline, alpha=float(alpha), iterations=iterations,
+              path=rel_path, source=source["key"] if source else "",
+              source_iterations=source["iterations"] if source else 0)
+    return iterations
+
+
+def _read_records(cache_dir):
+    """Yields the index records whose seed is still in the cache, pruning the others."""
+    index_dir = os.path.join(cache_dir, INDEX_DIR)
+    if not os.path.isdir(index_dir):
+        return
+    for name in os.listdir(index_dir):
+        if not name.endswith(".npz") or ".tmp" in name:
+            continue
+        seed_key = name[:-len(".npz")]
+        record_path = os.path.join(index_dir, name)
+        if lookup(seed_key, cache_dir, touch=False) is None:
+            try:
+                os.remove(record_path)
+            except OSError:
+                pass
+            continue
+        try:
+            with np.load(record_path) as data:
+                record = {key: data[key] for key in data.files}
+        except (OSError, ValueError):
+            continue
+        yield {
+            "key": seed_key,
+            "outline": record["outline"],
+            "alpha": float(record["alpha"]),
+            "iterations": int(record["iterations"]),
+            "path": str(record["path"]),
+            "source": str(record["source"]),
+            "source_iterations": int(record["source_iterations"]),
+        }
+
+
+def find_seed(stl_path, alpha=0.0, cache_dir=CACHE_DIR):
+    """
+    Picks the stored seed closest to a case: same or similar outline, nearby angle of attack.
+
+    Returns:
+        dict or None: The seed record with its 'score' (chord lengths), or None if no
+                      seed is within `MAX_SCORE`.
+    """
+    outline = outline_signature(stl_path)
+    if outline is None:
+        return None
+    best = None
+    for record in _read_records(cache_dir):
+        score = shape_distance(outline, record["outline"]) + ALPHA_WEIGHT * abs(alpha - record["alpha"])
+        if score <= MAX_SCORE and (best is None or score < best["score"]):
+            best = dict(record, score=score)
+    return best
+
+
+def _format_values(values):
+    if values.ndim == 1:
+        return "\n".join(f"{v:.6g}" for v in values)
+    return "\n".join(f"({u:.6g} {v:.6g} {w:.6g})" for u, v, w in values)
+
+
+def write_initial_field(template, output, values):
+    """
+    Writes a 0/ field file from its 0.org template with a nonuniform internalField.
+
+    References to `$internalField` in the boundary conditions are replaced by the
+    template's uniform value, so inlet and outlet values stay the freestream.
+
+    Args:
+        template (str): Field file in 0.org.
+        output (str): Field file to write in 0.
+        values (np.ndarray): (n_cells,) or (n_cells, 3) internal field.
+    """
+    with open(template) as f:
+        text = f.read()
+    match = _UNIFORM_FIELD_RE.search(text)
+    if match is None:
+        raise RuntimeError(f"No uniform internalField in {template}")
+    kind = "scalar" if values.ndim == 1 else "vector"
+    internal = f"internalField   nonuniform List<{kind}>\n{len(values)}\n(\n{_format_values(values)}\n)\n;"
+    text = text[:match.start()] + internal + text[match.end():].replace("$internalField", f"uniform {match.group(1).strip()}")
+    with open(output, "w") as f:
+        f.write(text)
+
+
+def map_seed(seed, case_dir, alpha=0.0, cache_dir=CACHE_DIR):
+    """
+    Initialises the 0/ directory of a case from a stored seed.
+
+    Every field of the seed is interpolated onto the case's mesh by inverse distance
+    weighting of the `NEIGHBOURS` nearest source cell centres (in the x-y plane of the 2D
+    case). The velocity is rotated by the difference in angle of attack. Fields missing
+    from the seed are copied from 0.org unchanged.
+
+    Args:
+        seed (dict): Record returned by `find_seed`.
+        case_dir (str): Case directory whose constant/polyMesh already holds the final mesh.
+        alpha (float): Angle of attack of the case in degrees.
+
+    Returns:
+        bool: False if the seed was evicted in the meantime and nothing was written.
+    """
+    from scipy.spatial import cKDTree
+
+    entry = lookup(seed["key"], cache_dir)
+    if entry is None:
+        return False
+    with np.load(os.path.join(entry, seed["path"])) as data:
+        source = {key: data[key].astype(np.float64) for key in data.files}
+
+    targets = cell_centres(read_polymesh(os.path.join(case_dir, "constant", "polyMesh")))[:, :2]
+    k = min(NEIGHBOURS, len(source["centres"]))
+    distances, indices = cKDTree(source["centres"]).query(targets, k=k)
+    distances, indices = distances.reshape(len(targets), k), indices.reshape(len(targets), k)
+    weights = 1.0 / np.maximum(distances, 1e-12)
+    weights /= weights.sum(axis=1, keepdims=True)
+
+    zero_dir = os.path.join(case_dir, "0")
+    shutil.rmtree(zero_dir, ignore_errors=True)
+    shutil.copytree(os.path.join(case_dir, "0.org"), zero_dir)
+    rotation = np.radians(alpha - seed["alpha"])
+    cos, sin = np.cos(rotation), np.sin(rotation)
+    for name in SEED_FIELDS:
+        if name not in source or not os.path.exists(os.path.join(zero_dir, name)):
+            continue
+        values = np.einsum("ck,ck...->c...", weights, source[name][indices])
+        if name == 'U':
+            values[:, 0], values[:, 1] = cos * values[:, 0] - sin * values[:, 1], sin * values[:, 0] + cos * values[:, 1]
+        write_initial_field(os.path.join(case_dir, "0.org", name), os.path.join(zero_dir, name), values)
+    return True
+
+
+def iteration_statistics(cache_dir=CACHE_DIR):
+    """
+    Summarises the iterations of the stored runs, cold vs. warm-started.
+
+    Returns:
+        dict: 'cold' and 'warm' run counts and mean iterations, and 'saved': the mean over
+              warm-started runs of (iterations of their source's run - their own iterations).
+    """
+    cold, warm, saved = [], [], []
+    for record in _read_records(cache_dir):
+        if record["source"]:
+            warm.append(record["iterations"])
+            saved.append(record["source_iterations"] - record["iterations"])
+        else:
+            cold.append(record["iterations"])
+    mean = lambda values: float(np.mean(values)) if values else float("nan")
+    return {"cold": len(cold), "cold_mean": mean(cold), "warm": len(warm), "warm_mean": mean(warm),
+            "saved": mean(saved)}
@@ -0,0 +1,138 @@
+import os
+import shutil
+import time
+import uuid
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Template cases every workspace is cloned from.
+TEMPLATE_DIR = os.path.join(SCRIPT_DIR, "cfd")
+# Kept next to the templates by default so immutable inputs can be hardlinked (same filesystem).
+WORKSPACE_ROOT = os.environ.get("AIRFOIL_WORKSPACE_ROOT", os.path.join(SCRIPT_DIR, "workspaces"))
+# Workspaces not used for this long are considered abandoned (Streamlit has no session-end hook).
+WORKSPACE_TTL = float(os.environ.get("AIRFOIL_WORKSPACE_TTL_HOURS", "12")) * 3600
+
+_ACTIVITY_MARKER = ".last_used"
+
+# How each template entry is cloned. Anything not listed (time directories, VTK output,
+# animations, generated meshes, ...) is a result of a previous run and is not cloned.
+#   'copy'  - small files the pipeline rewrites (dictionaries, scripts)
+#   'link'  - immutable inputs, hardlinked (or symlinked across filesystems)
+#   'mkdir' - empty directory the pipeline fills in
+_TEMPLATE_LAYOUT = {
+    "Mesh": [
+        ("Allrun", "copy"),
+        ("case.foam", "copy"),
+        ("system", "copy"),
+        ("constant/triSurface", "mkdir"),
+    ],
+    "Run": [
+        ("Allrun", "copy"),
+        ("Allclean", "copy"),
+        ("case.foam", "copy"),
+        ("system", "copy"),
+        ("0.org", "link"),
+        ("constant/transportProperties", "link"),
+        ("constant/turbulenceProperties", "link"),
+        ("0", "mkdir"),
+    ],
+}
+
+
+def _link_file(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        os.symlink(src, dst)
+
+
+def _clone_entry(src, dst, mode):
+    if mode == "mkdir":
+        os.makedirs(dst, exist_ok=True)
+        return
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if os.path.isdir(src):
+        copy_function = shutil.copy2 if mode == "copy" else _link_file
+        shutil.copytree(src, dst, copy_function=copy_function)
+    elif mode == "copy":
+        shutil.copy2(src, dst)
+    else:
+        _link_file(src, dst)
+
+
+def clone_cases(template_dir, destination):
+    """
+    Clones the template Mesh and Run cases into `destination` (see `_TEMPLATE_LAYOUT`).
+
+    Args:
+        template_dir (str): Directory holding the template Mesh and Run cases.
+        destination (str): Directory the Mesh and Run cases are created in.
+    """
+    for case, entries in _TEMPLATE_LAYOUT.items():
+        for entry, mode in entries:
+            src = os.path.join(template_dir, case, entry)
+            dst = os.path.join(destination, case, entry)
+            if mode != "mkdir" and not os.path.exists(src):
+                continue
+            _clone_entry(src, dst, mode)
+
+
+def create_workspace(template_dir=TEMPLATE_DIR, root=WORKSPACE_ROOT):
+    """
+    Creates an isolated case directory (Mesh and Run cases) cloned from the templates.
+
+    Dictionaries and scripts are copied since the pipeline rewrites them, immutable inputs
+    are hardlinked, and outputs of previous runs are left out, so creating a workspace is
+    cheap and N of them can run side by side on one host.
+
+    Args:
+        template_dir (str): Directory holding the template Mesh and Run cases.
+        root (str): Directory under which workspaces are created.
+
+    Returns:
+        str: Absolute path of the new workspace, usable as `case_path` for `cfd_runner`.
+    """
+    prune_workspaces(root)
+    workspace = os.path.join(root, uuid.uuid4().hex)
+    clone_cases(template_dir, workspace)
+    touch_workspace(workspace)
+    print(f"Created workspace {workspace}")
+    return workspace
+
+
+def touch_workspace(workspace):
+    """Marks a workspace as in use so that `prune_workspaces` keeps it."""
+    if not os.path.isdir(workspace):
+        return
+    with open(os.path.join(workspace, _ACTIVITY_MARKER), "w") as f:
+        f.write(str(time.time()))
+
+
+def remove_workspace(workspace):
+    """Deletes a workspace and everything the pipeline wrote into it."""
+    if workspace and os.path.isdir(workspace):
+        shutil.rmtree(workspace, ignore_errors=True)
+        print(f"Removed workspace {workspace}")
+
+
+def prune_workspaces(root=WORKSPACE_ROOT, max_age=WORKSPACE_TTL):
+    """
+    Removes workspaces that have not been used for `max_age` seconds.
+
+    Returns:
+        int: Number of workspaces removed.
+    """
+    if not os.path.isdir(root):
+        return 0
+    now = time.time()
+    removed = 0
+    for name in os.listdir(root):
+        workspace = os.path.join(root, name)
+        marker = os.path.join(workspace, _ACTIVITY_MARKER)
+        try:
+            last_used = os.path.getmtime(marker if os.path.exists(marker) else workspace)
+        except OSError:
+            continue
+        if now - last_used > max_age:
+            remove_workspace(workspace)
+            removed += 1
+    return removed
@@ -0,0 +1,27 @@
+import os
+import shutil
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+# Sample case shipped with the templates: a meshed and solved airfoil.
+SAMPLE_RUN = os.path.join(SRC_DIR, "cfd", "Run")
+# Last time directories of the sample case, enough for a short time series.
+SAMPLE_TIMES = ("460", "480", "500")
+
+sys.path.insert(0, SRC_DIR)
+
+
+def copy_sample_case(case_dir, times=SAMPLE_TIMES):
+    """Copies the mesh, 0.org and the given time directories of the sample case to `case_dir`."""
+    for name in (os.path.join("constant", "polyMesh"), "0.org") + tuple(times):
+        shutil.copytree(os.path.join(SAMPLE_RUN, name), os.path.join(case_dir, name))
+    return str(case_dir)
+
+
+def naca0012(points_per_side=80):
+    """NACA 0012 (closed trailing edge) in the order of the drawn curve: TE, upper, LE, lower, TE."""
+    import numpy as np
+
+    xc = 0.5 * (1 - np.cos(np.linspace(0, np.pi, points_per_side + 1)))
+    yt = 0.6 * (0.2969 * np.sqrt(xc) - 0.1260 * xc - 0.3516 * xc ** 2 + 0.2843 * xc ** 3 - 0.1036 * xc ** 4)
+    return np.concatenate([xc[::-1], xc[1:]]), np.concatenate([yt[::-1], -yt[1:]])
@@ -0,0 +1,158 @@
+import math
+
+from convergence import CONVERGED, DIVERGED, ConvergenceMonitor
+from log_parser import FoamLogParser
+
+# Two time steps of foamRun (incompressibleFluid, kOmegaSST) with forceCoeffs 'log true'
+FOAM_RUN_LOG = """\
+Starting time loop
+
+Time = 1s
+
+smoothSolver:  Solving for Ux, Initial residual = 1, Final residual = 0.0537214, No Iterations 2
+smoothSolver:  Solving for Uy, Initial residual = 1, Final residual = 0.0421785, No Iterations 2
+GAMG:  Solving for p, Initial residual = 1, Final residual = 0.00881524, No Iterations 11
+time step continuity errors : sum local = 1.20145, global = 0.0123011, cumulative = 0.0123011
+smoothSolver:  Solving for omega, Initial residual = 0.00315214, Final residual = 0.000124575, No Iterations 3
+bounding omega, min: -12.5 max: 45211.2 average: 88.2
+smoothSolver:  Solving for k, Initial residual = 1, Final residual = 0.0401265, No Iterations 2
+forceCoeffs forceCoeffs1 execute:
+    Cm    = 0.00123451
+    Cd    = 0.0345125
+    Cl    = 0.210147
+    Cl(f) = 0.106197
+    Cl(r) = 0.10395
+
+ExecutionTime = 0.12 s  ClockTime = 0 s
+
+Time = 2s
+
+smoothSolver:  Solving for Ux, Initial residual = 0.412563, Final residual = 0.0211245, No Iterations 2
+smoothSolver:  Solving for Uy, Initial residual = 0.385412, Final residual = 0.0195412, No Iterations 2
+GAMG:  Solving for p, Initial residual = 0.121457, Final residual = 0.00101245, No Iterations 7
+GAMG:  Solving for p, Initial residual = 0.0121457, Final residual = 0.000101245, No Iterations 7
+smoothSolver:  Solving for omega, Initial residual = 0.00210254, Final residual = 8.8452e-05, No Iterations 3
+smoothSolver:  Solving for k, Initial residual = 0.521412, Final residual = 0.0251245, No Iterations 2
+forceCoeffs forceCoeffs1 execute:
+    Cm    = 0.00133451
+    Cd    = 0.0312478
+    Cl    = 0.251247
+    Cl(f) = 0.126197
+    Cl(r) = 0.12505
+
+ExecutionTime = 0.2 s  ClockTime = 0 s
+
+End
+"""
+
+
+def _time_step(time, residual, cl, cd):
+    """One time step of foamRun output with every initial residual equal to `residual`."""
+    lines = [f"Time = {time}s", ""]
+    for field in ("Ux", "Uy", "p", "omega", "k"):
+        lines.append(f"smoothSolver:  Solving for {field}, Initial residual = {residual:g}, "
+                     f"Final residual = {residual / 10:g}, No Iterations 2")
+    lines += ["forceCoeffs forceCoeffs1 execute:", "    Cm    = 0.001", f"    Cd    = {cd!r}",
+              f"    Cl    = {cl!r}", "    Cl(f) = 0.1", "    Cl(r) = 0.1", "",
+              "ExecutionTime = 0.2 s  ClockTime = 0 s", ""]
+    return lines
+
+
+def _monitor_log(lines, **settings):
+    """Streams log lines through the parser into a monitor like `_run_streamed` does."""
+    parser = FoamLogParser()
+    monitor = ConvergenceMonitor(**settings)
+    samples = [sample for sample in map(parser.feed, lines) if sample is not None]
+    final = parser.flush()
+    if final is not None:
+        samples.append(final)
+    for sample in samples:
+        status = monitor.update(sample)
+        if status is not None:
+            return status, sample['time'], monitor
+    return None, None, monitor
+
+
+def test_parse_foam_run_log():
+    parser = FoamLogParser()
+    samples = [sample for sample in map(parser.feed, FOAM_RUN_LOG.splitlines()) if sample is not None]
+    # Every step is emitted when the next one starts, the last one on flush
+    samples.append(parser.flush())
+
+    assert samples == [
+        {'time': 1.0, 'Ux': 1.0, 'Uy': 1.0, 'p': 1.0, 'omega': 0.00315214, 'k': 1.0,
+         'Cm': 0.00123451, 'Cd': 0.0345125, 'Cl': 0.210147},
+        # Only the first pressure solve of a time step counts
+        {'time': 2.0, 'Ux': 0.412563, 'Uy': 0.385412, 'p': 0.121457, 'omega': 0.00210254, 'k': 0.521412,
+         'Cm': 0.00133451, 'Cd': 0.0312478, 'Cl': 0.251247},
+    ]
+
+
+def test_converged_run_stops_once_the_window_has_settled():
+    lines = []
+    for time in range(1, 301):
+        # Residuals fall by a decade every 50 steps, Cl and Cd settle with a decaying oscillation
+        residual = 10 ** (-time / 50)
+        wobble = 0.05 * math.exp(-time / 30) * math.sin(time)
+        lines += _time_step(time, residual, 0.45 + wobble, 0.012 + wobble / 10)
+
+    status, time, monitor = _monitor_log(lines, window=50, min_iterations=100, coeff_tolerance=1e-3,
+                                         residual_tolerance=1e-4)
+
+    assert status == CONVERGED
+    # Residuals reach 1e-4 only at step 200; Cl and Cd are steady long before
+    assert time == 200.0
+    assert "Converged at time 200" in monitor.message
+
+
+def test_oscillating_run_does_not_converge():
+    lines = []
+    for time in range(1, 301):
+        lines += _time_step(time, 1e-6, 0.45 + 0.01 * math.sin(time), 0.012)
+
+    status, _, _ = _monitor_log(lines, window=50, min_iterations=100, coeff_tolerance=1e-3)
+
+    assert status is None
+
+
+def test_nothing_converges_before_min_iterations():
+    lines = []
+    for time in range(1, 100):
+        lines += _time_step(time, 1e-6, 0.45, 0.012)
+
+    assert _monitor_log(lines, window=10, min_iterations=100)[0] is None
+    assert _monitor_log(lines + _time_step(100, 1e-6, 0.45, 0.012), window=10, min_iterations=100)[0] == CONVERGED
+
+
+def test_blowing_up_run_diverges():
+    lines = []
+    for time in range(1, 41):
+        lines += _time_step(time, 0.5, 0.4 * 1.5 ** time, 0.01 * 1.5 ** time)
+
+    status, time, monitor = _monitor_log(lines, divergence_limit=1e3)
+
+    # Cl passes 1e3 at step 20 (0.4 * 1.5 ** 20 = 1330)
+    assert status == DIVERGED
+    assert time == 20.0
+    assert monitor.message.startswith("Cl = ")
+
+
+def test_nan_coefficients_diverge():
+    lines = _time_step(1, 1.0, 0.3, 0.02) + _time_step(2, 1.0, 0.31, 0.021)
+    # How OpenFOAM prints a NaN on Linux
+    lines += [line.replace("0.31", "-nan") for line in _time_step(3, 1.0, 0.31, 0.021)]
+
+    status, time, monitor = _monitor_log(lines)
+
+    assert (status, time) == (DIVERGED, 3.0)
+    assert monitor.message.startswith("Cl = nan")
+
+
+def test_nan_residuals_never_converge():
+    lines = []
+    for time in range(1, 21):
+        lines += _time_step(time, 1e-6, 0.45, 0.012)
+    lines = [line.replace("Initial residual = 1e-06", "Initial residual = nan") if "Uy" in line else line
+             for line in lines]
+
+    assert _monitor_log(lines, window=10, min_iterations=10)[0] is None
@@ -0,0 +1,73 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from conftest import SAMPLE_RUN, SAMPLE_TIMES, copy_sample_case
+from field_store import STORE_DIR, FieldStore, ingest_run, open_store
+from foam_reader import read_case, read_field
+
+
+@pytest.fixture
+def ingested_case(tmp_path):
+    case_dir = copy_sample_case(tmp_path / "Run")
+    ingest_run(case_dir)
+    return case_dir
+
+
+def test_ingest_round_trip(ingested_case):
+    store = open_store(ingested_case)
+
+    assert store.times == list(SAMPLE_TIMES)
+    assert set(store.fields) == {'U', 'p', 'phi', 'nut', 'k', 'omega'}
+    for field in ('p', 'U'):
+        for i, time in enumerate(SAMPLE_TIMES):
+            expected = read_field(os.path.join(ingested_case, time, field), store.n_cells)
+            np.testing.assert_allclose(store.field(field)[i], expected, rtol=1e-6)
+    assert store.field('U').shape == (len(SAMPLE_TIMES), store.n_cells, 3)
+
+
+def test_grid_matches_the_ascii_case(ingested_case):
+    store = open_store(ingested_case)
+
+    grid = store.grid("480", fields=['p', 'U'])
+    expected = read_case(ingested_case, "480", fields=('p', 'U'))
+
+    assert grid.n_cells == expected.n_cells
+    np.testing.assert_allclose(grid.cell_data['p'], expected.cell_data['p'], rtol=1e-6)
+    np.testing.assert_allclose(grid.point_data['U'], expected.point_data['U'], rtol=1e-5, atol=1e-6)
+    # The bare mesh is built once and shared between time steps
+    assert store.grid().n_points == grid.n_points
+
+
+def test_missing_fields_are_rejected(ingested_case):
+    with pytest.raises(KeyError):
+        open_store(ingested_case).field('yPlus')
+
+
+def test_open_store_is_none_without_a_store(tmp_path):
+    case_dir = copy_sample_case(tmp_path / "Run")
+
+    assert open_store(case_dir) is None
+
+
+def test_open_store_is_none_after_a_time_directory_is_added(ingested_case):
+    shutil.copytree(os.path.join(SAMPLE_RUN, "440"), os.path.join(ingested_case, "440"))
+
+    assert open_store(ingested_case) is None
+    # The store itself is intact, it just no longer covers the run
+    assert FieldStore(os.path.join(ingested_case, STORE_DIR)).times == list(SAMPLE_TIMES)
+
+
+def test_open_store_is_none_after_a_time_directory_is_removed(ingested_case):
+    shutil.rmtree(os.path.join(ingested_case, SAMPLE_TIMES[-1]))
+
+    assert open_store(ingested_case) is None
+
+
+def test_reingest_replaces_the_store(ingested_case):
+    shutil.copytree(os.path.join(SAMPLE_RUN, "440"), os.path.join(ingested_case, "440"))
+    ingest_run(ingested_case)
+
+    assert open_store(ingested_case).times == ["440"] + list(SAMPLE_TIMES)
@@ -0,0 +1,62 @@
+import gzip
+import os
+import shutil
+
+import numpy as np
+
+from conftest import SAMPLE_RUN
+from foam_reader import _list_end, read_case, read_field
+
+N_CELLS = 16227
+
+
+def _write_field(path, internal_field):
+    with open(path, "w") as f:
+        f.write("FoamFile\n{\n    format      ascii;\n    class       volScalarField;\n}\n"
+                f"dimensions      [0 2 -2 0 0 0 0];\n\ninternalField   {internal_field};\n\n"
+                "boundaryField\n{\n}\n")
+
+
+def test_read_case_matches_foam_to_vtk():
+    import pyvista as pv
+
+    grid = read_case(SAMPLE_RUN, "500")
+    # foamToVTK decomposed the polyhedra; cellID maps its cells back to the OpenFOAM ones
+    reference = pv.read(os.path.join(SAMPLE_RUN, "VTK", "Run_500.vtk"))
+    cell_ids = reference.cell_data['cellID']
+
+    assert grid.n_cells == N_CELLS == len(np.unique(cell_ids))
+    assert set(np.unique(grid.celltypes)) == {pv.CellType.POLYHEDRON}
+    np.testing.assert_allclose(grid.volume, reference.volume, rtol=1e-4) # VTK points are float32
+    for field in ('p', 'U', 'k'):
+        np.testing.assert_allclose(grid.cell_data[field][cell_ids], reference.cell_data[field],
+                                   rtol=1e-6, atol=1e-6)
+
+
+def test_list_end_of_short_inline_lists():
+    text = "3(1 2 3) 2((0 1 0) (1 0 0));"
+
+    assert _list_end(text, 1, 3, False) == text.index(")")
+    assert _list_end(text, 10, 2, True) == len(text) - 2
+
+
+def test_read_inline_field(tmp_path):
+    path = str(tmp_path / "p")
+    _write_field(path, "nonuniform List<scalar> 3(1.5 -2 3e-1)")
+
+    np.testing.assert_array_equal(read_field(path, 3), [1.5, -2.0, 0.3])
+
+
+def test_read_uniform_field(tmp_path):
+    path = str(tmp_path / "p")
+    _write_field(path, "uniform 0.25")
+
+    np.testing.assert_array_equal(read_field(path, 4), np.full(4, 0.25))
+
+
+def test_read_gzip_compressed_field(tmp_path):
+    source = os.path.join(SAMPLE_RUN, "500", "p")
+    with open(source, "rb") as f_in, gzip.open(tmp_path / "p.gz", "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+
+    np.testing.assert_array_equal(read_field(str(tmp_path / "p"), N_CELLS), read_field(source, N_CELLS))
@@ -0,0 +1,65 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+import foam_reader
+import frame_renderer
+from conftest import SAMPLE_RUN
+from render_server import FrameSources
+
+
+class _InProcessServer:
+    """Stands in for the render server: loads every time step like it does, renders nothing."""
+
+    def __init__(self):
+        self.sources = FrameSources()
+
+    def request(self, kind, case_dir, time, fields):
+        assert kind == "frame"
+        self.sources.get(case_dir).load(time, fields)
+        return {field: np.zeros((8, 8, 3), dtype=np.uint8) for field in fields}
+
+
+class _Writer:
+    def append_data(self, image):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def running_case(tmp_path):
+    case_dir = tmp_path / "Run"
+    shutil.copytree(os.path.join(SAMPLE_RUN, "constant", "polyMesh"), case_dir / "constant" / "polyMesh")
+    return case_dir
+
+
+def _write_time(case_dir, time):
+    os.makedirs(case_dir / time)
+    shutil.copy2(os.path.join(SAMPLE_RUN, "500", "p"), case_dir / time / "p")
+
+
+def test_poll_builds_the_grid_once(running_case, tmp_path, monkeypatch):
+    built = []
+    build_grid = foam_reader.build_grid
+    monkeypatch.setattr(foam_reader, "build_grid", lambda mesh: built.append(1) or build_grid(mesh))
+    server = _InProcessServer()
+    monkeypatch.setattr(frame_renderer, "get_render_server", lambda: server)
+    monkeypatch.setattr(frame_renderer, "open_video_writer", lambda output_dir, field: _Writer())
+
+    animation = frame_renderer.IncrementalAnimation(str(running_case), str(tmp_path / "animations"), ["p"])
+    _write_time(running_case, "0")
+    rendered = 0
+    # No field store exists while the solver runs: every poll renders from the ASCII time directories
+    for time in ("20", "40", "60", "80"):
+        _write_time(running_case, time)
+        rendered += animation.poll()
+    rendered += animation.poll(final=True)
+    animation.close()
+
+    assert rendered == 5
+    assert animation.rendered == ["0", "20", "40", "60", "80"]
+    assert len(built) == 1
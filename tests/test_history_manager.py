@@ -0,0 +1,94 @@
+import random
+
+from history_manager import MAX_HISTORY_DEPTH, PointHistory
+
+
+def _points(n, shift=0.0):
+    return [{'x': float(i) + shift, 'y': float(i * i)} for i in range(n)]
+
+
+def _undo(history):
+    history.index -= 1 # What undo_action does
+    return history.state()
+
+
+def test_depth_is_capped_and_old_rows_are_dropped():
+    history = PointHistory()
+    for n in range(1, 301):
+        history.push(_points(n))
+
+    assert len(history) == MAX_HISTORY_DEPTH == 200
+    assert history.index == len(history) - 1
+    assert history.state() == _points(300)
+    # 301 states (with the empty one) were recorded, the oldest 101 are gone
+    assert history.state(0) == _points(101)
+    # Every state is a prefix of the next one, so 300 clicks take 300 rows
+    assert history._end == 300
+
+
+def test_rows_of_dropped_states_are_compacted():
+    history = PointHistory(max_depth=10)
+    for shift in range(100):
+        history.push(_points(5, shift=shift)) # Edits: every state is a full copy
+
+    assert history.state(0) == _points(5, shift=90)
+    # 10 states of 5 rows live; without compaction 500 rows would be in use
+    assert history._end <= 2 * 10 * 5
+
+
+def test_undo_and_redo_across_a_compaction():
+    history = PointHistory(max_depth=10)
+    for n in range(1, 10):
+        history.push(_points(n))
+    for _ in range(3):
+        _undo(history)
+    assert history.state() == _points(6)
+
+    # An edit discards the redo states, then clicks push the oldest states out
+    history.push(_points(6, shift=0.5))
+    for n in range(7, 20):
+        history.push(_points(n, shift=0.5))
+
+    assert len(history) == 10
+    expected = [_points(n, shift=0.5) for n in range(10, 20)]
+    assert [history.state(i) for i in range(len(history))] == expected
+    for state in reversed(expected[:-1]):
+        assert _undo(history) == state
+    history.index = len(history) - 1 # Redo to the end
+    assert history.state() == expected[-1]
+
+
+def test_matches_a_list_of_copies():
+    # Random clicks, edits, undos and redos against the list of copies the history replaced
+    rng = random.Random(0)
+    history = PointHistory(max_depth=15)
+    states, index = [[]], 0
+    for _ in range(2000):
+        action = rng.random()
+        if action < 0.15 and index > 0:
+            index -= 1
+            history.index -= 1
+        elif action < 0.25 and index < len(states) - 1:
+            index += 1
+            history.index += 1
+        else:
+            points = list(states[index])
+            if action < 0.85 or not points:
+                points.append({'x': rng.random(), 'y': rng.random()})
+            else:
+                points[rng.randrange(len(points))] = {'x': rng.random(), 'y': rng.random()}
+            assert history.push(points)
+            states = states[:index + 1] + [points]
+            states = states[-15:]
+            index = len(states) - 1
+        assert history.index == index
+        assert history.state() == states[index]
+    assert [history.state(i) for i in range(len(history))] == states
+
+
+def test_pushing_the_current_state_records_nothing():
+    history = PointHistory()
+    history.push(_points(3))
+
+    assert not history.push(_points(3))
+    assert len(history) == 2
@@ -0,0 +1,37 @@
+import numpy as np
+from shapely.geometry import LineString, Polygon
+
+from intersections import IntersectionChecker, find_self_intersections
+
+
+def _ellipse(n=40):
+    t = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    return 0.5 + 0.5 * np.cos(t), 0.1 * np.sin(t)
+
+
+def test_repeated_point_is_not_an_intersection():
+    x, y = _ellipse()
+    x, y = np.insert(x, 10, x[10]), np.insert(y, 10, y[10])
+    assert Polygon(np.column_stack([x, y])).is_valid
+    assert find_self_intersections(x, y).shape == (0, 2)
+    assert IntersectionChecker().check(x, y).shape == (0, 2)
+
+
+def test_crossing_is_reported_with_curve_indices():
+    x0, y0 = _ellipse()
+    x0, y0 = np.insert(x0, 5, x0[5]), np.insert(y0, 5, y0[5])
+    x, y = x0.copy(), y0.copy()
+    # Pull a point of the lower side across the upper side
+    x[26], y[26] = x[15], y[15] + 0.02
+    pairs = find_self_intersections(x, y)
+    assert len(pairs)
+    assert not Polygon(np.column_stack([x, y])).is_valid
+    # Indices refer to the segments of the curve as given, zero-length segment 5 included
+    ring = np.column_stack([np.append(x, x[0]), np.append(y, y[0])])
+    for i, j in pairs:
+        assert LineString(ring[i:i + 2]).intersects(LineString(ring[j:j + 2]))
+    assert 5 not in pairs
+
+    checker = IntersectionChecker()
+    assert checker.check(x0, y0).shape == (0, 2)
+    np.testing.assert_array_equal(checker.check(x, y), pairs) # Incremental update
@@ -0,0 +1,168 @@
+import os
+import re
+import shutil
+
+import pytest
+
+from conftest import SRC_DIR
+from log_parser import MeshQualityParser
+from mesh_quality import adjust_settings, check_quality
+
+# End of a snappyHexMesh run: the layer summary of the airfoil patches (front and back get none)
+SNAPPY_LAYERS_LOG = """\
+Layer addition iteration 4
+Added 4642 out of 4836 cells (96%).
+
+patch      faces    layers   overall thickness
+                             [m]       [%]
+-----      -----    ------   ---       ---
+airfoil    1612     2.98     0.00364   97.6
+airfoil_te {te_faces}       {te_layers}     {te_thickness_m}   {te_thickness}
+front      0        0        0         0
+back       0        0        0         0
+
+Layer mesh : cells:17318  faces:52482  points:18262
+Cells per refinement level:
+    0	3956
+    1	1322
+    2	12040
+Writing mesh to time constant
+Layers added in = 2.1 s.
+"""
+
+CHECK_MESH_LOG = """\
+Mesh stats
+    points:           34543
+    faces:            66131
+    internal faces:   31955
+    cells:            16227
+    faces per cell:   6.18
+    boundary patches: 6
+    point zones:      0
+    face zones:       0
+    cell zones:       0
+
+Checking geometry...
+    Overall domain bounding box (-5.9 -5.9 -0.05) (12 5.9 0.05)
+    Mesh has 2 geometric (non-empty/wedge) directions (1 1 0)
+    Mesh has 2 solution (non-empty) directions (1 1 0)
+    All edges aligned with or perpendicular to non-empty directions.
+    Boundary openness (-1.23e-17 3.41e-18 -2.14e-15) OK.
+ ***High aspect ratio cells found, Max aspect ratio: 1127.4, number of cells 2157
+  <<Writing 2157 cells with high aspect ratio to set highAspectRatioCells
+    Minimum face area = 1.21e-07. Maximum face area = 0.502.  Face area magnitudes OK.
+{volumes}
+    Mesh non-orthogonality Max: {non_ortho} average: 8.3
+    Non-orthogonality check OK.
+{pyramids}
+{skewness}
+    Coupled point location match (average 0) OK.
+
+Failed {failed} mesh checks.
+
+End
+"""
+
+GOOD_CHECK = {
+    'volumes': "    Min volume = 1.3e-08. Max volume = 0.041.  Total volume = 26.39.  Cell volumes OK.",
+    'non_ortho': "64.9",
+    'pyramids': "    Face pyramids OK.",
+    'skewness': "    Max skewness = 2.1 OK.",
+    'failed': 1,
+}
+BAD_CHECK = {
+    'volumes': (" ***Zero or negative cell volume detected.  Minimum negative volume: -1.2e-09, "
+                "Number of negative volume cells: 3\n  <<Writing 3 zero volume cells to set zeroVolumeCells"),
+    'non_ortho': "78.4",
+    'pyramids': " ***Error in face pyramids: 12 faces are incorrectly oriented.\n  <<Writing 12 faces with incorrect orientation to set wrongOrientedFaces",
+    'skewness': " ***Max skewness = 9.3, 14 highly skew faces detected which may impair the quality of the results\n  <<Writing 14 skew faces to set skewFaces",
+    'failed': 4,
+}
+
+
+def _parse(*logs):
+    parser = MeshQualityParser()
+    for log in logs:
+        for line in log.splitlines():
+            assert parser.feed(line) is None
+    return parser.metrics
+
+
+def _snappy_log(te_layers=3.0, te_thickness=92.4):
+    return SNAPPY_LAYERS_LOG.format(te_faces=40, te_layers=te_layers, te_thickness_m=0.0034,
+                                    te_thickness=te_thickness)
+
+
+def test_good_mesh_passes():
+    metrics = _parse(_snappy_log(), CHECK_MESH_LOG.format(**GOOD_CHECK))
+
+    assert metrics == {
+        'cells': 16227, # checkMesh's count, not snappyHexMesh's "Layer mesh : cells:17318"
+        'max_non_orthogonality': 64.9,
+        'average_non_orthogonality': 8.3,
+        'max_skewness': 2.1,
+        'max_aspect_ratio': 1127.4,
+        'negative_volume_cells': 0,
+        'incorrectly_oriented_faces': 0,
+        'failed_checks': 1,
+        'layers': pytest.approx((1612 * 2.98 + 40 * 3.0) / 1652),
+        'layer_thickness': 92.4,
+    }
+    # The aspect ratio check alone fails in every 2D mesh with wall layers
+    assert check_quality(metrics) == []
+
+
+def test_bad_mesh_breaches_every_limit():
+    metrics = _parse(_snappy_log(te_layers=0.6, te_thickness=31.5), CHECK_MESH_LOG.format(**BAD_CHECK))
+
+    violations = check_quality(metrics)
+
+    assert [name for name, _ in violations] == [
+        'max_non_orthogonality', 'max_skewness', 'negative_volume_cells', 'incorrectly_oriented_faces',
+        'layer_thickness']
+    assert dict(violations)['max_skewness'] == "max skewness 9.3 > 8"
+    assert dict(violations)['layer_thickness'] == "layer thickness 31.5% < 50% of the requested one"
+
+
+def test_only_the_last_layer_summary_counts():
+    first = _snappy_log(te_layers=0.6, te_thickness=31.5)
+
+    metrics = _parse(first, _snappy_log())
+
+    assert metrics['layer_thickness'] == 92.4
+
+
+def test_metrics_missing_from_the_output_are_not_checked():
+    metrics = _parse("Mesh OK.\n")
+
+    assert metrics['failed_checks'] == 0
+    assert metrics['max_skewness'] is None
+    assert check_quality(metrics) == []
+    assert check_quality(None) == []
+
+
+def _entry(path, name):
+    with open(path) as f:
+        return re.search(rf"\b{name}\s+([^;]+);", f.read()).group(1)
+
+
+def test_adjust_settings_after_quality_violations(tmp_path):
+    mesh_dict = str(tmp_path / "snappyHexMeshDict")
+    shutil.copy2(os.path.join(SRC_DIR, "cfd", "Mesh", "system", "snappyHexMeshDict"), mesh_dict)
+    violations = check_quality(_parse(CHECK_MESH_LOG.format(**BAD_CHECK)))
+
+    changed = adjust_settings(mesh_dict, violations)
+
+    assert changed == ['maxNonOrtho', 'maxInternalSkewness', 'maxBoundarySkewness']
+    assert (_entry(mesh_dict, "maxNonOrtho"), _entry(mesh_dict, "maxInternalSkewness")) == ("65", "2")
+    assert _entry(mesh_dict, "featureAngle") == "90" # Layer settings are left alone
+
+
+def test_adjust_settings_after_thin_layers(tmp_path):
+    mesh_dict = str(tmp_path / "snappyHexMeshDict")
+    shutil.copy2(os.path.join(SRC_DIR, "cfd", "Mesh", "system", "snappyHexMeshDict"), mesh_dict)
+    violations = check_quality(_parse(_snappy_log(te_layers=0.6, te_thickness=31.5)))
+
+    assert adjust_settings(mesh_dict, violations) == ['featureAngle', 'nLayerIter']
+    assert (_entry(mesh_dict, "featureAngle"), _entry(mesh_dict, "nLayerIter")) == ("130", "100")
+    assert _entry(mesh_dict, "maxNonOrtho") == "80"
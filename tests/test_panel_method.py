@@ -0,0 +1,35 @@
+import math
+
+import pytest
+
+from conftest import naca0012
+from panel_method import solve_airfoil
+
+
+def test_symmetric_airfoil_at_zero_incidence_has_no_lift():
+    result = solve_airfoil(*naca0012(), alpha=0.0)
+
+    assert result["Cl"] == pytest.approx(0.0, abs=1e-6)
+    assert result["Cm"] == pytest.approx(0.0, abs=1e-6)
+    assert result["Cd"] is None
+
+
+def test_lift_slope_of_naca0012():
+    x, y = naca0012()
+
+    slope = (solve_airfoil(x, y, alpha=4.0)["Cl"] - solve_airfoil(x, y, alpha=-4.0)["Cl"]) / math.radians(8.0)
+
+    # Thin airfoil theory gives 2 pi per radian; thickness raises it by about 0.77 t
+    assert slope == pytest.approx(2 * math.pi * (1 + 0.77 * 0.12), rel=0.02)
+    # About the quarter chord, a symmetric section has almost no moment
+    assert abs(solve_airfoil(x, y, alpha=4.0)["Cm"]) < 0.01
+
+
+def test_boundary_layer_lowers_lift_and_adds_drag():
+    x, y = naca0012()
+    inviscid = solve_airfoil(x, y, alpha=4.0)
+
+    viscous = solve_airfoil(x, y, alpha=4.0, reynolds=1e6)
+
+    assert 0.85 * inviscid["Cl"] < viscous["Cl"] < inviscid["Cl"]
+    assert 0.004 < viscous["Cd"] < 0.015
@@ -0,0 +1,107 @@
+import json
+import os
+import time
+
+import numpy as np
+import pytest
+
+from pipeline_cache import evict, lookup, make_key, restore, stage_key, store
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def _read(path):
+    with open(path) as f:
+        return f.read()
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / "workspace"
+    _write(str(root / "Mesh" / "system" / "snappyHexMeshDict"), "maxNonOrtho 65;\n")
+    _write(str(root / "Mesh" / "constant" / "triSurface" / "airfoil.stl"), "solid airfoil\n")
+    _write(str(root / "Mesh" / "constant" / "polyMesh" / "points"), "3((0 0 0) (1 0 0) (0 1 0))\n")
+    return str(root)
+
+
+def test_make_key_is_stable_across_array_dtypes():
+    coordinates = [0.0, 0.5, 1.0]
+
+    key = make_key("stl", np.array(coordinates, dtype=np.float64))
+
+    assert key == make_key("stl", np.array(coordinates, dtype=np.float32))
+    assert key == make_key("stl", np.array([0, 0.5, 1], dtype=np.float16))
+    assert key != make_key("stl", np.array([0.0, 0.5, 1.0 + 1e-9]))
+    assert make_key({'a': 1, 'b': 2}) == make_key({'b': 2, 'a': 1})
+
+
+def test_stage_key_follows_the_inputs(workspace):
+    key = stage_key(workspace, "mesh")
+    # Neither the decomposition nor half written files change the result
+    _write(os.path.join(workspace, "Mesh", "system", "decomposeParDict"), "numberOfSubdomains 4;\n")
+    _write(os.path.join(workspace, "Mesh", "system", "snappyHexMeshDict.tmp"), "maxNonOrtho 80;\n")
+    assert stage_key(workspace, "mesh") == key
+
+    _write(os.path.join(workspace, "Mesh", "system", "snappyHexMeshDict"), "maxNonOrtho 80;\n")
+    assert stage_key(workspace, "mesh") != key
+    assert stage_key(workspace, "mesh", "parent") != stage_key(workspace, "mesh")
+
+
+def test_store_and_restore_round_trip(workspace, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    outputs = ["Mesh/constant/polyMesh", "Mesh/constant/triSurface/airfoil.stl"]
+    store("key", workspace, outputs, cache_dir=cache_dir)
+
+    # Later jobs overwrite the outputs and leave stale files behind
+    points = os.path.join(workspace, "Mesh", "constant", "polyMesh", "points")
+    _write(points, "0()\n")
+    _write(os.path.join(workspace, "Mesh", "constant", "polyMesh", "cellLevel"), "stale\n")
+
+    assert restore("key", workspace, cache_dir=cache_dir)
+    assert _read(points) == "3((0 0 0) (1 0 0) (0 1 0))\n"
+    assert not os.path.exists(os.path.join(workspace, "Mesh", "constant", "polyMesh", "cellLevel"))
+    assert not restore("other", workspace, cache_dir=cache_dir)
+
+
+def test_store_keeps_an_existing_entry(workspace, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    stl = "Mesh/constant/triSurface/airfoil.stl"
+    store("key", workspace, [stl], cache_dir=cache_dir)
+    _write(os.path.join(workspace, stl), "solid changed\n")
+
+    store("key", workspace, [stl], cache_dir=cache_dir)
+
+    assert _read(os.path.join(lookup("key", cache_dir), stl)) == "solid airfoil\n"
+    assert os.listdir(cache_dir) == ["key"] # No temporary entry left behind
+
+
+def test_entries_without_manifest_are_misses(workspace, tmp_path):
+    # What a reader sees of an entry that is still being written
+    cache_dir = tmp_path / "cache"
+    os.makedirs(cache_dir / "key" / "Mesh")
+
+    assert lookup("key", str(cache_dir)) is None
+    assert not restore("key", workspace, cache_dir=str(cache_dir))
+
+
+def test_evict_removes_the_least_recently_used_entries(workspace, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    stl = "Mesh/constant/triSurface/airfoil.stl"
+    now = time.time()
+    for age, key in enumerate(("new", "middle", "old")):
+        store(key, workspace, [stl], cache_dir=cache_dir)
+        os.utime(os.path.join(cache_dir, key), (now - 100 * age, now - 100 * age))
+    with open(os.path.join(cache_dir, "old", "manifest.json")) as f:
+        size = json.load(f)["size"]
+
+    # A hit makes the oldest entry the most recently used one
+    lookup("old", cache_dir)
+
+    assert evict(cache_dir, max_bytes=2 * size) == 1
+    assert sorted(os.listdir(cache_dir)) == ["new", "old"]
+    assert evict(cache_dir, max_bytes=size) == 1
+    assert os.listdir(cache_dir) == ["old"]
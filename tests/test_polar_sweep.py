@@ -0,0 +1,43 @@
+import os
+import re
+
+import pytest
+
+from convergence import set_stop_at
+from polar_sweep import create_sweep_case, read_force_coefficients
+from workspace import create_workspace
+
+
+def _stop_at(case_dir):
+    with open(os.path.join(case_dir, "system", "controlDict")) as f:
+        return re.search(r"^\s*stopAt\s+(\w+);", f.read(), re.MULTILINE).group(1)
+
+
+def test_sweep_case_runs_to_end_time_after_an_early_stop(tmp_path):
+    workspace = create_workspace(root=str(tmp_path))
+    run_dir = os.path.join(workspace, "Run")
+    set_stop_at(run_dir, "writeNow") # Left behind by a run stopped at convergence
+
+    case_dir = create_sweep_case(workspace, 4.0)
+
+    assert _stop_at(case_dir) == "endTime"
+    with open(os.path.join(case_dir, "system", "controlDict")) as f:
+        assert "liftDir         (-0.0697564737 0.99756405 0)" in f.read()
+
+
+def _write_coefficients(case_dir, start_time, cl):
+    directory = os.path.join(case_dir, "postProcessing", "forceCoeffs1", start_time)
+    os.makedirs(directory)
+    with open(os.path.join(directory, "forceCoeffs.dat"), "w") as f:
+        f.write("# Time\tCm\tCd\tCl\n")
+        for i in range(1, 4):
+            f.write(f"{float(start_time) + i}\t0.01\t0.02\t{cl}\n")
+
+
+def test_force_coefficients_come_from_the_latest_start_time(tmp_path):
+    # The file of the earlier run is the more recently modified one
+    _write_coefficients(str(tmp_path), "300", 0.5)
+    _write_coefficients(str(tmp_path), "0", 0.1)
+    os.utime(os.path.join(tmp_path, "postProcessing", "forceCoeffs1", "300", "forceCoeffs.dat"), (0, 0))
+
+    assert read_force_coefficients(str(tmp_path))["Cl"] == pytest.approx(0.5)
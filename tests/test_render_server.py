@@ -0,0 +1,66 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from render_server import RenderServer
+
+
+def _crash(requests, responses):
+    """Stands in for the server loop: takes the request, then dies like a VTK segfault."""
+    requests.get()
+    os._exit(-11)
+
+
+def _hang(requests, responses):
+    requests.get()
+    time.sleep(60)
+
+
+def _answer_late(requests, responses):
+    request_id, kind, kwargs = requests.get()
+    time.sleep(1.2)
+    responses.put(("stale", None, None))
+    responses.put((request_id, kwargs["value"] * 2, None))
+    requests.get()
+
+
+class _FakeServer(RenderServer):
+    def __init__(self, target):
+        super().__init__()
+        self._target = target
+
+    def start(self):
+        context = multiprocessing.get_context("fork")
+        self._requests = context.Queue()
+        self._responses = context.Queue()
+        self._process = context.Process(target=self._target, args=(self._requests, self._responses), daemon=True)
+        self._process.start()
+
+
+def test_request_fails_fast_when_the_server_dies():
+    server = _FakeServer(_crash)
+    start = time.monotonic()
+
+    with pytest.raises(RuntimeError, match="exited"):
+        server.request("frame", timeout=60)
+
+    assert time.monotonic() - start < 5
+    assert not server.alive
+
+
+def test_request_times_out_on_a_hanging_server():
+    server = _FakeServer(_hang)
+
+    with pytest.raises(RuntimeError, match="timed out"):
+        server.request("frame", timeout=1)
+
+    assert not server.alive
+
+
+def test_request_waits_for_its_own_response():
+    server = _FakeServer(_answer_late)
+
+    assert server.request("frame", timeout=10, value=21) == 42
+    server.stop()
@@ -0,0 +1,45 @@
+import numpy as np
+
+import utils_old
+from conftest import naca0012
+from utils_old import _chordal_deviation, _fit_airfoil_spline, adaptive_spline_parameters, interpolate_airfoil_adaptive
+
+TOLERANCE = 1e-4
+
+
+def _spline():
+    # A dozen clicks, like a drawn airfoil
+    x, y = naca0012(6)
+    return _fit_airfoil_spline(x[:-1], y[:-1], 0.0001)
+
+
+def test_adaptive_parameters_meet_the_tolerance():
+    tck, u = _spline()
+
+    u_new, within_tolerance = adaptive_spline_parameters(tck, TOLERANCE, u_min=u.min(), u_max=u.max())
+
+    assert within_tolerance
+    assert (np.diff(u_new) > 0).all()
+    assert _chordal_deviation(tck, u_new[:-1], u_new[1:]).max() <= TOLERANCE
+
+
+def test_adaptive_parameters_report_the_point_limit():
+    tck, u = _spline()
+
+    u_new, within_tolerance = adaptive_spline_parameters(tck, TOLERANCE, max_points=20, u_min=u.min(), u_max=u.max())
+
+    assert not within_tolerance
+    assert len(u_new) == 20
+
+
+def test_point_limit_is_shown_to_the_user(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(utils_old.st, "warning", warnings.append)
+    x, y = naca0012(6)
+
+    x_interp, _ = interpolate_airfoil_adaptive(x[:-1], y[:-1], tolerance=TOLERANCE, max_points=20)
+    assert len(x_interp) == 21 # Closed
+    assert len(warnings) == 1 and "stopped at 20 points" in warnings[0]
+
+    interpolate_airfoil_adaptive(x[:-1], y[:-1], tolerance=TOLERANCE)
+    assert len(warnings) == 1
@@ -0,0 +1,74 @@
+import functools
+import os
+
+import pytest
+
+import cfd_runner
+import pipeline_cache
+from workspace import create_workspace
+
+_STL = os.path.join("Mesh", "constant", "triSurface", "airfoil.stl")
+
+
+def _stamp_path(workspace, rel_path, create=False):
+    """File standing in for an output: the output itself, or a file in an output directory."""
+    path = os.path.join(workspace, rel_path)
+    if os.path.splitext(rel_path)[1]: # airfoil.eMesh
+        return path
+    if create:
+        os.makedirs(path)
+    return os.path.join(path, "source")
+
+
+@pytest.fixture
+def runs(tmp_path, monkeypatch):
+    """Records the utilities run; each one writes its outputs stamped with the workspace."""
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setattr(cfd_runner, "restore", functools.partial(pipeline_cache.restore, cache_dir=cache_dir))
+    monkeypatch.setattr(cfd_runner, "store", functools.partial(pipeline_cache.store, cache_dir=cache_dir))
+    runs = []
+
+    def run_streamed(command, cwd, log_name=None, **kwargs):
+        runs.append((command[0], cwd))
+        workspace = os.path.dirname(cwd)
+        for utility, _, _, outputs in cfd_runner._SHARED_MESH_STEPS:
+            if utility == command[0]:
+                for rel_path in outputs:
+                    with open(_stamp_path(workspace, rel_path, create=True), "w") as f:
+                        f.write(workspace)
+
+    monkeypatch.setattr(cfd_runner, "_run_streamed", run_streamed)
+    return runs
+
+
+def _workspace(tmp_path, stl):
+    workspace = create_workspace(root=str(tmp_path / "workspaces"))
+    os.makedirs(os.path.dirname(os.path.join(workspace, _STL)), exist_ok=True)
+    with open(os.path.join(workspace, _STL), "w") as f:
+        f.write(stl)
+    return workspace
+
+
+def _source(workspace, rel_path):
+    with open(_stamp_path(workspace, rel_path)) as f:
+        return f.read()
+
+
+def test_background_mesh_is_shared_between_airfoils(tmp_path, runs):
+    first = _workspace(tmp_path, "solid naca0012\n")
+    env = cfd_runner._run_shared_mesh_steps(first, env={})
+    assert [utility for utility, _ in runs] == ["blockMesh", "surfaceFeatures"]
+    assert env == {"SKIP_BLOCKMESH": "1", "SKIP_SURFACE_FEATURES": "1"}
+
+    # Another airfoil reuses the background mesh but needs its own feature edges
+    second = _workspace(tmp_path, "solid naca4412\n")
+    cfd_runner._run_shared_mesh_steps(second, env={})
+    assert runs[2:] == [("surfaceFeatures", os.path.join(second, "Mesh"))]
+    assert _source(second, "Mesh/constant/polyMesh") == first
+
+    # The same airfoil again runs nothing
+    third = _workspace(tmp_path, "solid naca0012\n")
+    cfd_runner._run_shared_mesh_steps(third, env={})
+    assert len(runs) == 3
+    assert _source(third, "Mesh/constant/extendedFeatureEdgeMesh") == first
+    assert _source(third, "Mesh/constant/triSurface/airfoil.eMesh") == first
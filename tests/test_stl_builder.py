@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from conftest import naca0012
+from stl_builder import STL_HEADER_SIZE, STL_RECORD, build_airfoil_stl
+
+
+def _records(data):
+    count = int(np.frombuffer(data, dtype="<u4", count=1, offset=STL_HEADER_SIZE)[0])
+    assert len(data) == STL_HEADER_SIZE + 4 + count * STL_RECORD.itemsize
+    return np.frombuffer(data, dtype=STL_RECORD, count=count, offset=STL_HEADER_SIZE + 4)
+
+
+def _volume(records):
+    """Signed volume enclosed by the triangles: positive if they all face outwards."""
+    vertices = records["vertices"].astype(np.float64)
+    return np.einsum("ij,ij->i", vertices[:, 0], np.cross(vertices[:, 1], vertices[:, 2])).sum() / 6
+
+
+def test_binary_stl_of_the_extruded_airfoil(tmp_path):
+    x, y = naca0012(80) # 161 points, the last one closing the curve
+    path = tmp_path / "airfoil.stl"
+
+    data = build_airfoil_stl(x, y, chord_length=2.0, thickness=0.1, output_stl_file=str(path))
+
+    assert path.read_bytes() == data
+    assert data.startswith(b"solid airfoil")
+    records = _records(data)
+    # 160 distinct points: 158 triangles per cap and two per side wall
+    n = len(x) - 1
+    assert len(records) == 2 * (n - 2) + 2 * n
+    vertices = records["vertices"].astype(np.float64)
+    assert np.allclose(np.unique(vertices[:, :, 2]), [-0.05, 0.05])
+    assert vertices[:, :, 0].max() == pytest.approx(2.0)
+
+
+def test_normals_point_outwards(tmp_path):
+    records = _records(build_airfoil_stl(*naca0012(80), thickness=0.1))
+    normals = records["normal"].astype(np.float64)
+    vertices = records["vertices"].astype(np.float64)
+
+    np.testing.assert_allclose(np.linalg.norm(normals, axis=1), 1.0, rtol=1e-6)
+    # Caps face +z and -z, walls are vertical
+    top, bottom = (vertices[:, :, 2] > 0).all(axis=1), (vertices[:, :, 2] < 0).all(axis=1)
+    np.testing.assert_allclose(normals[top], [[0, 0, 1]] * top.sum(), atol=1e-6)
+    np.testing.assert_allclose(normals[bottom], [[0, 0, -1]] * bottom.sum(), atol=1e-6)
+    np.testing.assert_allclose(normals[~top & ~bottom][:, 2], 0.0, atol=1e-6)
+    # Normals agree with the winding, and the winding encloses a positive volume
+    winding = np.cross(vertices[:, 1] - vertices[:, 0], vertices[:, 2] - vertices[:, 0])
+    assert (np.einsum("ij,ij->i", winding, normals) > 0).all()
+    # NACA 0012 section area is 0.0822 chord^2
+    assert _volume(records) == pytest.approx(0.0822 * 0.1, rel=1e-2)
+
+
+def test_orientation_of_the_drawn_curve_does_not_matter():
+    x, y = naca0012(40)
+
+    forward = _records(build_airfoil_stl(x, y, thickness=0.1))
+    backward = _records(build_airfoil_stl(x[::-1], y[::-1], thickness=0.1))
+
+    assert len(forward) == len(backward)
+    assert _volume(backward) == pytest.approx(_volume(forward))
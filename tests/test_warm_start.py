@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+
+from conftest import SRC_DIR, copy_sample_case
+from foam_reader import read_field, read_polymesh
+from stl_builder import build_airfoil_stl
+from warm_start import cell_centres, find_seed, map_seed, record_seed
+
+
+def _seeded_case(tmp_path):
+    """The sample case as a workspace whose final solution is stored as a seed at 0 deg."""
+    workspace = tmp_path / "workspace"
+    case_dir = copy_sample_case(workspace / "Run")
+    stl_path = str(workspace / "airfoil.stl")
+    coordinates = np.loadtxt(os.path.join(SRC_DIR, "airfoil_coordinates.txt"))
+    build_airfoil_stl(coordinates[:, 0], coordinates[:, 1], 1.0, 0.1, stl_path)
+    record_seed(str(workspace), case_dir, "solution", stl_path, alpha=0.0, cache_dir=str(tmp_path / "cache"))
+    return case_dir, stl_path
+
+
+def _point(x, y, z):
+    return x * 4 + y * 2 + z
+
+
+def test_cell_centres_of_two_cubes():
+    # Two unit cubes side by side along x, sharing the face at x = 1
+    points = np.array([(x, y, z) for x in range(3) for y in range(2) for z in range(2)], dtype=float)
+    faces = [[_point(1, 0, 0), _point(1, 1, 0), _point(1, 1, 1), _point(1, 0, 1)]]
+    owner = [0]
+    for cell in (0, 1):
+        faces += [[_point(cell, 0, 0), _point(cell + 1, 0, 0), _point(cell + 1, 0, 1), _point(cell, 0, 1)],
+                  [_point(cell, 1, 0), _point(cell, 1, 1), _point(cell + 1, 1, 1), _point(cell + 1, 1, 0)],
+                  [_point(cell, 0, 0), _point(cell, 1, 0), _point(cell + 1, 1, 0), _point(cell + 1, 0, 0)],
+                  [_point(cell, 0, 1), _point(cell + 1, 0, 1), _point(cell + 1, 1, 1), _point(cell, 1, 1)]]
+        owner += [cell] * 4
+    faces += [[_point(0, 0, 0), _point(0, 0, 1), _point(0, 1, 1), _point(0, 1, 0)],
+              [_point(2, 0, 0), _point(2, 1, 0), _point(2, 1, 1), _point(2, 0, 1)]]
+    owner += [0, 1]
+    mesh = {
+        'points': points,
+        'face_sizes': np.full(len(faces), 4),
+        'faces': np.concatenate([[4] + face for face in faces]),
+        'owner': np.array(owner),
+        'neighbour': np.array([1]),
+        'n_cells': 2,
+    }
+
+    np.testing.assert_allclose(cell_centres(mesh), [[0.5, 0.5, 0.5], [1.5, 0.5, 0.5]])
+
+
+def test_seed_mapped_onto_its_own_mesh_reproduces_the_solution(tmp_path):
+    case_dir, stl_path = _seeded_case(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+
+    seed = find_seed(stl_path, alpha=5.0, cache_dir=cache_dir)
+    assert seed is not None and seed["alpha"] == 0.0
+    assert map_seed(seed, case_dir, alpha=5.0, cache_dir=cache_dir)
+
+    n_cells = read_polymesh(os.path.join(case_dir, "constant", "polyMesh"))['n_cells']
+    # Seed centres are float32, so a cell's own value does not fully outweigh its neighbours'
+    for name in ('p', 'k', 'omega', 'nut'):
+        final = read_field(os.path.join(case_dir, "500", name), n_cells)
+        mapped = read_field(os.path.join(case_dir, "0", name), n_cells)
+        np.testing.assert_allclose(mapped, final, rtol=1e-3, atol=1e-4 * np.abs(final).max())
+
+    # The seed was solved at 0 deg: U comes back rotated by the 5 deg difference
+    final = read_field(os.path.join(case_dir, "500", "U"), n_cells)
+    mapped = read_field(os.path.join(case_dir, "0", "U"), n_cells)
+    cos, sin = np.cos(np.radians(5.0)), np.sin(np.radians(5.0))
+    expected = np.column_stack([cos * final[:, 0] - sin * final[:, 1], sin * final[:, 0] + cos * final[:, 1], final[:, 2]])
+    np.testing.assert_allclose(mapped, expected, rtol=1e-3, atol=1e-4 * np.abs(final).max())
+
+
+def test_mapped_fields_keep_the_freestream_boundary_values(tmp_path):
+    case_dir, stl_path = _seeded_case(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+    map_seed(find_seed(stl_path, cache_dir=cache_dir), case_dir, cache_dir=cache_dir)
+
+    with open(os.path.join(case_dir, "0", "U")) as f:
+        text = f.read()
+    assert "$internalField" not in text
+    assert "internalField   nonuniform List<vector>" in text
+    assert text.count("value           uniform (2.00 0 0);") == 2 # inlet and outlet
+    with open(os.path.join(case_dir, "0", "k")) as f:
+        assert "inletValue      uniform 0.0096;" in f.read()
+
+
+def test_no_seed_for_a_distant_angle_of_attack(tmp_path):
+    _, stl_path = _seeded_case(tmp_path)
+
+    assert find_seed(stl_path, alpha=30.0, cache_dir=str(tmp_path / "cache")) is None